@@ -4,17 +4,37 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from homeassistant.const import Platform
+from homeassistant.const import CONF_MAC, Platform
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN
+from .const import DATA_DISCOVERY_LISTENER, DOMAIN
 from .coordinator import MyStromDataUpdateCoordinator
+from .discovery import async_start_listener, format_mac
+from .energy import MyStromEnergyAccumulator
+from .helpers import async_get_entity_index
+from .poller import async_get_fleet_poller
+from .push import async_register_push
+from .statistics import MyStromStatisticsImporter
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 PLATFORMS: list[Platform] = [Platform.SWITCH, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Listen for devices announcing themselves on the local network."""
+    # Kept to stop the listener, it also stops when Home Assistant stops
+    hass.data[DATA_DISCOVERY_LISTENER] = await async_start_listener(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,22 +46,102 @@ async def async_setup_entry(
         async_setup_services,
     )
 
+    await _async_normalize_unique_id(hass, entry)
     coordinator = MyStromDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.api.close)
+    unique_id_base = entry.unique_id or entry.data.get("mac") or entry.data["host"]
+    await coordinator.energy.async_load(
+        seed_entity_id=er.async_get(hass).async_get_entity_id(
+            Platform.SENSOR, DOMAIN, f"{unique_id_base}_energy"
+        )
+    )
+    entry.async_on_unload(coordinator.energy.async_save)
+    if coordinator.statistics_importer is not None:
+        await coordinator.statistics_importer.async_load()
+        entry.async_on_unload(coordinator.statistics_importer.async_flush)
+    if coordinator.fast_start:
+        # Entities start with their restored state until the device responds
+        coordinator.async_schedule_first_refresh()
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
+    if coordinator.fleet_polling:
+        entry.async_on_unload(async_get_fleet_poller(hass).async_register(coordinator))
+
+    if coordinator.push_updates:
+        entry.async_on_unload(async_register_push(hass, entry))
+
     await async_setup_services(hass)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+async def _async_normalize_unique_id(
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # type: ignore[type-arg]
+) -> None:
+    """
+    Format the MAC address used as unique ID like discovered MAC addresses.
+
+    Older entries used the MAC address as entered or reported, which never
+    matched an announcement, so configured devices were offered again. The
+    device and entity registry entries derived from it are migrated along.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Configuration entry
+
+    """
+    if (old := entry.unique_id) is None or (new := format_mac(old)) == old:
+        return
+    if hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, new):
+        # Already added again as discovered device, keep both unchanged
+        return
+
+    @callback
+    def _async_migrate_entity(entity: er.RegistryEntry) -> dict[str, str] | None:
+        if not entity.unique_id.startswith(f"{old}_"):
+            return None
+        return {"new_unique_id": f"{new}{entity.unique_id.removeprefix(old)}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _async_migrate_entity)
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(identifiers={(DOMAIN, old)}):
+        device_registry.async_update_device(device.id, new_identifiers={(DOMAIN, new)})
+    data = dict(entry.data)
+    if CONF_MAC in data:
+        data[CONF_MAC] = format_mac(str(data[CONF_MAC]))
+    hass.config_entries.async_update_entry(entry, unique_id=new, data=data)
+
+
+async def _async_update_listener(
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # type: ignore[type-arg]
+) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,  # type: ignore[type-arg]
 ) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        async_get_entity_index(hass).async_remove_coordinator(coordinator)
     return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # type: ignore[type-arg]
+) -> None:
+    """Remove the stored energy total and statistics of a removed config entry."""
+    energy = MyStromEnergyAccumulator(hass, entry.entry_id)
+    await energy.async_remove()
+    await MyStromStatisticsImporter(hass, entry, energy).async_remove()
@@ -2,25 +2,76 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Any
+from functools import partial
+from time import monotonic, perf_counter, time
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urljoin
 
 import aiohttp
+from yarl import URL
 
+from .circuit_breaker import MyStromCircuitBreaker
 from .const import (
+    API_ENDPOINT_INFO,
     API_ENDPOINT_OFF,
     API_ENDPOINT_ON,
+    API_ENDPOINT_REBOOT,
     API_ENDPOINT_RELAY,
     API_ENDPOINT_REPORT,
     API_ENDPOINT_TOGGLE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
     DEFAULT_TIMEOUT,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
     HTTP_STATUS_BAD_REQUEST,
     HTTP_STATUS_NO_CONTENT,
+    HTTP_STATUS_NOT_FOUND,
+    KEY_RELAY,
+    MAX_RESPONSE_SIZE,
+    STATIC_INFO_RETRY,
+    STATIC_INFO_TTL,
 )
+from .metrics import (
+    OUTCOME_CONNECTION_ERROR,
+    OUTCOME_HTTP_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    MyStromRequestMetrics,
+)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
+if TYPE_CHECKING:
+    from collections import deque
+    from types import SimpleNamespace
 
 _LOGGER = logging.getLogger(__name__)
 
+_ENDPOINTS = (
+    API_ENDPOINT_REPORT,
+    API_ENDPOINT_RELAY,
+    API_ENDPOINT_TOGGLE,
+    API_ENDPOINT_ON,
+    API_ENDPOINT_OFF,
+    API_ENDPOINT_REBOOT,
+    API_ENDPOINT_INFO,
+)
+
+# Reads that may be sent twice when the first attempt is slow or the
+# kept-alive connection was closed by the device. Relay writes are never
+# repeated, the device may have acted on the first attempt.
+_HEDGED_ENDPOINTS = frozenset({API_ENDPOINT_REPORT, API_ENDPOINT_INFO})
+
 
 class MyStromDeviceError(Exception):
     """Base exception for MyStrom device errors."""
@@ -33,28 +84,212 @@ class MyStromConnectionError(MyStromDeviceError):
 class MyStromAPIError(MyStromDeviceError):
     """Exception raised when API returns an error."""
 
+    def __init__(self, msg: str, status: int | None = None) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            msg: Error message
+            status: HTTP status of the response, None if the response was
+                received but unusable
+
+        """
+        super().__init__(msg)
+        self.status = status
+
+
+class MyStromCircuitOpenError(MyStromConnectionError):
+    """Exception raised when requests are rejected by the circuit breaker."""
+
+
+class _RelayCommand:
+    """Relay command merged from all callers queued before it is sent."""
+
+    __slots__ = ("endpoint", "future", "state", "toggle")
+
+    def __init__(self, future: asyncio.Future[dict[str, Any] | None]) -> None:
+        """Initialize an empty command."""
+        self.future = future
+        # Absolute target state and the endpoint used to set it
+        self.state: bool | None = None
+        self.endpoint: str | None = None
+        # Pending toggle if no absolute state was requested
+        self.toggle = False
+
+    def merge_state(self, *, state: bool, endpoint: str) -> None:
+        """Supersede everything queued so far with an absolute state."""
+        self.state = state
+        self.endpoint = endpoint
+        self.toggle = False
+
+    def merge_toggle(self) -> None:
+        """Apply a toggle on top of the queued command."""
+        if self.state is None:
+            # Two consecutive toggles cancel out
+            self.toggle = not self.toggle
+        else:
+            self.merge_state(state=not self.state, endpoint=API_ENDPOINT_RELAY)
+
+
+def _retrieve_exception(future: asyncio.Future[Any]) -> None:
+    """Mark the exception of a shared future as retrieved."""
+    if not future.cancelled():
+        future.exception()
+
 
 class MyStromAPI:
     """API client for MyStrom devices."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         host: str,
-        session: aiohttp.ClientSession,
-        timeout: int = DEFAULT_TIMEOUT,
+        session: aiohttp.ClientSession | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        traces: deque[tuple[Any, ...]] | None = None,
+        *,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        hedge: bool = False,
     ) -> None:
-        """Initialize the MyStrom API client."""
+        """
+        Initialize the MyStrom API client.
+
+        Args:
+            host: Device host name or IP address
+            session: Shared session, or None to use a dedicated keep-alive
+                connection owned by this client
+            timeout: Total request timeout in seconds
+            traces: Bounded buffer receiving a trace of every request, with
+                the timestamp, endpoint, latency, status, body size and keys
+            connect_timeout: Timeout for establishing a connection in seconds
+            read_timeout: Max seconds between two reads from the connection
+            hedge: Send a second attempt of slow status requests
+
+        """
         self.host = host.rstrip("/")
         # MyStrom devices use HTTP, not HTTPS
         self._base_url = f"http://{self.host}"  # nosec
-        self._session = session
-        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        # Prebuilt endpoint URLs avoid joining and parsing on every request
+        self._urls = {
+            endpoint: URL(f"{self._base_url}{endpoint}") for endpoint in _ENDPOINTS
+        }
+        # Devices accepting the connection and then stalling fail on the
+        # read timeout instead of holding the request for the total timeout
+        self._timeout = aiohttp.ClientTimeout(
+            total=timeout,
+            sock_connect=min(connect_timeout, timeout),
+            sock_read=min(read_timeout, timeout),
+        )
+        self.hedge = hedge
+        self.hedged_requests = 0
+        self.hedges_won = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.decode_count = 0
+        self.decode_time = 0.0
+        self.circuit_breaker = MyStromCircuitBreaker()
+        self.metrics = MyStromRequestMetrics()
+        # Latency of first attempts that succeeded or were overtaken by the
+        # hedge, the hedge delay must not grow with failed or timed out ones
+        self.first_attempts = MyStromRequestMetrics()
+        self._traces = traces
+        self._static_info: dict[str, Any] | None = None
+        self._static_info_expires = 0.0
+        self._command_lock = asyncio.Lock()
+        self._pending_command: _RelayCommand | None = None
+        self._command_tasks: set[asyncio.Task[None]] = set()
+        self._owns_session = session is None
+        self._session = (
+            session if session is not None else self._create_dedicated_session()
+        )
+
+    def _create_dedicated_session(self) -> aiohttp.ClientSession:
+        """
+        Create a session with a single keep-alive connection to the device.
+
+        The small HTTP servers of the devices are slow at accepting new
+        connections, so one connection is kept open and reused.
+
+        Returns:
+            Session owned by this client
+
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        connector = aiohttp.TCPConnector(
+            # A hedged attempt needs its own connection
+            limit_per_host=2 if self.hedge else 1,
+            keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+            use_dns_cache=True,
+            ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    async def _on_connection_create(
+        self, _session: aiohttp.ClientSession, _context: SimpleNamespace, _params: Any
+    ) -> None:
+        """Count a newly established connection."""
+        self.connections_created += 1
+
+    async def _on_connection_reuse(
+        self, _session: aiohttp.ClientSession, _context: SimpleNamespace, _params: Any
+    ) -> None:
+        """Count a reused keep-alive connection."""
+        self.connections_reused += 1
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return connection reuse counters of the dedicated session."""
+        return {
+            "created": self.connections_created,
+            "reused": self.connections_reused,
+        }
+
+    @property
+    def hedge_stats(self) -> dict[str, Any]:
+        """Return how often a second attempt was sent and answered first."""
+        return {
+            "enabled": self.hedge,
+            "requests": self.hedged_requests,
+            "won": self.hedges_won,
+        }
+
+    @property
+    def decode_stats(self) -> dict[str, float]:
+        """Return the CPU time spent decoding response bodies."""
+        return {
+            "count": self.decode_count,
+            "total_ms": round(self.decode_time * 1000, 3),
+            "average_us": round(self.decode_time / self.decode_count * 1e6, 1)
+            if self.decode_count
+            else 0.0,
+        }
+
+    async def close(self) -> None:
+        """
+        Abort queued relay commands and close the dedicated session.
+
+        Callers waiting for an aborted command receive a connection error.
+        """
+        tasks = list(self._command_tasks)
+        for task in tasks:
+            task.cancel()
+        # Let the commands fail their waiters before the session goes away
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # A task cancelled before it started never reached its cleanup
+        if self._pending_command is not None:
+            self._abort_relay_command(self._pending_command)
+        if self._owns_session and not self._session.closed:
+            await self._session.close()
 
     async def _request(
         self,
         method: str,
         endpoint: str,
         params: dict[str, Any] | None = None,
+        *,
+        parse: bool = True,
         **kwargs: Any,
     ) -> dict[str, Any] | None:
         """
@@ -64,54 +299,277 @@ class MyStromAPI:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             params: Query parameters
+            parse: False to drain the response body without decoding it
             **kwargs: Additional arguments for aiohttp
 
         Returns:
             Response data as dictionary, or None if empty
 
         Raises:
+            MyStromCircuitOpenError: If the device is considered unreachable
             MyStromConnectionError: If connection fails
             MyStromAPIError: If API returns an error
 
         """
-        url = urljoin(self._base_url, endpoint.lstrip("/"))
-
+        if not self.circuit_breaker.allow_request():
+            msg = (
+                f"{self.host} is unreachable, retrying in "
+                f"{self.circuit_breaker.retry_in:.0f} s"
+            )
+            raise MyStromCircuitOpenError(msg)
+
+        start = perf_counter()
         try:
-            async with self._session.request(
-                method,
-                url,
-                params=params,
-                timeout=self._timeout,
-                **kwargs,
-            ) as response:
-                if response.status >= HTTP_STATUS_BAD_REQUEST:
-                    error_text = await response.text()
-                    msg = f"HTTP {response.status}: {error_text}"
-                    raise MyStromAPIError(msg)
-
-                # Some endpoints return empty responses
-                if (
-                    response.status == HTTP_STATUS_NO_CONTENT
-                    or response.content_length == 0
-                ):
-                    return None
-
-                try:
-                    data: dict[str, Any] = await response.json()
-                except aiohttp.ContentTypeError:
-                    # Some endpoints return plain text
-                    if text := await response.text():
-                        return {"response": text}
-                    return None
-                else:
-                    return data
-
+            try:
+                result = await self._send_hedged(
+                    method, endpoint, params, parse=parse, **kwargs
+                )
+            except aiohttp.ServerDisconnectedError:
+                if endpoint not in _HEDGED_ENDPOINTS:
+                    raise
+                # The device may have closed a kept-alive connection meanwhile
+                _LOGGER.debug("%s closed the connection, retrying once", self.host)
+                result = await self._send(
+                    method, endpoint, params, parse=parse, **kwargs
+                )
         except TimeoutError as err:
+            self.metrics.record(endpoint, perf_counter() - start, OUTCOME_TIMEOUT)
+            self._trace(endpoint, start, OUTCOME_TIMEOUT)
+            self.circuit_breaker.record_failure()
             msg = f"Timeout connecting to {self.host}: {err}"
             raise MyStromConnectionError(msg) from err
         except aiohttp.ClientError as err:
+            self.metrics.record(
+                endpoint, perf_counter() - start, OUTCOME_CONNECTION_ERROR
+            )
+            self._trace(endpoint, start, OUTCOME_CONNECTION_ERROR)
+            self.circuit_breaker.record_failure()
             msg = f"Error communicating with {self.host}: {err}"
             raise MyStromConnectionError(msg) from err
+        except MyStromAPIError:
+            self.metrics.record(endpoint, perf_counter() - start, OUTCOME_HTTP_ERROR)
+            raise
+        except asyncio.CancelledError:
+            self.circuit_breaker.cancel_probe()
+            raise
+
+        self.metrics.record(endpoint, perf_counter() - start, OUTCOME_SUCCESS)
+        return result
+
+    def _hedge_delay(self, endpoint: str) -> float | None:
+        """
+        Return the delay after which a second attempt is sent.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            Delay in seconds, or None while too few first attempts succeeded
+
+        """
+        metrics = self.first_attempts.endpoints.get(endpoint)
+        if metrics is None or metrics.requests < HEDGE_MIN_SAMPLES:
+            return None
+        if (latency := metrics.percentile(HEDGE_PERCENTILE)) is None:
+            return None
+        return max(latency, HEDGE_MIN_DELAY)
+
+    async def _send_hedged(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        *,
+        parse: bool,
+        **kwargs: Any,
+    ) -> dict[str, Any] | None:
+        """
+        Send a request and a second attempt if the first one is slow.
+
+        The second attempt is only sent for idempotent reads when no response
+        arrived within the usual latency of the endpoint. The first
+        successful response is returned and the other attempt is cancelled.
+        """
+        if not self.hedge or endpoint not in _HEDGED_ENDPOINTS:
+            return await self._send(method, endpoint, params, parse=parse, **kwargs)
+
+        start = perf_counter()
+        first = asyncio.create_task(
+            self._send(method, endpoint, params, parse=parse, **kwargs)
+        )
+        first.add_done_callback(partial(self._record_first_attempt, endpoint, start))
+        pending: set[asyncio.Task[dict[str, Any] | None]] = {first}
+        try:
+            # Without a known latency the first attempt is awaited unhedged
+            done, pending = await asyncio.wait(
+                pending, timeout=self._hedge_delay(endpoint)
+            )
+            if done:
+                return first.result()
+
+            self.hedged_requests += 1
+            _LOGGER.debug("%s is slow, sending a second %s", self.host, endpoint)
+            pending.add(
+                asyncio.create_task(
+                    self._send(method, endpoint, params, parse=parse, **kwargs)
+                )
+            )
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        if task is not first:
+                            self.hedges_won += 1
+                            if not first.done():
+                                # Still running, so at least this slow. Left
+                                # out, the slow samples above the delay would
+                                # be missing and the delay would only shrink.
+                                self.first_attempts.record(
+                                    endpoint, perf_counter() - start, OUTCOME_SUCCESS
+                                )
+                        return task.result()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_first_attempt(
+        self, endpoint: str, start: float, task: asyncio.Task[Any]
+    ) -> None:
+        """Record the latency of a first attempt if it succeeded."""
+        if not task.cancelled() and task.exception() is None:
+            self.first_attempts.record(
+                endpoint, perf_counter() - start, OUTCOME_SUCCESS
+            )
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        *,
+        parse: bool,
+        **kwargs: Any,
+    ) -> dict[str, Any] | None:
+        """Send a single request and decode the response."""
+        start = perf_counter()
+        url = self._urls.get(endpoint) or urljoin(self._base_url, endpoint.lstrip("/"))
+        async with self._session.request(
+            method,
+            url,
+            params=params,
+            timeout=self._timeout,
+            **kwargs,
+        ) as response:
+            self.circuit_breaker.record_success()
+
+            if response.status >= HTTP_STATUS_BAD_REQUEST:
+                # Report the status even if the error page exceeds the size limit
+                body = await response.content.read(MAX_RESPONSE_SIZE)
+                self.metrics.record_bytes(endpoint, len(body))
+                self._trace(endpoint, start, response.status, len(body))
+                error_text = body.decode(errors="replace")
+                msg = f"HTTP {response.status}: {error_text}"
+                raise MyStromAPIError(msg, response.status)
+
+            # Some endpoints return empty responses
+            if (
+                response.status == HTTP_STATUS_NO_CONTENT
+                or response.content_length == 0
+            ):
+                body = b""
+            else:
+                body = await self._read_body(response)
+                self.metrics.record_bytes(endpoint, len(body))
+
+            data = self._decode_body(body) if body and parse else None
+            self._trace(endpoint, start, response.status, len(body), data)
+            return data
+
+    def _trace(
+        self,
+        endpoint: str,
+        start: float,
+        status: int | str,
+        size: int = 0,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Append a request trace to the trace buffer, if one is kept.
+
+        Traces are stored as plain tuples and only formatted when read.
+
+        Args:
+            endpoint: API endpoint path
+            start: perf_counter() value when the request was sent
+            status: HTTP status, or the outcome if no response was received
+            size: Size of the response body
+            data: Decoded response, its keys are recorded
+
+        """
+        if self._traces is not None:
+            self._traces.append(
+                (
+                    time(),
+                    endpoint,
+                    perf_counter() - start,
+                    status,
+                    size,
+                    tuple(data) if data else (),
+                )
+            )
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """
+        Read the response body once, bounded by the maximum response size.
+
+        Args:
+            response: Response to read
+
+        Returns:
+            Raw response body
+
+        Raises:
+            MyStromAPIError: If the body exceeds the maximum size
+
+        """
+        msg = f"Response from {self.host} exceeds {MAX_RESPONSE_SIZE} bytes"
+        if (response.content_length or 0) > MAX_RESPONSE_SIZE:
+            raise MyStromAPIError(msg)
+
+        body = b""
+        while chunk := await response.content.read(MAX_RESPONSE_SIZE + 1 - len(body)):
+            body += chunk
+            if len(body) > MAX_RESPONSE_SIZE:
+                raise MyStromAPIError(msg)
+        return body
+
+    def _decode_body(self, body: bytes) -> dict[str, Any]:
+        """
+        Decode a response body without reading it again.
+
+        Args:
+            body: Raw response body
+
+        Returns:
+            Decoded JSON object, or the plain text wrapped in a dictionary
+
+        """
+        start = perf_counter()
+        try:
+            data = json_loads(body)
+        except ValueError:
+            # Some endpoints return plain text
+            data = {"response": body.decode(errors="replace")}
+        else:
+            if not isinstance(data, dict):
+                data = {"response": data}
+        self.decode_count += 1
+        self.decode_time += perf_counter() - start
+        return data
 
     async def get_report(self) -> dict[str, Any]:
         """
@@ -130,23 +588,169 @@ class MyStromAPI:
         msg = "Empty response from device"
         raise MyStromAPIError(msg)
 
-    async def set_relay(self, *, state: bool) -> None:
+    async def get_info(self) -> dict[str, Any]:
+        """
+        Get static device information, e.g. MAC address, type and firmware.
+
+        Returns:
+            Device information
+
+        Raises:
+            MyStromConnectionError: If connection fails
+            MyStromAPIError: If API returns an error
+
+        """
+        if data := await self._request("GET", API_ENDPOINT_INFO):
+            return data
+        msg = "Empty response from device"
+        raise MyStromAPIError(msg)
+
+    async def get_static_info(self) -> dict[str, Any]:
+        """
+        Get the cached device information, fetching it once per TTL.
+
+        Devices without the info endpoint are not asked again until the
+        cache expires. Other errors keep the previous information and are
+        retried after a short backoff.
+
+        Returns:
+            Device information, empty if the device does not provide it
+
+        Raises:
+            MyStromConnectionError: If connection fails while fetching
+
+        """
+        if monotonic() >= self._static_info_expires:
+            try:
+                info = await self.get_info()
+            except MyStromAPIError as err:
+                if err.status != HTTP_STATUS_NOT_FOUND:
+                    _LOGGER.debug(
+                        "Keeping device information of %s: %s", self.host, err
+                    )
+                    self._static_info_expires = monotonic() + STATIC_INFO_RETRY
+                    return self._static_info or {}
+                _LOGGER.debug("No device information from %s: %s", self.host, err)
+                info = {}
+            self.set_static_info(info)
+        return self._static_info or {}
+
+    def set_static_info(self, info: dict[str, Any], *, renew: bool = True) -> None:
+        """
+        Store device information fetched elsewhere, e.g. during setup.
+
+        Args:
+            info: Device information
+            renew: False to keep the time the information is fetched again,
+                e.g. when only fields from a report were merged in
+
+        """
+        self._static_info = info
+        if renew:
+            self._static_info_expires = monotonic() + STATIC_INFO_TTL
+
+    def invalidate_static_info(self) -> None:
+        """Fetch the device information again, e.g. after a firmware update."""
+        self._static_info_expires = 0.0
+
+    async def _queue_relay_command(
+        self,
+        *,
+        state: bool | None = None,
+        endpoint: str | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Queue a relay command and wait for the merged command to be sent.
+
+        Relay commands are sent one at a time. Commands queued while another
+        one is in flight are merged: an absolute state supersedes everything
+        queued before it and consecutive toggles cancel out. Every caller
+        receives the result of the merged command, which is the relay state
+        to apply rather than the state the caller asked for.
+
+        Args:
+            state: Absolute relay state, or None to toggle
+            endpoint: Endpoint setting the absolute state
+
+        Returns:
+            Relay state set by the merged command or the toggle response,
+            None if nothing was sent
+
+        Raises:
+            MyStromConnectionError: If connection fails
+            MyStromAPIError: If API returns an error
+
+        """
+        if (command := self._pending_command) is None:
+            loop = asyncio.get_running_loop()
+            command = self._pending_command = _RelayCommand(loop.create_future())
+            # Waiters may all be cancelled before the command completes
+            command.future.add_done_callback(_retrieve_exception)
+            task = loop.create_task(self._send_relay_command(command))
+            self._command_tasks.add(task)
+            task.add_done_callback(self._command_tasks.discard)
+
+        if state is None or endpoint is None:
+            command.merge_toggle()
+        else:
+            command.merge_state(state=state, endpoint=endpoint)
+
+        # Shielded so a cancelled caller does not abort the shared command
+        return await asyncio.shield(command.future)
+
+    async def _send_relay_command(self, command: _RelayCommand) -> None:
+        """Send a queued relay command once the previous one completed."""
+        try:
+            async with self._command_lock:
+                self._pending_command = None
+                try:
+                    if command.endpoint == API_ENDPOINT_RELAY:
+                        await self._request(
+                            "GET",
+                            API_ENDPOINT_RELAY,
+                            params={"state": 1 if command.state else 0},
+                            parse=False,
+                        )
+                        result = {KEY_RELAY: command.state}
+                    elif command.endpoint is not None:
+                        await self._request("GET", command.endpoint, parse=False)
+                        result = {KEY_RELAY: command.state}
+                    elif command.toggle:
+                        result = await self._request("GET", API_ENDPOINT_TOGGLE)
+                    else:
+                        result = None
+                except Exception as err:  # noqa: BLE001
+                    command.future.set_exception(err)
+                else:
+                    command.future.set_result(result)
+        finally:
+            # Cancelled by close(), possibly before the command was sent
+            self._abort_relay_command(command)
+
+    def _abort_relay_command(self, command: _RelayCommand) -> None:
+        """Fail the waiters of a relay command that will not be sent."""
+        if self._pending_command is command:
+            self._pending_command = None
+        if not command.future.done():
+            msg = f"Connection to {self.host} closed before the command completed"
+            command.future.set_exception(MyStromConnectionError(msg))
+
+    async def set_relay(self, *, state: bool) -> dict[str, Any] | None:
         """
         Set relay state.
 
         Args:
             state: True to turn on, False to turn off
 
+        Returns:
+            Relay state of the merged command that was sent
+
         Raises:
             MyStromConnectionError: If connection fails
             MyStromAPIError: If API returns an error
 
         """
-        await self._request(
-            "GET",
-            API_ENDPOINT_RELAY,
-            params={"state": 1 if state else 0},
-        )
+        return await self._queue_relay_command(state=state, endpoint=API_ENDPOINT_RELAY)
 
     async def toggle_relay(self) -> dict[str, Any] | None:
         """
@@ -160,29 +764,35 @@ class MyStromAPI:
             MyStromAPIError: If API returns an error
 
         """
-        return await self._request("GET", API_ENDPOINT_TOGGLE)
+        return await self._queue_relay_command()
 
-    async def turn_on(self) -> None:
+    async def turn_on(self) -> dict[str, Any] | None:
         """
         Turn device on.
 
+        Returns:
+            Relay state of the merged command that was sent
+
         Raises:
             MyStromConnectionError: If connection fails
             MyStromAPIError: If API returns an error
 
         """
-        await self._request("GET", API_ENDPOINT_ON)
+        return await self._queue_relay_command(state=True, endpoint=API_ENDPOINT_ON)
 
-    async def turn_off(self) -> None:
+    async def turn_off(self) -> dict[str, Any] | None:
         """
         Turn device off.
 
+        Returns:
+            Relay state of the merged command that was sent
+
         Raises:
             MyStromConnectionError: If connection fails
             MyStromAPIError: If API returns an error
 
         """
-        await self._request("GET", API_ENDPOINT_OFF)
+        return await self._queue_relay_command(state=False, endpoint=API_ENDPOINT_OFF)
 
     async def reboot(self) -> None:
         """
@@ -193,4 +803,7 @@ class MyStromAPI:
             MyStromAPIError: If API returns an error
 
         """
-        await self._request("GET", "/reboot")
+        async with self._command_lock:
+            await self._request("GET", API_ENDPOINT_REBOOT, parse=False)
+        # The firmware may have been updated by the reboot
+        self.invalidate_static_info()
@@ -0,0 +1,104 @@
+"""Circuit breaker for unreachable MyStrom devices."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any
+
+from .const import (
+    CIRCUIT_BREAKER_BASE_BACKOFF,
+    CIRCUIT_BREAKER_MAX_BACKOFF,
+    CIRCUIT_BREAKER_THRESHOLD,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class MyStromCircuitBreaker:
+    """
+    Fail fast while a device is unreachable.
+
+    The breaker opens after a number of consecutive connection failures.
+    While open, requests are rejected without touching the network. Once the
+    backoff elapsed a single probe request is let through (half-open); if it
+    fails the breaker opens again with twice the backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        base_backoff: float = CIRCUIT_BREAKER_BASE_BACKOFF,
+        max_backoff: float = CIRCUIT_BREAKER_MAX_BACKOFF,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._failures = 0
+        self._trips = 0
+        self._open = False
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return the current breaker state."""
+        if not self._open:
+            return STATE_CLOSED
+        if self._probing or monotonic() >= self._retry_at:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until the next probe is allowed."""
+        if not self._open:
+            return 0.0
+        return max(0.0, self._retry_at - monotonic())
+
+    def allow_request(self) -> bool:
+        """
+        Return True if a request may be sent to the device.
+
+        Returns:
+            False while the breaker is open or a half-open probe is running
+
+        """
+        if not self._open:
+            return True
+        if self._probing or monotonic() < self._retry_at:
+            return False
+        self._probing = True
+        return True
+
+    def cancel_probe(self) -> None:
+        """Allow a new probe after a probe request was cancelled."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker after the device responded."""
+        self._failures = 0
+        self._trips = 0
+        self._open = False
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a connection failure and open the breaker if needed."""
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            backoff = min(self._base_backoff * 2**self._trips, self._max_backoff)
+            self._trips += 1
+            self._open = True
+            self._probing = False
+            self._retry_at = monotonic() + backoff
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in, 1),
+        }
@@ -8,16 +8,48 @@ from typing import TYPE_CHECKING, Any
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import MyStromAPI, MyStromConnectionError
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEDICATED_CONNECTION,
     CONF_DEVICE_TYPE,
+    CONF_FAST_START,
+    CONF_FLEET_POLLING,
+    CONF_HEDGED_REQUESTS,
+    CONF_IMPORT_STATISTICS,
+    CONF_POWER_DEADBAND,
+    CONF_POWER_DEADBAND_PERCENT,
+    CONF_PUSH_UPDATES,
+    CONF_READ_TIMEOUT,
+    CONF_STATISTICS_WINDOW,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_TIMEOUT,
+    DEVICE_TYPE_CODES,
     DOMAIN,
     ERROR_CANNOT_CONNECT,
+    ERROR_INVALID_NETWORK,
+    ERROR_NO_DEVICES_FOUND,
     ERROR_UNKNOWN,
+    MAX_POWER_DEADBAND,
+    MAX_POWER_DEADBAND_PERCENT,
+    MAX_STATISTICS_WINDOW,
+    MAX_TEMPERATURE_DEADBAND,
+    MAX_TIMEOUT,
+    POWER_DEADBAND_ABSOLUTE,
+    POWER_DEADBAND_PERCENT,
+    TEMPERATURE_DEADBAND_ABSOLUTE,
 )
+from .discovery import async_start_discovery_flow, async_sweep_network, format_mac
+from .probe import async_probe_device
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -40,16 +72,20 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate the user input allows us to connect."""
     api = MyStromAPI(data[CONF_HOST], async_get_clientsession(hass))
     try:
-        if not (report := await api.get_report()):
+        report, info = await async_probe_device(hass, api)
+        if not report:
             msg = "Device did not return status report"
             raise CannotConnectError(msg)  # noqa: TRY301
 
-        # Extract MAC from report if not provided
-        if not data.get(CONF_MAC) and (mac := report.get("mac")):
-            data[CONF_MAC] = mac
+        # Use the MAC from the device information or report if not provided,
+        # formatted like discovered MACs so unique IDs match on every path
+        if mac := data.get(CONF_MAC) or info.get("mac") or report.get("mac"):
+            data[CONF_MAC] = format_mac(str(mac))
 
-        # Extract device type from report if available
-        if device_type := report.get("type"):
+        # Extract device type from the device information or report
+        if (code := info.get("type")) in DEVICE_TYPE_CODES:
+            data[CONF_DEVICE_TYPE] = DEVICE_TYPE_CODES[code]
+        elif device_type := report.get("type"):
             device_type_map = {
                 "Switch": "switch",
                 "Zero": "zero",
@@ -75,6 +111,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, Any] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # type: ignore[type-arg]  # noqa: ARG004
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> Any:
         """
         Handle the initial step.
@@ -88,13 +136,37 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
         """
         errors: dict[str, str] = {}
 
-        if user_input is not None:
+        if user_input is not None and "/" in user_input[CONF_HOST]:
+            # A network was entered, sweep it for devices
+            try:
+                found = await async_sweep_network(self.hass, user_input[CONF_HOST])
+            except ValueError:
+                errors["base"] = ERROR_INVALID_NETWORK
+            else:
+                configured = self._async_current_ids()
+                new = {m: h for m, h in found.items() if m not in configured}
+                for mac, host in new.items():
+                    async_start_discovery_flow(self.hass, host, mac, "switch")
+                if new:
+                    return self.async_abort(
+                        reason="devices_discovered",
+                        description_placeholders={"count": str(len(new))},
+                    )
+                errors["base"] = ERROR_NO_DEVICES_FOUND
+        elif user_input is not None:
             try:
                 validated_data = await validate_input(self.hass, user_input)
+            except CannotConnectError:
+                errors["base"] = ERROR_CANNOT_CONNECT
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = ERROR_UNKNOWN
+            else:
                 device_name = validated_data.get(CONF_NAME) or validated_data[CONF_HOST]
                 mac = validated_data.get(CONF_MAC) or validated_data[CONF_HOST]
 
-                # Check if already configured
+                # Check if already configured, outside the try so the abort
+                # is not reported as an unknown error
                 await self.async_set_unique_id(mac)
                 self._abort_if_unique_id_configured()
 
@@ -102,16 +174,178 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
                     title=device_name,
                     data=validated_data,
                 )
-            except CannotConnectError:
-                errors["base"] = ERROR_CANNOT_CONNECT
-            except Exception:
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = ERROR_UNKNOWN
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> Any:
+        """
+        Handle a device found by the announcement listener or a sweep.
+
+        Args:
+            discovery_info: Host, MAC address and device type
+
+        Returns:
+            Flow result
+
+        """
+        await self.async_set_unique_id(format_mac(discovery_info[CONF_MAC]))
+        # Known devices may have received a new address
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: discovery_info[CONF_HOST]}
+        )
+        # Entries without a MAC address are only known by their host
+        self._async_abort_entries_match({CONF_HOST: discovery_info[CONF_HOST]})
+        self._discovered = dict(discovery_info)
+        self.context["title_placeholders"] = {"name": discovery_info[CONF_HOST]}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> Any:
+        """
+        Confirm adding a discovered device.
+
+        Args:
+            user_input: User input data
+
+        Returns:
+            Flow result
+
+        """
+        if user_input is not None:
+            discovered = dict(self._discovered)
+            if discovered[CONF_MAC] == discovered[CONF_HOST]:
+                # A sweep found no MAC address, let the probe look it up
+                del discovered[CONF_MAC]
+            try:
+                data = await validate_input(self.hass, discovered)
+            except CannotConnectError:
+                return self.async_abort(reason=ERROR_CANNOT_CONNECT)
+
+            # The probed MAC address may identify a configured device
+            await self.async_set_unique_id(
+                data.get(CONF_MAC) or data[CONF_HOST], raise_on_progress=False
+            )
+            self._abort_if_unique_id_configured(updates={CONF_HOST: data[CONF_HOST]})
+            return self.async_create_entry(title=data[CONF_HOST], data=data)
+
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={
+                "host": self._discovered[CONF_HOST],
+                "mac": self._discovered[CONF_MAC],
+            },
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle MyStrom LDS50 options."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> Any:
+        """
+        Manage the options.
+
+        Args:
+            user_input: User input data
+
+        Returns:
+            Flow result
+
+        """
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_FLEET_POLLING,
+                        default=options.get(CONF_FLEET_POLLING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUSH_UPDATES,
+                        default=options.get(CONF_PUSH_UPDATES, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DEDICATED_CONNECTION,
+                        default=options.get(CONF_DEDICATED_CONNECTION, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HEDGED_REQUESTS,
+                        default=options.get(CONF_HEDGED_REQUESTS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TIMEOUT,
+                        default=options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_TIMEOUT)),
+                    vol.Optional(
+                        CONF_CONNECT_TIMEOUT,
+                        default=options.get(
+                            CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_TIMEOUT)),
+                    vol.Optional(
+                        CONF_READ_TIMEOUT,
+                        default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_TIMEOUT)),
+                    vol.Optional(
+                        CONF_FAST_START,
+                        default=options.get(CONF_FAST_START, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_POWER_DEADBAND,
+                        default=options.get(
+                            CONF_POWER_DEADBAND, POWER_DEADBAND_ABSOLUTE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_POWER_DEADBAND),
+                    ),
+                    vol.Optional(
+                        CONF_POWER_DEADBAND_PERCENT,
+                        default=options.get(
+                            CONF_POWER_DEADBAND_PERCENT, POWER_DEADBAND_PERCENT
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_POWER_DEADBAND_PERCENT),
+                    ),
+                    vol.Optional(
+                        CONF_TEMPERATURE_DEADBAND,
+                        default=options.get(
+                            CONF_TEMPERATURE_DEADBAND, TEMPERATURE_DEADBAND_ABSOLUTE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_TEMPERATURE_DEADBAND),
+                    ),
+                    vol.Optional(
+                        CONF_IMPORT_STATISTICS,
+                        default=options.get(CONF_IMPORT_STATISTICS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_STATISTICS_WINDOW,
+                        default=options.get(
+                            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_STATISTICS_WINDOW),
+                    ),
+                }
+            ),
+        )
+
 
 class CannotConnectError(HomeAssistantError):
     """Error to indicate we cannot connect."""
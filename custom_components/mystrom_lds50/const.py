@@ -15,16 +15,123 @@ CONF_NAME = "name"
 CONF_DEVICE_TYPE = "device_type"
 CONF_TOKEN = "token"  # nosec B105  # noqa: S105
 
+# Option keys
+CONF_FLEET_POLLING = "fleet_polling"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_DEDICATED_CONNECTION = "dedicated_connection"
+CONF_FAST_START = "fast_start"
+CONF_TIMEOUT = "timeout"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_HEDGED_REQUESTS = "hedged_requests"
+
 # Default values
-DEFAULT_TIMEOUT = 10
+DEFAULT_TIMEOUT = 10  # Total seconds per request
+DEFAULT_CONNECT_TIMEOUT = 3
+DEFAULT_READ_TIMEOUT = 5  # Max seconds between two reads from the socket
+MAX_TIMEOUT = 60
 DEFAULT_SCAN_INTERVAL = 30
+STATIC_INFO_TTL = 86400  # Static device information is refreshed daily
+STATIC_INFO_RETRY = 300  # Seconds until a failed information request is retried
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_RECONCILE_DELAY = 2
+# Max seconds the first refresh of fast starting entries is spread over
+FAST_START_STAGGER = 10
+
+# Fleet poller
+DATA_FLEET_POLLER = f"{DOMAIN}_fleet_poller"
+DEFAULT_FLEET_TICK_INTERVAL = 5
+DEFAULT_FLEET_MAX_CONCURRENCY = 16
+
+# Entity to coordinator index shared by all config entries
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+
+# Device probing during setup
+DATA_PROBE_CACHE = f"{DOMAIN}_probe_cache"
+PROBE_DEADLINE = 5  # Seconds for all probe requests together
+PROBE_CACHE_TTL = 30
+
+# Discovery
+DATA_DISCOVERY_LISTENER = f"{DOMAIN}_discovery_listener"
+DISCOVERY_PORT = 7979  # UDP port of the device announcements
+SWEEP_MAX_CONCURRENCY = 64
+SWEEP_MAX_HOSTS = 1024
+SWEEP_RATE = 200  # Connection attempts per second
+SWEEP_TIMEOUT = 1
+
+# Adaptive polling
+ADAPTIVE_MIN_INTERVAL = 5
+ADAPTIVE_MAX_INTERVAL = 300
+ADAPTIVE_BACKOFF_FACTOR = 2
+ADAPTIVE_POWER_THRESHOLD = 1.0  # Watts
+
+# Refresh tiers, slow tier entities only write newly sampled readings
+TIER_FAST = "fast"  # Relay and power, every poll
+TIER_SLOW = "slow"  # Temperature, WiFi signal and request statistics
+SLOW_TIER_INTERVAL = 300
+
+# Hedged requests, a second attempt is sent when the first one is slower
+# than the 95th percentile of the endpoint
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20  # Requests recorded before the percentile is trusted
+HEDGE_MIN_DELAY = 0.05  # Seconds
+
+# Circuit breaker
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_BASE_BACKOFF = 30
+CIRCUIT_BREAKER_MAX_BACKOFF = 600
+
+# Sensor deadbands, state writes below these changes are skipped. The
+# power and temperature defaults can be changed in the options, 0 writes
+# every change.
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_POWER_DEADBAND_PERCENT = "power_deadband_percent"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+POWER_DEADBAND_ABSOLUTE = 0.5  # Watts
+POWER_DEADBAND_PERCENT = 2.0  # Percent of the last written value
+TEMPERATURE_DEADBAND_ABSOLUTE = 0.2  # Celsius
+MAX_POWER_DEADBAND = 100.0  # Watts
+MAX_POWER_DEADBAND_PERCENT = 50.0
+MAX_TEMPERATURE_DEADBAND = 5.0  # Celsius
+ENERGY_DEADBAND_ABSOLUTE = 0.001  # kWh
+SENSOR_HEARTBEAT = 300  # Max seconds between state writes
+
+# Push updates
+PUSH_FALLBACK_INTERVAL = 300
+
+# Largest response body accepted from a device
+MAX_RESPONSE_SIZE = 16384
+
+# Upper bounds of the request latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Number of recent requests kept for diagnostics
+DIAGNOSTICS_TRACE_SIZE = 50
 
 # HTTP status codes
 HTTP_STATUS_BAD_REQUEST = 400
 HTTP_STATUS_NO_CONTENT = 204
+HTTP_STATUS_NOT_FOUND = 404
+
+# Rolling power statistics
+CONF_STATISTICS_WINDOW = "statistics_window"
+DEFAULT_STATISTICS_WINDOW = 15  # Minutes
+MAX_STATISTICS_WINDOW = 60  # Minutes
+# Samples received faster, e.g. pushed, are thinned out to this spacing so
+# the buffer sized for the window always covers the whole window
+POWER_HISTORY_MIN_SPACING = 2  # Seconds
 
-# Energy conversion
-ENERGY_WH_TO_KWH_THRESHOLD = 1000
+# Local energy integration
+ENERGY_STORAGE_VERSION = 1
+STATISTICS_STORAGE_VERSION = 1
+# Hours kept for import while the recorder is not loaded, older are dropped
+STATISTICS_MAX_PENDING_HOURS = 48
+ENERGY_SAVE_DELAY = 60
+# Longer intervals without power samples are not integrated
+ENERGY_MAX_SAMPLE_GAP = 600
 
 # API endpoints
 API_ENDPOINT_REPORT = "/report"
@@ -32,6 +139,8 @@ API_ENDPOINT_RELAY = "/relay"
 API_ENDPOINT_TOGGLE = "/toggle"
 API_ENDPOINT_ON = "/on"
 API_ENDPOINT_OFF = "/off"
+API_ENDPOINT_REBOOT = "/reboot"
+API_ENDPOINT_INFO = "/api/v1/info"
 
 # Device status keys
 KEY_POWER = "power"
@@ -39,6 +148,27 @@ KEY_RELAY = "relay"
 KEY_TEMPERATURE = "temperature"
 KEY_ENERGY = "W"
 KEY_WS = "ws"  # WiFi signal strength
+KEY_MAC = "mac"
+KEY_TYPE = "type"
+KEY_VERSION = "version"  # Firmware version
+# Fields that never change, kept out of the live report data
+STATIC_REPORT_KEYS = (KEY_MAC, KEY_TYPE, KEY_VERSION)
+# Slowly changing fields, only sampled every SLOW_TIER_INTERVAL
+SLOW_TIER_KEYS = (KEY_TEMPERATURE, KEY_WS)
+
+# Devices commanded concurrently by a single service call
+SERVICE_MAX_CONCURRENCY = 16
+
+# Device type codes reported by the info endpoint and announcements
+DEVICE_TYPE_CODES = {
+    101: "switch",  # Switch CH v1
+    102: "bulb",
+    103: "button",  # Button+
+    104: "button",
+    106: "switch",  # Switch CH v2
+    107: "switch",  # Switch EU
+    120: "zero",
+}
 
 # Service names
 SERVICE_SET_RELAY_STATE = "set_relay_state"
@@ -55,8 +185,16 @@ ATTR_FIRMWARE = "firmware"
 ATTR_MAC = "mac"
 ATTR_HOST = "host"
 ATTR_DEVICE_TYPE = "device_type"
+ATTR_CONSECUTIVE_FAILURES = "consecutive_failures"
+ATTR_RETRY_IN = "retry_in"
+ATTR_REQUESTS = "requests"
+ATTR_ERRORS = "errors"
+ATTR_WINDOW = "window"
+ATTR_STALE = "stale"
 
 # Errors
 ERROR_CANNOT_CONNECT = "cannot_connect"
 ERROR_INVALID_AUTH = "invalid_auth"
 ERROR_UNKNOWN = "unknown"
+ERROR_INVALID_NETWORK = "invalid_network"
+ERROR_NO_DEVICES_FOUND = "no_devices_found"
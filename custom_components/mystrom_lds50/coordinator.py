@@ -2,26 +2,72 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+from collections import deque
+from dataclasses import replace
+from datetime import timedelta
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .api import MyStromAPI, MyStromConnectionError
-from .const import DEFAULT_SCAN_INTERVAL
+from .api import MyStromAPI, MyStromConnectionError, MyStromDeviceError
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    ADAPTIVE_POWER_THRESHOLD,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DEDICATED_CONNECTION,
+    CONF_FAST_START,
+    CONF_FLEET_POLLING,
+    CONF_HEDGED_REQUESTS,
+    CONF_IMPORT_STATISTICS,
+    CONF_PUSH_UPDATES,
+    CONF_READ_TIMEOUT,
+    CONF_STATISTICS_WINDOW,
+    CONF_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RECONCILE_DELAY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_TIMEOUT,
+    DIAGNOSTICS_TRACE_SIZE,
+    FAST_START_STAGGER,
+    KEY_POWER,
+    KEY_RELAY,
+    KEY_TEMPERATURE,
+    PUSH_FALLBACK_INTERVAL,
+    SLOW_TIER_INTERVAL,
+    SLOW_TIER_KEYS,
+    STATIC_REPORT_KEYS,
+)
+from .energy import MyStromEnergyAccumulator
+from .models import MyStromSnapshot, parse_float
+from .power_history import MyStromPowerHistory
+from .probe import async_pop_probe
+from .statistics import MyStromStatisticsImporter
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class MyStromDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+class MyStromDataUpdateCoordinator(DataUpdateCoordinator[MyStromSnapshot]):
     """Coordinator for updating MyStrom device data."""
 
     def __init__(
@@ -30,22 +76,285 @@ class MyStromDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         entry: ConfigEntry,  # type: ignore[type-arg]
     ) -> None:
         """Initialize the coordinator."""
+        self.fleet_polling: bool = entry.options.get(CONF_FLEET_POLLING, False)
+        self.fast_start: bool = entry.options.get(CONF_FAST_START, False)
+        self.push_updates: bool = entry.options.get(CONF_PUSH_UPDATES, False)
+        # Pushed updates make polling a slow fallback, so never speed it up
+        self.adaptive_polling: bool = (
+            entry.options.get(CONF_ADAPTIVE_POLLING, False) and not self.push_updates
+        )
+        if self.push_updates:
+            self.poll_interval = timedelta(seconds=PUSH_FALLBACK_INTERVAL)
+        elif self.adaptive_polling:
+            self.poll_interval = timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+        else:
+            self.poll_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
         super().__init__(
             hass,
             _LOGGER,
             name=f"MyStrom {entry.title}",
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            # The fleet poller schedules refreshes instead of a per-entry timer
+            update_interval=None if self.fleet_polling else self.poll_interval,
+            # Commands update state optimistically, so the follow-up poll that
+            # reconciles it with the device can wait and absorb bursts
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=DEFAULT_RECONCILE_DELAY,
+                immediate=False,
+            ),
+        )
+        # Recent requests of the device, formatted only for diagnostics
+        self.traces: deque[tuple[Any, ...]] = deque(maxlen=DIAGNOSTICS_TRACE_SIZE)
+        self.api = MyStromAPI(
+            entry.data["host"],
+            # Without a shared session the client keeps its own connection
+            session=None
+            if entry.options.get(CONF_DEDICATED_CONNECTION, False)
+            else async_get_clientsession(hass),
+            timeout=entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            traces=self.traces,
+            connect_timeout=entry.options.get(
+                CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+            ),
+            read_timeout=entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            hedge=entry.options.get(CONF_HEDGED_REQUESTS, False),
+        )
+        # Device information that does not change between polls
+        self.static_info: dict[str, Any] = {}
+        # Slowly changing readings, sampled every SLOW_TIER_INTERVAL
+        self.slow_data: dict[str, Any] = {}
+        self._slow_tier_due = 0.0
+        self.energy = MyStromEnergyAccumulator(hass, entry.entry_id)
+        self.statistics_window = timedelta(
+            minutes=entry.options.get(CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW)
+        )
+        self.power_history = MyStromPowerHistory(
+            (self.statistics_window.total_seconds(),)
+        )
+        self.statistics_importer = (
+            MyStromStatisticsImporter(hass, entry, self.energy)
+            if entry.options.get(CONF_IMPORT_STATISTICS, False)
+            else None
         )
-        self.api = MyStromAPI(entry.data["host"], session=async_get_clientsession(hass))
         self.entry = entry
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @callback
+    def async_schedule_first_refresh(self) -> asyncio.Task[None]:
+        """
+        Run the first refresh in the background after a random delay.
+
+        Used instead of the blocking first refresh in fast start mode, so
+        unreachable devices do not delay the setup and the first requests
+        of many devices are spread over FAST_START_STAGGER seconds.
+
+        Returns:
+            Task running the first refresh
+
+        """
+        delay = random.uniform(0, FAST_START_STAGGER)  # noqa: S311  # nosec
+        return self.entry.async_create_background_task(
+            self.hass, self._async_delayed_refresh(delay), f"{self.name} first refresh"
+        )
+
+    async def _async_delayed_refresh(self, delay: float) -> None:
+        """Refresh once after a delay unless data arrived meanwhile."""
+        await asyncio.sleep(delay)
+        if self.data is None:
+            await self.async_refresh()
+            if self.last_update_success:
+                _LOGGER.debug("%s is live", self.name)
+
+    async def _async_update_data(self) -> MyStromSnapshot:
         """Fetch data from the device."""
+        data: dict[str, Any] | None = None
+        if self.data is None and (probe := async_pop_probe(self.hass, self.api.host)):
+            # The first refresh reuses the result of a setup probe
+            data, info = probe
+            if info:
+                # Empty if the info request failed, get_static_info() retries
+                self.api.set_static_info(info)
+        elif not self.last_update_success:
+            # The device may have been updated while it was unreachable
+            self.api.invalidate_static_info()
+
         try:
-            if data := await self.api.get_report():
-                return data
-            msg = "Empty response from device"
-            raise UpdateFailed(msg)
+            if not data and not (data := await self.api.get_report()):
+                msg = "Empty response from device"
+                raise UpdateFailed(msg)
         except MyStromConnectionError as err:
             msg = f"Error communicating with device: {err}"
             raise UpdateFailed(msg) from err
+
+        data = self._split_slow_data(await self._async_split_static_info(data))
+        snapshot = self.async_build_snapshot(data)
+        if self.adaptive_polling:
+            self._adapt_poll_interval(snapshot)
+        return snapshot
+
+    async def _async_split_static_info(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Update the static device information and strip it from a report.
+
+        Args:
+            data: Report received from the device
+
+        Returns:
+            Report with only the fields that change
+
+        """
+        try:
+            info = await self.api.get_static_info()
+        except MyStromDeviceError as err:
+            _LOGGER.debug("Keeping device information of %s: %s", self.name, err)
+            info = self.static_info
+
+        if any(key in data for key in STATIC_REPORT_KEYS):
+            static = {key: data[key] for key in STATIC_REPORT_KEYS if key in data}
+            data = {k: v for k, v in data.items() if k not in STATIC_REPORT_KEYS}
+            if any(info.get(key) != value for key, value in static.items()):
+                info = {**info, **static}
+                self.api.set_static_info(info, renew=False)
+
+        # Replaced rather than updated, so entities can detect changes by identity
+        self.static_info = info
+        return data
+
+    def _split_slow_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Sample the slowly changing readings of a report when due.
+
+        Args:
+            data: Report received from the device
+
+        Returns:
+            Report with only the fast changing fields
+
+        """
+        now = monotonic()
+        if now >= self._slow_tier_due:
+            self._slow_tier_due = now + SLOW_TIER_INTERVAL
+            # Replaced rather than updated, so entities can detect new samples
+            self.slow_data = {key: data[key] for key in SLOW_TIER_KEYS if key in data}
+            if KEY_TEMPERATURE in self.slow_data:
+                self.slow_data[KEY_TEMPERATURE] = parse_float(
+                    self.slow_data[KEY_TEMPERATURE]
+                )
+        if not any(key in data for key in SLOW_TIER_KEYS):
+            return data
+        return {k: v for k, v in data.items() if k not in SLOW_TIER_KEYS}
+
+    @callback
+    def async_build_snapshot(
+        self, report: Mapping[str, Any], *, partial: bool = False
+    ) -> MyStromSnapshot:
+        """
+        Parse a report once and record its power reading.
+
+        Args:
+            report: Report or pushed values received from the device
+            partial: Keep the current values of fields missing from the report
+
+        Returns:
+            Snapshot of the device state
+
+        """
+        received = monotonic()
+        power = parse_float(report.get(KEY_POWER))
+        if power is not None:
+            self.record_power(power, received)
+        relay = None if (value := report.get(KEY_RELAY)) is None else bool(value)
+        if partial and self.data is not None:
+            power = self.data.power if power is None else power
+            relay = self.data.relay if relay is None else relay
+        return MyStromSnapshot(
+            power=power,
+            relay=relay,
+            energy=round(self.energy.total, 6),
+            received=received,
+        )
+
+    def record_power(self, power: float, now: float) -> None:
+        """
+        Feed a freshly received power reading to energy and history.
+
+        Args:
+            power: Power in watts
+            now: monotonic() time the reading was received
+
+        """
+        self.energy.add_sample(power, now)
+        self.power_history.add_sample(power, now)
+        if self.statistics_importer is not None:
+            self.statistics_importer.async_add_sample(power)
+
+    def _adapt_poll_interval(self, data: MyStromSnapshot) -> None:
+        """
+        Adjust the poll interval to the observed device activity.
+
+        Polls fast while relay or power change and backs off exponentially
+        up to a ceiling while readings stay flat.
+
+        Args:
+            data: Freshly fetched device state
+
+        """
+        if self.data is None or _is_changing(self.data, data):
+            interval = timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+        else:
+            interval = min(
+                self.poll_interval * ADAPTIVE_BACKOFF_FACTOR,
+                timedelta(seconds=ADAPTIVE_MAX_INTERVAL),
+            )
+        self._set_poll_interval(interval)
+
+    @callback
+    def async_apply_relay_state(self, *, state: bool | None) -> None:
+        """
+        Optimistically apply the relay state resulting from a command.
+
+        Args:
+            state: New relay state, or None if unknown
+
+        """
+        if state is None or self.data is None:
+            return
+        self.async_set_updated_data(replace(self.data, relay=state))
+
+    @callback
+    def async_apply_command_result(self, result: dict[str, Any] | None) -> None:
+        """
+        Optimistically apply the relay state resulting from a relay command.
+
+        Queued commands are merged, so the result may differ from the state
+        the caller requested.
+
+        Args:
+            result: Result of the merged relay command
+
+        """
+        if result and (relay := result.get(KEY_RELAY)) is not None:
+            self.async_apply_relay_state(state=bool(relay))
+
+    @callback
+    def async_reset_poll_interval(self) -> None:
+        """Snap back to fast polling, e.g. after a command was sent."""
+        if self.adaptive_polling:
+            self._set_poll_interval(timedelta(seconds=ADAPTIVE_MIN_INTERVAL))
+
+    def _set_poll_interval(self, interval: timedelta) -> None:
+        """Apply a new poll interval to the timer or the fleet poller."""
+        if interval != self.poll_interval:
+            _LOGGER.debug("%s poll interval is now %s", self.name, interval)
+        self.poll_interval = interval
+        if not self.fleet_polling:
+            self.update_interval = interval
+
+
+def _is_changing(previous: MyStromSnapshot, current: MyStromSnapshot) -> bool:
+    """Return True if relay or power changed between two snapshots."""
+    if previous.relay != current.relay:
+        return True
+    if previous.power is None or current.power is None:
+        return previous.power != current.power
+    return abs(current.power - previous.power) >= ADAPTIVE_POWER_THRESHOLD
@@ -0,0 +1,76 @@
+"""Diagnostics support for MyStrom devices."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_WEBHOOK_ID
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_MAC, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MyStromDataUpdateCoordinator
+
+# The device information also reports the network settings of the device
+TO_REDACT = {
+    CONF_HOST,
+    CONF_WEBHOOK_ID,
+    ATTR_MAC,
+    "title",
+    "unique_id",
+    "ip",
+    "mask",
+    "gw",
+    "dns",
+    "ssid",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # type: ignore[type-arg]
+) -> dict[str, Any]:
+    """
+    Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Configuration entry
+
+    Returns:
+        Redacted diagnostics data
+
+    """
+    coordinator: MyStromDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": asdict(coordinator.data) if coordinator.data else {},
+        "slow_data": coordinator.slow_data,
+        "static_info": async_redact_data(coordinator.static_info, TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "poll_interval": coordinator.poll_interval.total_seconds(),
+        "circuit_breaker": api.circuit_breaker.as_dict(),
+        "requests": api.metrics.as_dict(),
+        "connections": api.connection_stats,
+        "hedging": api.hedge_stats,
+        "decoding": api.decode_stats,
+        "traces": [
+            {
+                "timestamp": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                "endpoint": endpoint,
+                "latency_ms": round(latency * 1000, 1),
+                "status": status,
+                "size": size,
+                "keys": list(keys),
+            }
+            for timestamp, endpoint, latency, status, size, keys in coordinator.traces
+        ],
+    }
@@ -0,0 +1,218 @@
+"""Network discovery of MyStrom devices."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+from string import hexdigits
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.const import CONF_HOST, CONF_MAC, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    API_ENDPOINT_INFO,
+    API_ENDPOINT_REPORT,
+    CONF_DEVICE_TYPE,
+    DEVICE_TYPE_CODES,
+    DISCOVERY_PORT,
+    DOMAIN,
+    HTTP_STATUS_BAD_REQUEST,
+    MAX_RESPONSE_SIZE,
+    SWEEP_MAX_CONCURRENCY,
+    SWEEP_MAX_HOSTS,
+    SWEEP_RATE,
+    SWEEP_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+_ANNOUNCEMENT_SIZE = 8
+_MAC_DIGITS = 12
+
+
+def format_mac(mac: bytes | str) -> str:
+    """
+    Format a MAC address as upper case, colon separated hex pairs.
+
+    Args:
+        mac: Raw address bytes or a string with or without separators
+
+    Returns:
+        Formatted MAC address, or the string unchanged if it is not a MAC
+        address, e.g. the host used as fallback identifier
+
+    """
+    digits = mac.hex() if isinstance(mac, bytes) else mac.replace(":", "")
+    digits = digits.replace("-", "").upper()
+    if len(digits) != _MAC_DIGITS or not all(c in hexdigits for c in digits):
+        return str(mac)
+    return ":".join(digits[i : i + 2] for i in range(0, len(digits), 2))
+
+
+def parse_announcement(data: bytes) -> tuple[str, str] | None:
+    """
+    Parse a MyStrom UDP announcement.
+
+    Devices broadcast their 6 byte MAC address followed by a device type
+    byte and a flags byte every few seconds.
+
+    Args:
+        data: Datagram payload
+
+    Returns:
+        MAC address and device type, or None if not an announcement
+
+    """
+    if len(data) != _ANNOUNCEMENT_SIZE:
+        return None
+    return format_mac(data[:6]), DEVICE_TYPE_CODES.get(data[6], "switch")
+
+
+class MyStromDiscoveryProtocol(asyncio.DatagramProtocol):
+    """Receive announcements and report every device once per address."""
+
+    def __init__(self, on_device: Callable[[str, str, str], None]) -> None:
+        """
+        Initialize the protocol.
+
+        Args:
+            on_device: Called with host, MAC and device type of new devices
+
+        """
+        self._on_device = on_device
+        # MAC -> last known host, announcements repeat every few seconds
+        self._seen: dict[str, str] = {}
+
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        """Handle a received datagram."""
+        if (announcement := parse_announcement(data)) is None:
+            return
+        mac, device_type = announcement
+        host = str(addr[0])
+        if self._seen.get(mac) == host:
+            return
+        self._seen[mac] = host
+        _LOGGER.debug("Discovered %s %s at %s", device_type, mac, host)
+        self._on_device(host, mac, device_type)
+
+
+@callback
+def async_start_discovery_flow(
+    hass: HomeAssistant, host: str, mac: str, device_type: str
+) -> None:
+    """Offer a discovered device as a config flow."""
+    discovery_flow.async_create_flow(
+        hass,
+        DOMAIN,
+        context={"source": SOURCE_INTEGRATION_DISCOVERY},
+        data={CONF_HOST: host, CONF_MAC: mac, CONF_DEVICE_TYPE: device_type},
+    )
+
+
+async def async_start_listener(hass: HomeAssistant) -> CALLBACK_TYPE | None:
+    """
+    Listen for announcement broadcasts of devices on the local network.
+
+    Args:
+        hass: Home Assistant instance
+
+    Returns:
+        Callback stopping the listener, or None if the port is unavailable
+
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: MyStromDiscoveryProtocol(
+                lambda host, mac, device_type: async_start_discovery_flow(
+                    hass, host, mac, device_type
+                )
+            ),
+            local_addr=("0.0.0.0", DISCOVERY_PORT),  # noqa: S104  # nosec
+            reuse_port=True,
+        )
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Cannot listen for device announcements: %s", err)
+        return None
+
+    @callback
+    def _async_stop(_event: Event | None = None) -> None:
+        """Close the listener."""
+        transport.close()
+        unsub_stop()
+
+    unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    return _async_stop
+
+
+async def async_sweep_network(hass: HomeAssistant, network: str) -> dict[str, str]:
+    """
+    Probe every address of a network for MyStrom devices.
+
+    Requests are started at a limited rate, bounded in number and use short
+    timeouts, so a /24 network is swept within a few seconds.
+
+    Args:
+        hass: Home Assistant instance
+        network: Network in CIDR notation, e.g. 192.168.1.0/24
+
+    Returns:
+        Host per MAC address of the responding devices
+
+    Raises:
+        ValueError: If the network is invalid or too large
+
+    """
+    hosts = list(ipaddress.ip_network(network, strict=False).hosts())
+    if len(hosts) > SWEEP_MAX_HOSTS:
+        msg = f"{network} has more than {SWEEP_MAX_HOSTS} hosts"
+        raise ValueError(msg)
+
+    session = async_get_clientsession(hass)
+    semaphore = asyncio.Semaphore(SWEEP_MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=SWEEP_TIMEOUT)
+    found: dict[str, str] = {}
+
+    async def _async_get(host: str, endpoint: str) -> Any:
+        # A plain request, most addresses do not answer at all
+        try:
+            async with session.get(
+                f"http://{host}{endpoint}", timeout=timeout
+            ) as response:
+                if response.status >= HTTP_STATUS_BAD_REQUEST:
+                    return None
+                return json.loads(await response.content.read(MAX_RESPONSE_SIZE))
+        except (TimeoutError, aiohttp.ClientError, ValueError):
+            return None
+
+    async def _async_probe(index: int, host: str) -> None:
+        # Spread the connection attempts instead of bursting all at once
+        await asyncio.sleep(index / SWEEP_RATE)
+        async with semaphore:
+            report = await _async_get(host, API_ENDPOINT_REPORT)
+            if not isinstance(report, dict) or (
+                "relay" not in report and "power" not in report
+            ):
+                return
+            # The report of most firmwares has no MAC, the device info does
+            if not (mac := report.get("mac")):
+                info = await _async_get(host, API_ENDPOINT_INFO)
+                mac = info.get("mac") if isinstance(info, dict) else None
+        # Without any MAC the host stands in, the flow probes the device again
+        found.setdefault(format_mac(str(mac)) if mac else host, host)
+
+    await asyncio.gather(
+        *(_async_probe(index, str(host)) for index, host in enumerate(hosts))
+    )
+    _LOGGER.debug("Found %s devices in %s", len(found), network)
+    return found
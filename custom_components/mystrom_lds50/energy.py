@@ -0,0 +1,148 @@
+"""Local energy integration for MyStrom devices."""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers import restore_state
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    ENERGY_MAX_SAMPLE_GAP,
+    ENERGY_SAVE_DELAY,
+    ENERGY_STORAGE_VERSION,
+)
+from .models import parse_float
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, State
+
+_LOGGER = logging.getLogger(__name__)
+
+# Watt seconds per kilowatt hour
+_WS_PER_KWH = 3_600_000
+
+
+class MyStromEnergyAccumulator:
+    """
+    Integrate power samples into consumed energy.
+
+    Consecutive samples are integrated with the trapezoidal rule on the
+    monotonic time they were received. Intervals longer than the maximum gap,
+    e.g. while the device was unreachable, are skipped rather than guessed.
+    The total is persisted, so it keeps increasing across restarts and is
+    not affected by the device resetting its own counters.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """
+        Initialize the accumulator.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry the total is stored for
+
+        """
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.energy.{entry_id}"
+        )
+        self.total = 0.0  # kWh
+        self._last_power: float | None = None
+        self._last_sample = 0.0
+
+    async def async_load(self, *, seed_entity_id: str | None = None) -> None:
+        """
+        Restore the persisted total.
+
+        Args:
+            seed_entity_id: Energy sensor whose last state starts the total if
+                none was persisted yet, so upgrading from the device counter
+                does not look like a meter reset
+
+        """
+        if (data := await self._store.async_load()) is not None:
+            self.total = float(data.get("total", 0.0))
+            return
+        if seed_entity_id is None:
+            return
+
+        last_state = await self._async_get_last_state(seed_entity_id)
+        value = parse_float(last_state.state) if last_state else None
+        if value is not None and value > 0:
+            _LOGGER.debug("Continuing energy total of %s", seed_entity_id)
+            self.total = value
+            await self.async_save()
+
+    async def _async_get_last_state(self, entity_id: str) -> State | None:
+        """
+        Return the last known state of an entity.
+
+        Args:
+            entity_id: Entity to look up
+
+        Returns:
+            Last state from the restore cache or else from the recorder
+
+        """
+        last_states = restore_state.async_get(self._hass).last_states
+        if (stored := last_states.get(entity_id)) is not None:
+            return stored.state
+        if "recorder" not in self._hass.config.components:
+            return None
+
+        # Entities that did not restore their state before the upgrade are
+        # only known to the recorder. Import here, the recorder is optional.
+        from homeassistant.components.recorder import (  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+            get_instance,
+            history,
+        )
+
+        states = await get_instance(self._hass).async_add_executor_job(
+            history.get_last_state_changes, self._hass, 1, entity_id
+        )
+        return next(iter(states.get(entity_id, ())), None)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted total, e.g. when the entry is removed."""
+        await self._store.async_remove()
+
+    async def async_save(self) -> None:
+        """Persist the total immediately, e.g. when the entry is unloaded."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"total": self.total}
+
+    def add_sample(self, power: float, timestamp: float | None = None) -> None:
+        """
+        Integrate a power sample.
+
+        Args:
+            power: Power in watts
+            timestamp: monotonic() time the sample was received, now if None
+
+        """
+        if power < 0:
+            _LOGGER.debug("Ignoring negative power sample %s W", power)
+            return
+        if timestamp is None:
+            timestamp = monotonic()
+
+        if self._last_power is not None:
+            elapsed = timestamp - self._last_sample
+            if elapsed <= 0:
+                # Same or out of order sample, nothing to integrate
+                return
+            if elapsed <= ENERGY_MAX_SAMPLE_GAP:
+                self.total += (self._last_power + power) / 2 * elapsed / _WS_PER_KWH
+                self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+            else:
+                _LOGGER.debug("Skipping %.0f s without power samples", elapsed)
+
+        self._last_power = power
+        self._last_sample = timestamp
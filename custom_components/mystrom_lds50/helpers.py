@@ -4,37 +4,171 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN
+from .const import DATA_ENTITY_INDEX, DOMAIN
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Iterable
 
     from .coordinator import MyStromDataUpdateCoordinator
 
 
-def get_coordinator_from_entity_id(
-    hass: HomeAssistant, entity_id: str
+class MyStromEntityIndex:
+    """
+    Map entity IDs to coordinators without walking the registries.
+
+    Entities register themselves when added to Home Assistant. Other entity
+    IDs, e.g. the ones referenced indirectly through areas, are resolved via
+    the entity and device registries once and cached until a registry
+    changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        self._entities: dict[str, MyStromDataUpdateCoordinator] = {}
+        # Registry lookups, including entity IDs of other integrations
+        self._cache: dict[str, MyStromDataUpdateCoordinator | None] = {}
+        self._unsub_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_register(
+        self, entity_id: str, coordinator: MyStromDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """
+        Register the coordinator of an entity.
+
+        Args:
+            entity_id: Entity ID
+            coordinator: Coordinator of the entity
+
+        Returns:
+            Callback that unregisters the entity
+
+        """
+        self._entities[entity_id] = coordinator
+        self._cache.pop(entity_id, None)
+        if not self._unsub_listeners:
+            self._unsub_listeners = [
+                self.hass.bus.async_listen(
+                    er.EVENT_ENTITY_REGISTRY_UPDATED,
+                    self._async_entity_registry_updated,
+                ),
+                self.hass.bus.async_listen(
+                    dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                    self._async_device_registry_updated,
+                ),
+            ]
+
+        @callback
+        def _async_unregister() -> None:
+            """Unregister the entity and stop listening when empty."""
+            if self._entities.get(entity_id) is coordinator:
+                del self._entities[entity_id]
+            if not self._entities:
+                self._async_stop()
+
+        return _async_unregister
+
+    @callback
+    def async_remove_coordinator(
+        self, coordinator: MyStromDataUpdateCoordinator
+    ) -> None:
+        """
+        Drop all entity IDs pointing to an unloaded coordinator.
+
+        Args:
+            coordinator: Coordinator of the unloaded config entry
+
+        """
+        for index in (self._entities, self._cache):
+            for entity_id in [e for e, c in index.items() if c is coordinator]:
+                del index[entity_id]
+        if not self._entities:
+            self._async_stop()
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop listening to registry changes and drop the cache."""
+        for unsub in self._unsub_listeners:
+            unsub()
+        self._unsub_listeners = []
+        self._cache.clear()
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        """Forget cached lookups of a changed entity."""
+        self._cache.pop(event.data["entity_id"], None)
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._cache.pop(old_entity_id, None)
+
+    @callback
+    def _async_device_registry_updated(self, _event: Event) -> None:
+        """Forget all cached lookups, entities may have changed devices."""
+        self._cache.clear()
+
+    @callback
+    def async_resolve(
+        self, entity_ids: Iterable[str]
+    ) -> dict[str, MyStromDataUpdateCoordinator | None]:
+        """
+        Resolve many entity IDs to their coordinators in one pass.
+
+        Args:
+            entity_ids: Entity IDs to resolve
+
+        Returns:
+            Coordinator per entity ID, None if not a MyStrom entity
+
+        """
+        resolved: dict[str, MyStromDataUpdateCoordinator | None] = {}
+        entity_registry: er.EntityRegistry | None = None
+        device_registry: dr.DeviceRegistry | None = None
+        for entity_id in entity_ids:
+            if (coordinator := self._entities.get(entity_id)) is None:
+                if entity_id in self._cache:
+                    coordinator = self._cache[entity_id]
+                else:
+                    entity_registry = entity_registry or er.async_get(self.hass)
+                    device_registry = device_registry or dr.async_get(self.hass)
+                    coordinator = _lookup_registries(
+                        self.hass, entity_registry, device_registry, entity_id
+                    )
+                    # Without listeners the cache could not be invalidated
+                    if self._unsub_listeners:
+                        self._cache[entity_id] = coordinator
+            resolved[entity_id] = coordinator
+        return resolved
+
+
+def _lookup_registries(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_id: str,
 ) -> MyStromDataUpdateCoordinator | None:
     """
-    Get coordinator from entity ID.
+    Find the coordinator of an entity through the registries.
 
     Args:
         hass: Home Assistant instance
+        entity_registry: Entity registry
+        device_registry: Device registry
         entity_id: Entity ID
 
     Returns:
         Coordinator if found, None otherwise
 
     """
-    entity_registry = er.async_get(hass)
     if (entity_entry := entity_registry.async_get(entity_id)) is None:
         return None
 
-    device_registry = dr.async_get(hass)
-    if (device_entry := device_registry.async_get(entity_entry.device_id)) is None:
+    if entity_entry.device_id is None or (
+        (device_entry := device_registry.async_get(entity_entry.device_id)) is None
+    ):
         return None
 
     if (config_entry_id := next(iter(device_entry.config_entries), None)) is None:
@@ -44,3 +178,45 @@ def get_coordinator_from_entity_id(
         config_entry_id
     )
     return coordinator
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> MyStromEntityIndex:
+    """Return the shared entity index, creating it on first use."""
+    if (index := hass.data.get(DATA_ENTITY_INDEX)) is None:
+        index = hass.data[DATA_ENTITY_INDEX] = MyStromEntityIndex(hass)
+    return index
+
+
+def get_coordinator_from_entity_id(
+    hass: HomeAssistant, entity_id: str
+) -> MyStromDataUpdateCoordinator | None:
+    """
+    Get coordinator from entity ID.
+
+    Args:
+        hass: Home Assistant instance
+        entity_id: Entity ID
+
+    Returns:
+        Coordinator if found, None otherwise
+
+    """
+    return async_get_entity_index(hass).async_resolve((entity_id,))[entity_id]
+
+
+def get_coordinators_from_entity_ids(
+    hass: HomeAssistant, entity_ids: Iterable[str]
+) -> dict[str, MyStromDataUpdateCoordinator | None]:
+    """
+    Get the coordinators of many entity IDs.
+
+    Args:
+        hass: Home Assistant instance
+        entity_ids: Entity IDs
+
+    Returns:
+        Coordinator per entity ID, None if not found
+
+    """
+    return async_get_entity_index(hass).async_resolve(entity_ids)
@@ -0,0 +1,166 @@
+"""Request instrumentation for MyStrom devices."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any
+
+from .const import LATENCY_BUCKETS
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_CONNECTION_ERROR = "connection_error"
+OUTCOME_HTTP_ERROR = "http_error"
+
+_OUTCOMES = (
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    OUTCOME_CONNECTION_ERROR,
+    OUTCOME_HTTP_ERROR,
+)
+
+
+class MyStromEndpointMetrics:
+    """
+    Latency histogram and outcome counters of a single endpoint.
+
+    Latencies are counted in fixed buckets, so the memory used does not grow
+    with the number of requests. Percentiles are interpolated within the
+    bucket they fall into.
+    """
+
+    __slots__ = ("bytes_received", "histogram", "outcomes")
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        # One bucket per upper bound plus one for slower requests
+        self.histogram = array("L", [0]) * (len(LATENCY_BUCKETS) + 1)
+        self.outcomes = array("L", [0]) * len(_OUTCOMES)
+        self.bytes_received = 0
+
+    @property
+    def requests(self) -> int:
+        """Return the number of recorded requests."""
+        return sum(self.outcomes)
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests."""
+        return self.requests - self.outcomes[0]
+
+    def record(self, latency: float, outcome: str) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            latency: Request duration in seconds
+            outcome: One of the OUTCOME_* constants
+
+        """
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.outcomes[_OUTCOMES.index(outcome)] += 1
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        Return a latency percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if nothing was recorded
+
+        """
+        if not (total := sum(self.histogram)):
+            return None
+
+        rank = total * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            if count and seen + count >= rank:
+                if index == len(LATENCY_BUCKETS):
+                    # Slower than the largest bucket, no upper bound known
+                    return LATENCY_BUCKETS[-1]
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return LATENCY_BUCKETS[-1]  # pragma: no cover
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            **dict(zip(_OUTCOMES, self.outcomes, strict=True)),
+            "bytes_received": self.bytes_received,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+        }
+
+
+class MyStromRequestMetrics:
+    """Request metrics of a device, kept per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, MyStromEndpointMetrics] = {}
+
+    def _endpoint(self, endpoint: str) -> MyStromEndpointMetrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = MyStromEndpointMetrics()
+        return metrics
+
+    def record(self, endpoint: str, latency: float, outcome: str) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            endpoint: API endpoint path
+            latency: Request duration in seconds
+            outcome: One of the OUTCOME_* constants
+
+        """
+        self._endpoint(endpoint).record(latency, outcome)
+
+    def record_bytes(self, endpoint: str, size: int) -> None:
+        """
+        Count received response bytes.
+
+        Args:
+            endpoint: API endpoint path
+            size: Size of the response body
+
+        """
+        self._endpoint(endpoint).bytes_received += size
+
+    def percentile(self, endpoint: str, percentile: float) -> float | None:
+        """
+        Return a latency percentile of an endpoint.
+
+        Args:
+            endpoint: API endpoint path
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if nothing was recorded
+
+        """
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            return None
+        return metrics.percentile(percentile)
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the share of failed requests over all endpoints."""
+        if not (requests := sum(m.requests for m in self.endpoints.values())):
+            return None
+        return sum(m.errors for m in self.endpoints.values()) / requests
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of all endpoints for diagnostics."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()
+        }
@@ -0,0 +1,50 @@
+"""Data models for MyStrom devices."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def parse_float(value: Any) -> float | None:
+    """
+    Convert a reported value to a finite float.
+
+    Args:
+        value: Value as received from the device
+
+    Returns:
+        Float value, or None if missing or not a finite number
+
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MyStromSnapshot:
+    """
+    Immutable state of a device parsed once per received report.
+
+    Entities read the validated fields directly instead of converting the
+    raw report on every state write. Changes such as optimistic relay
+    states create a new snapshot with dataclasses.replace().
+    """
+
+    power: float | None
+    relay: bool | None
+    energy: float
+    received: float
+    is_on: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Derive the switch state from the received values."""
+        # Devices without a relay state are on while they draw power
+        is_on = self.relay if self.relay is not None else (self.power or 0.0) > 0
+        object.__setattr__(self, "is_on", is_on)
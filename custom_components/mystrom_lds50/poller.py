@@ -0,0 +1,162 @@
+"""Shared fleet poller for MyStrom devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from functools import partial
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DATA_FLEET_POLLER,
+    DEFAULT_FLEET_MAX_CONCURRENCY,
+    DEFAULT_FLEET_TICK_INTERVAL,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .coordinator import MyStromDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MyStromFleetPoller:
+    """
+    Poll many MyStrom devices from a single scheduler tick.
+
+    Coordinators registered with the poller do not run their own timer.
+    On every tick the poller starts a refresh of every coordinator whose
+    poll interval has elapsed, limiting the number of concurrent requests.
+    Each refresh runs on its own, so a slow device only delays its own next
+    poll instead of the whole fleet.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        tick_interval: timedelta = timedelta(seconds=DEFAULT_FLEET_TICK_INTERVAL),
+        max_concurrency: int = DEFAULT_FLEET_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize the fleet poller."""
+        self.hass = hass
+        self._tick_interval = tick_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Coordinator -> monotonic time of its last poll
+        self._last_poll: dict[MyStromDataUpdateCoordinator, float] = {}
+        # Coordinator -> refresh still in flight
+        self._in_flight: dict[MyStromDataUpdateCoordinator, asyncio.Task[None]] = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    @property
+    def coordinators(self) -> list[MyStromDataUpdateCoordinator]:
+        """Return the registered coordinators."""
+        return list(self._last_poll)
+
+    @callback
+    def async_register(
+        self, coordinator: MyStromDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """
+        Register a coordinator with the poller.
+
+        Args:
+            coordinator: Coordinator to poll
+
+        Returns:
+            Callback that unregisters the coordinator
+
+        """
+        self._last_poll[coordinator] = monotonic()
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass,
+                self._async_tick,
+                self._tick_interval,
+                name="MyStrom fleet poller",
+                cancel_on_shutdown=True,
+            )
+
+        @callback
+        def _async_unregister() -> None:
+            """Unregister the coordinator and stop ticking when idle."""
+            self._last_poll.pop(coordinator, None)
+            if (task := self._in_flight.pop(coordinator, None)) is not None:
+                task.cancel()
+            if not self._last_poll and self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return _async_unregister
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Handle a scheduler tick."""
+        self.async_start_due()
+
+    @callback
+    def async_start_due(self) -> list[asyncio.Task[None]]:
+        """
+        Start a refresh of every registered coordinator whose poll is due.
+
+        Coordinators whose previous refresh is still running are skipped.
+
+        Returns:
+            Refresh tasks started
+
+        """
+        now = monotonic()
+        tasks: list[asyncio.Task[None]] = []
+        for coordinator, last_poll in list(self._last_poll.items()):
+            # The interval is read on every tick so coordinators may change it
+            if (
+                now - last_poll < coordinator.poll_interval.total_seconds()
+                or coordinator.entry.pref_disable_polling
+            ):
+                continue
+            if coordinator in self._in_flight:
+                _LOGGER.debug(
+                    "Previous poll of %s still running, skipping", coordinator.name
+                )
+                continue
+            self._last_poll[coordinator] = now
+            task = self.hass.async_create_background_task(
+                self._async_poll(coordinator),
+                f"MyStrom fleet poll {coordinator.name}",
+            )
+            self._in_flight[coordinator] = task
+            task.add_done_callback(partial(self._async_poll_done, coordinator))
+            tasks.append(task)
+        return tasks
+
+    @callback
+    def _async_poll_done(
+        self, coordinator: MyStromDataUpdateCoordinator, task: asyncio.Task[None]
+    ) -> None:
+        """Forget a finished refresh."""
+        if self._in_flight.get(coordinator) is task:
+            del self._in_flight[coordinator]
+
+    async def async_poll_due(self) -> None:
+        """Refresh every coordinator whose poll is due and wait for them."""
+        if tasks := self.async_start_due():
+            await asyncio.gather(*tasks)
+
+    async def _async_poll(self, coordinator: MyStromDataUpdateCoordinator) -> None:
+        """Refresh a single coordinator within the concurrency limit."""
+        async with self._semaphore:
+            await coordinator.async_refresh()
+
+
+@callback
+def async_get_fleet_poller(hass: HomeAssistant) -> MyStromFleetPoller:
+    """Return the shared fleet poller, creating it on first use."""
+    if (poller := hass.data.get(DATA_FLEET_POLLER)) is None:
+        poller = hass.data[DATA_FLEET_POLLER] = MyStromFleetPoller(hass)
+    return poller
@@ -0,0 +1,167 @@
+"""Rolling power history for MyStrom devices."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from time import monotonic
+
+from .const import POWER_HISTORY_MIN_SPACING
+
+STAT_MIN = "min"
+STAT_MAX = "max"
+STAT_MEAN = "mean"
+STAT_STDDEV = "stddev"
+
+
+class _WindowStatistics:
+    """Statistics over the samples received within a time window."""
+
+    __slots__ = ("count", "maxima", "minima", "square_sum", "sum", "tail", "window")
+
+    def __init__(self, window: float) -> None:
+        """Initialize empty statistics for a window in seconds."""
+        self.window = window
+        # Sequence number of the oldest sample within the window
+        self.tail = 0
+        self.count = 0
+        self.sum = 0.0
+        self.square_sum = 0.0
+        # Monotonic queues of (sequence number, value) for min and max
+        self.minima: deque[tuple[int, float]] = deque()
+        self.maxima: deque[tuple[int, float]] = deque()
+
+    def add(self, sequence: int, value: float) -> None:
+        """Add the newest sample."""
+        self.count += 1
+        self.sum += value
+        self.square_sum += value * value
+        while self.minima and self.minima[-1][1] >= value:
+            self.minima.pop()
+        self.minima.append((sequence, value))
+        while self.maxima and self.maxima[-1][1] <= value:
+            self.maxima.pop()
+        self.maxima.append((sequence, value))
+
+    def evict(self, value: float) -> None:
+        """Remove the oldest sample."""
+        self.count -= 1
+        self.sum -= value
+        self.square_sum -= value * value
+        if self.minima[0][0] == self.tail:
+            self.minima.popleft()
+        if self.maxima[0][0] == self.tail:
+            self.maxima.popleft()
+        self.tail += 1
+        if not self.count:
+            # Drop the floating point error accumulated by the subtractions
+            self.sum = self.square_sum = 0.0
+
+
+class MyStromPowerHistory:
+    """
+    Fixed-capacity ring buffer of power samples with windowed statistics.
+
+    Samples are stored in two preallocated arrays. Sum, sum of squares and
+    monotonic min/max queues are maintained per window as samples enter and
+    leave it, so adding a sample costs amortized constant time regardless of
+    the window length. The capacity is sized for the longest window at the
+    minimum sample spacing; samples arriving faster are dropped, so the
+    buffer never runs out before the window does.
+    """
+
+    def __init__(
+        self,
+        windows: tuple[float, ...],
+        *,
+        min_spacing: float = POWER_HISTORY_MIN_SPACING,
+        capacity: int | None = None,
+    ) -> None:
+        """
+        Initialize the history.
+
+        Args:
+            windows: Window lengths in seconds statistics are kept for
+            min_spacing: Minimum seconds between two kept samples
+            capacity: Maximum number of samples kept, by default enough for
+                the longest window at the minimum spacing
+
+        """
+        self.min_spacing = min_spacing
+        self.capacity = capacity or math.ceil(max(windows) / min_spacing) + 1
+        self._times = array("d", [0.0]) * self.capacity
+        self._values = array("d", [0.0]) * self.capacity
+        # Sequence number of the next sample
+        self._head = 0
+        self._windows = {window: _WindowStatistics(window) for window in windows}
+
+    def __len__(self) -> int:
+        """Return the number of samples kept."""
+        return min(self._head, self.capacity)
+
+    def add_sample(self, power: float, timestamp: float | None = None) -> None:
+        """
+        Add a power sample.
+
+        Args:
+            power: Power in watts
+            timestamp: monotonic() time the sample was received, now if None
+
+        """
+        if timestamp is None:
+            timestamp = monotonic()
+        if (
+            self._head
+            and timestamp - self._times[(self._head - 1) % self.capacity]
+            < self.min_spacing
+        ):
+            # Faster than the buffer is sized for, e.g. pushed readings
+            return
+        # Evict before the oldest sample is overwritten by this one
+        self._expire(timestamp, self._head + 1 - self.capacity)
+        index = self._head % self.capacity
+        self._times[index] = timestamp
+        self._values[index] = power
+        for statistics in self._windows.values():
+            statistics.add(self._head, power)
+        self._head += 1
+
+    def _expire(self, now: float, oldest: int = 0) -> None:
+        """Evict samples that left their window or are older than oldest."""
+        for statistics in self._windows.values():
+            while statistics.count and (
+                statistics.tail < oldest
+                or self._times[statistics.tail % self.capacity]
+                <= now - statistics.window
+            ):
+                statistics.evict(self._values[statistics.tail % self.capacity])
+
+    def statistic(
+        self, window: float, statistic: str, now: float | None = None
+    ) -> float | None:
+        """
+        Return a statistic over a window.
+
+        Args:
+            window: Window length in seconds, one of those passed on creation
+            statistic: One of the STAT_* constants
+            now: monotonic() time the window ends at, now if None
+
+        Returns:
+            Statistic value, or None without samples in the window
+
+        """
+        self._expire(monotonic() if now is None else now)
+        statistics = self._windows[window]
+        if not statistics.count:
+            return None
+        if statistic == STAT_MIN:
+            return statistics.minima[0][1]
+        if statistic == STAT_MAX:
+            return statistics.maxima[0][1]
+        mean = statistics.sum / statistics.count
+        if statistic == STAT_MEAN:
+            return mean
+        variance = statistics.square_sum / statistics.count - mean * mean
+        return math.sqrt(max(variance, 0.0))
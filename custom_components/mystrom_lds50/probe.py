@@ -0,0 +1,93 @@
+"""Time-boxed probing of MyStrom devices during setup."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import MyStromAPI, MyStromConnectionError
+from .const import DATA_PROBE_CACHE, PROBE_CACHE_TTL, PROBE_DEADLINE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_probe_device(
+    hass: HomeAssistant, api: MyStromAPI
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Fetch the report and the device information concurrently.
+
+    Both requests share one deadline. The report is required, the device
+    information is optional since older firmwares do not provide it.
+    Successful probes are cached by host for a short time, so retried flows
+    and the first refresh of the created entry do not query the device again.
+
+    Args:
+        hass: Home Assistant instance
+        api: Client of the probed device
+
+    Returns:
+        Report and device information, the latter empty if unavailable
+
+    Raises:
+        MyStromConnectionError: If no report was received before the deadline
+        MyStromAPIError: If the device returned an error for the report
+
+    """
+    cache: dict[str, tuple[float, dict[str, Any], dict[str, Any]]] = (
+        hass.data.setdefault(DATA_PROBE_CACHE, {})
+    )
+    if (cached := cache.get(api.host)) is not None and cached[0] > monotonic():
+        return cached[1], cached[2]
+
+    report_task = asyncio.create_task(api.get_report())
+    info_task = asyncio.create_task(api.get_info())
+    _done, pending = await asyncio.wait(
+        (report_task, info_task), timeout=PROBE_DEADLINE
+    )
+    for task in pending:
+        task.cancel()
+
+    info: dict[str, Any] = {}
+    if info_task not in pending and info_task.exception() is None:
+        info = info_task.result()
+    else:
+        _LOGGER.debug("No device information from %s", api.host)
+
+    if report_task in pending:
+        msg = f"{api.host} did not respond within {PROBE_DEADLINE} s"
+        raise MyStromConnectionError(msg)
+    report = report_task.result()
+
+    now = monotonic()
+    for host in [host for host, cached in cache.items() if cached[0] <= now]:
+        del cache[host]
+    cache[api.host] = (now + PROBE_CACHE_TTL, report, info)
+    return report, info
+
+
+@callback
+def async_pop_probe(
+    hass: HomeAssistant, host: str
+) -> tuple[dict[str, Any], dict[str, Any]] | None:
+    """
+    Return and forget the fresh result of a recent probe, if any.
+
+    Args:
+        hass: Home Assistant instance
+        host: Device host name or IP address
+
+    Returns:
+        Report and device information if probed within the cache lifetime,
+        otherwise None
+
+    """
+    cache = hass.data.get(DATA_PROBE_CACHE, {})
+    if (cached := cache.pop(host.rstrip("/"), None)) is None:
+        return None
+    expires, report, info = cached
+    return (report, info) if expires > monotonic() else None
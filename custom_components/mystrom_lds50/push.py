@@ -0,0 +1,141 @@
+"""Push updates from MyStrom device action URLs."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, KEY_POWER, KEY_RELAY
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from aiohttp import web
+    from homeassistant.config_entries import ConfigEntry
+
+    from .coordinator import MyStromDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_TRUE_VALUES = {"1", "true", "on"}
+
+
+@callback
+def async_register_push(
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # type: ignore[type-arg]
+) -> CALLBACK_TYPE:
+    """
+    Register a webhook receiving state changes from the device.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Configuration entry
+
+    Returns:
+        Callback that unregisters the webhook
+
+    """
+    if not (webhook_id := entry.data.get(CONF_WEBHOOK_ID)):
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    async def _async_handle_webhook(
+        hass: HomeAssistant, _webhook_id: str, request: web.Request
+    ) -> None:
+        """Handle a state change call from the device."""
+        coordinator: MyStromDataUpdateCoordinator | None = hass.data.get(
+            DOMAIN, {}
+        ).get(entry.entry_id)
+        if coordinator is None:
+            return
+
+        params: dict[str, Any] = dict(request.query)
+        if request.method == "POST" and request.can_read_body:
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                params.update(body)
+
+        async_handle_push(coordinator, params)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"MyStrom {entry.title}",
+        webhook_id,
+        _async_handle_webhook,
+        local_only=True,
+        allowed_methods=("GET", "POST"),
+    )
+    _LOGGER.info(
+        "Set the action URL of %s to <home assistant url>%s to enable push updates",
+        entry.title,
+        webhook.async_generate_path(webhook_id),
+    )
+
+    @callback
+    def _async_unregister() -> None:
+        """Unregister the webhook."""
+        webhook.async_unregister(hass, webhook_id)
+
+    return _async_unregister
+
+
+@callback
+def async_handle_push(
+    coordinator: MyStromDataUpdateCoordinator, params: Mapping[str, Any]
+) -> None:
+    """
+    Apply a pushed state change to the coordinator.
+
+    Calls carrying relay or power values update the coordinator data
+    directly. Calls without usable values trigger a refresh instead.
+
+    Args:
+        coordinator: Coordinator of the calling device
+        params: Query parameters or JSON body of the call
+
+    """
+    if not (update := parse_push_data(params)) or coordinator.data is None:
+        coordinator.hass.async_create_task(coordinator.async_request_refresh())
+        return
+
+    coordinator.async_set_updated_data(
+        coordinator.async_build_snapshot(update, partial=True)
+    )
+
+
+def parse_push_data(params: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Extract report values from a pushed call.
+
+    Args:
+        params: Query parameters or JSON body of the call
+
+    Returns:
+        Report values contained in the call
+
+    """
+    data: dict[str, Any] = {}
+
+    if (relay := params.get(KEY_RELAY)) is not None:
+        data[KEY_RELAY] = (
+            relay if isinstance(relay, bool) else str(relay).lower() in _TRUE_VALUES
+        )
+
+    if (power := params.get(KEY_POWER)) is not None:
+        try:
+            data[KEY_POWER] = float(power)
+        except (ValueError, TypeError):
+            _LOGGER.debug("Ignoring invalid pushed power value %s", power)
+
+    return data
@@ -2,33 +2,63 @@
 
 from __future__ import annotations
 
+import math
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    Platform,
     UnitOfEnergy,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
 from .const import (
+    API_ENDPOINT_REPORT,
+    ATTR_CONSECUTIVE_FAILURES,
+    ATTR_ERRORS,
+    ATTR_REQUESTS,
+    ATTR_RETRY_IN,
+    ATTR_STALE,
     ATTR_WIFI_SIGNAL,
+    ATTR_WINDOW,
+    CONF_POWER_DEADBAND,
+    CONF_POWER_DEADBAND_PERCENT,
+    CONF_TEMPERATURE_DEADBAND,
     DOMAIN,
-    ENERGY_WH_TO_KWH_THRESHOLD,
+    ENERGY_DEADBAND_ABSOLUTE,
     KEY_ENERGY,
     KEY_POWER,
     KEY_TEMPERATURE,
     KEY_WS,
+    POWER_DEADBAND_ABSOLUTE,
+    POWER_DEADBAND_PERCENT,
+    SENSOR_HEARTBEAT,
+    TEMPERATURE_DEADBAND_ABSOLUTE,
+    TIER_FAST,
+    TIER_SLOW,
 )
 from .coordinator import MyStromDataUpdateCoordinator
 from .device import get_device_info
+from .helpers import async_get_entity_index
+from .power_history import STAT_MAX, STAT_MEAN, STAT_MIN, STAT_STDDEV
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -55,21 +85,81 @@ async def async_setup_entry(
     # Power sensor
     sensors.append(MyStromPowerSensor(coordinator, entry))
 
-    # Temperature sensor (if available)
-    if coordinator.data and KEY_TEMPERATURE in coordinator.data:
-        sensors.append(MyStromTemperatureSensor(coordinator, entry))
-
-    # Energy sensor (if available)
-    if coordinator.data and KEY_ENERGY in coordinator.data:
-        sensors.append(MyStromEnergySensor(coordinator, entry))
-
+    # Energy sensor, integrated locally from the power readings
+    sensors.append(MyStromEnergySensor(coordinator, entry))
+
+    # Rolling power statistics
+    sensors.extend(
+        MyStromPowerStatisticSensor(coordinator, entry, statistic)
+        for statistic in (STAT_MIN, STAT_MAX, STAT_MEAN, STAT_STDDEV)
+    )
+
+    # Connection diagnostics
+    sensors.append(MyStromCircuitBreakerSensor(coordinator, entry))
+    sensors.append(MyStromPollLatencySensor(coordinator, entry))
+    sensors.append(MyStromErrorRateSensor(coordinator, entry))
+
+    # Sensors of optional fields are added once the field was observed.
+    # Before the first update of a fast start, they are added again if they
+    # existed before.
+    unique_id_base = entry.unique_id or entry.data.get("mac") or entry.data["host"]
+    registry = er.async_get(hass)
+    added: set[str] = set()
+    checked_slow_data: dict[str, Any] | None = None
+
+    def _new_optional_sensors() -> list[SensorEntity]:
+        """Create the sensors of optional fields observed for the first time."""
+        new_keys = [
+            key
+            for key in _OPTIONAL_SENSORS
+            if key not in added
+            and (
+                key in coordinator.slow_data
+                or (
+                    coordinator.data is None
+                    and registry.async_get_entity_id(
+                        Platform.SENSOR, DOMAIN, f"{unique_id_base}_{key}"
+                    )
+                )
+            )
+        ]
+        added.update(new_keys)
+        return [_OPTIONAL_SENSORS[key](coordinator, entry) for key in new_keys]
+
+    @callback
+    def _async_add_optional_sensors() -> None:
+        """Add sensors for optional fields that appeared in a later report."""
+        nonlocal checked_slow_data
+        # Optional fields are slowly changing readings, only check new samples
+        if checked_slow_data is coordinator.slow_data:
+            return
+        checked_slow_data = coordinator.slow_data
+        if len(added) < len(_OPTIONAL_SENSORS) and (
+            new_sensors := _new_optional_sensors()
+        ):
+            async_add_entities(new_sensors)
+
+    sensors.extend(_new_optional_sensors())
     async_add_entities(sensors)
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_optional_sensors))
 
 
 class MyStromSensorBase(CoordinatorEntity[MyStromDataUpdateCoordinator], SensorEntity):
-    """Base class for MyStrom sensors."""
+    """
+    Base class for MyStrom sensors.
+
+    Sensors defining a deadband only write their state when the value moved
+    by more than the absolute or relative threshold, when availability
+    changed, or when the heartbeat interval elapsed since the last write.
+    Sensors of the slow tier only write their state when new slow readings
+    were sampled or the device became reachable or unreachable.
+    """
 
     _attr_has_entity_name = True
+    _tier = TIER_FAST
+    # None disables the deadband and writes on every update
+    _deadband_absolute: float | None = None
+    _deadband_relative: float = 0.0
 
     def __init__(
         self,
@@ -94,9 +184,143 @@ class MyStromSensorBase(CoordinatorEntity[MyStromDataUpdateCoordinator], SensorE
         unique_id_base = entry.unique_id or entry.data.get("mac") or entry.data["host"]
         self._attr_unique_id = f"{unique_id_base}_{unique_id_suffix}"
         self._attr_device_info = get_device_info(entry)
+        self._written_value: Any = None
+        self._written_available: bool | None = None
+        self._written_attributes: dict[str, Any] | None = None
+        self._written_at = 0.0
+        self._written_slow_data: dict[str, Any] | None = None
+        self._written_success: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity in the entity index when added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_get_entity_index(self.hass).async_register(
+                self.entity_id, self.coordinator
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state unless the change is within the tier or deadband."""
+        if self._tier == TIER_SLOW:
+            slow_data = self.coordinator.slow_data
+            success = self.coordinator.last_update_success
+            if (
+                slow_data is self._written_slow_data
+                and success == self._written_success
+            ):
+                return
+            self._written_slow_data = slow_data
+            self._written_success = success
+
+        if self._deadband_absolute is None:
+            super()._handle_coordinator_update()
+            return
+
+        value = self.native_value
+        available = self.available
+        # Attributes such as the WiFi signal change independently of the value
+        attributes = self.extra_state_attributes
+        now = monotonic()
+        if (
+            available == self._written_available
+            and attributes == self._written_attributes
+            and now - self._written_at < SENSOR_HEARTBEAT
+            and self._within_deadband(self._written_value, value)
+        ):
+            return
+
+        self._written_value = value
+        self._written_available = available
+        self._written_attributes = attributes
+        self._written_at = now
+        self.async_write_ha_state()
+
+    def _within_deadband(self, previous: Any, value: Any) -> bool:
+        """
+        Return True if the value change is too small to be written.
+
+        Args:
+            previous: Last written value
+            value: Current value
+
+        Returns:
+            True if the change is below the deadband
+
+        """
+        if previous is None or value is None:
+            return bool(previous == value)
+
+        delta = abs(value - previous)
+        threshold = max(
+            self._deadband_absolute or 0.0,
+            self._deadband_relative * abs(previous),
+        )
+        return bool(delta == 0 or delta < threshold)
+
+
+class MyStromRestoreSensorBase(MyStromSensorBase, RestoreSensor):
+    """
+    Base class for MyStrom sensors restoring their last known value.
+
+    Until the first update of a fast start arrived, the sensor shows its
+    value from before the start, flagged as stale.
+    """
+
+    def __init__(
+        self,
+        coordinator: MyStromDataUpdateCoordinator,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+        sensor_key: str,
+        unique_id_suffix: str,
+    ) -> None:
+        """
+        Initialize the sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            entry: Configuration entry
+            sensor_key: Key in coordinator data
+            unique_id_suffix: Suffix for unique ID
+
+        """
+        super().__init__(coordinator, entry, sensor_key, unique_id_suffix)
+        self._restored_value: Any = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known value if no data arrived yet."""
+        await super().async_added_to_hass()
+        if (
+            self.coordinator.data is None
+            and (last_data := await self.async_get_last_sensor_data()) is not None
+        ):
+            self._restored_value = last_data.native_value
+
+    @property
+    def stale(self) -> bool:
+        """
+        Return True while the state is a value from before the start.
+
+        Returns:
+            True until the first update arrived
+
+        """
+        return self.coordinator.data is None and self.native_value is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """
+        Return the state attributes.
+
+        Returns:
+            Stale flag while showing a restored value
+
+        """
+        return {ATTR_STALE: True} if self.stale else None
 
 
-class MyStromPowerSensor(MyStromSensorBase):
+class MyStromPowerSensor(MyStromRestoreSensorBase):
     """Representation of a MyStrom power sensor."""
 
     _attr_device_class = SensorDeviceClass.POWER
@@ -118,6 +342,16 @@ class MyStromPowerSensor(MyStromSensorBase):
 
         """
         super().__init__(coordinator, entry, KEY_POWER, "power")
+        self._deadband_absolute = entry.options.get(
+            CONF_POWER_DEADBAND, POWER_DEADBAND_ABSOLUTE
+        )
+        self._deadband_relative = (
+            entry.options.get(CONF_POWER_DEADBAND_PERCENT, POWER_DEADBAND_PERCENT) / 100
+        )
+        if coordinator.statistics_importer is not None:
+            # Every sample goes into the imported hourly statistics, the
+            # recorder only gets the heartbeat and availability changes
+            self._deadband_absolute = math.inf
 
     @property
     def native_value(self) -> float | None:
@@ -128,16 +362,9 @@ class MyStromPowerSensor(MyStromSensorBase):
             Current power consumption in watts
 
         """
-        if not self.coordinator.data:
-            return None
-
-        if (power := self.coordinator.data.get(KEY_POWER)) is None:
-            return None
-
-        try:
-            return float(power)
-        except (ValueError, TypeError):
-            return None
+        if self.coordinator.data is None:
+            return self._restored_value
+        return self.coordinator.data.power
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -148,25 +375,78 @@ class MyStromPowerSensor(MyStromSensorBase):
             Dictionary of state attributes
 
         """
-        if not self.coordinator.data:
-            return {}
+        if self.coordinator.data is None:
+            return {ATTR_STALE: True} if self.stale else {}
 
         attrs: dict[str, Any] = {}
 
-        # WiFi signal strength
-        if KEY_WS in self.coordinator.data:
-            attrs[ATTR_WIFI_SIGNAL] = self.coordinator.data[KEY_WS]
+        # WiFi signal strength, sampled with the slow tier
+        if KEY_WS in self.coordinator.slow_data:
+            attrs[ATTR_WIFI_SIGNAL] = self.coordinator.slow_data[KEY_WS]
 
         return attrs
 
 
-class MyStromTemperatureSensor(MyStromSensorBase):
+class MyStromPowerStatisticSensor(MyStromSensorBase):
+    """Power statistic over the rolling window of the coordinator."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_suggested_display_precision = 1
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: MyStromDataUpdateCoordinator,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+        statistic: str,
+    ) -> None:
+        """
+        Initialize the power statistic sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            entry: Configuration entry
+            statistic: One of the power history STAT_* constants
+
+        """
+        super().__init__(coordinator, entry, KEY_POWER, f"power_{statistic}")
+        self._statistic = statistic
+        self._window = coordinator.statistics_window.total_seconds()
+        self._attr_name = f"Power {statistic}"
+
+    @property
+    def native_value(self) -> float | None:
+        """
+        Return the state of the sensor.
+
+        Returns:
+            Statistic of the power readings within the window in watts
+
+        """
+        return self.coordinator.power_history.statistic(self._window, self._statistic)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """
+        Return the state attributes.
+
+        Returns:
+            Dictionary of state attributes
+
+        """
+        return {ATTR_WINDOW: int(self._window)}
+
+
+class MyStromTemperatureSensor(MyStromRestoreSensorBase):
     """Representation of a MyStrom temperature sensor."""
 
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_name = "Temperature"
+    _tier = TIER_SLOW
 
     def __init__(
         self,
@@ -182,6 +462,9 @@ class MyStromTemperatureSensor(MyStromSensorBase):
 
         """
         super().__init__(coordinator, entry, KEY_TEMPERATURE, "temperature")
+        self._deadband_absolute = entry.options.get(
+            CONF_TEMPERATURE_DEADBAND, TEMPERATURE_DEADBAND_ABSOLUTE
+        )
 
     @property
     def native_value(self) -> float | None:
@@ -192,25 +475,24 @@ class MyStromTemperatureSensor(MyStromSensorBase):
             Current temperature in Celsius
 
         """
-        if not self.coordinator.data:
-            return None
-
-        if (temp := self.coordinator.data.get(KEY_TEMPERATURE)) is None:
-            return None
+        if self.coordinator.data is None:
+            return self._restored_value
+        return self.coordinator.slow_data.get(KEY_TEMPERATURE)
 
-        try:
-            return float(temp)
-        except (ValueError, TypeError):
-            return None
 
+class MyStromEnergySensor(MyStromSensorBase, RestoreSensor):
+    """
+    Representation of a MyStrom energy sensor.
 
-class MyStromEnergySensor(MyStromSensorBase):
-    """Representation of a MyStrom energy sensor."""
+    The value comes from the stored total, the last state is only kept so
+    the total of a new or migrated entry can continue from it.
+    """
 
     _attr_device_class = SensorDeviceClass.ENERGY
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
     _attr_name = "Energy"
+    _deadband_absolute = ENERGY_DEADBAND_ABSOLUTE
 
     def __init__(
         self,
@@ -236,17 +518,174 @@ class MyStromEnergySensor(MyStromSensorBase):
             Total energy consumption in kWh
 
         """
-        if not self.coordinator.data:
-            return None
+        if self.coordinator.data is None:
+            # The stored total is known before the device responded
+            return round(self.coordinator.energy.total, 6)
+        return self.coordinator.data.energy
+
+
+class MyStromDiagnosticSensorBase(MyStromSensorBase):
+    """Base class for connection diagnostics, also shown for unreachable devices."""
 
-        if (energy := self.coordinator.data.get(KEY_ENERGY)) is None:
-            return None
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def available(self) -> bool:
+        """
+        Return True, the sensor reports on unreachable devices as well.
 
-        try:
-            # Convert from Wh to kWh if needed
-            if (energy_value := float(energy)) > ENERGY_WH_TO_KWH_THRESHOLD:
-                return energy_value / 1000.0
-        except (ValueError, TypeError):
-            return None
-        else:
-            return energy_value
+        Returns:
+            Always True
+
+        """
+        return True
+
+
+class MyStromCircuitBreakerSensor(MyStromDiagnosticSensorBase):
+    """Diagnostic sensor exposing the circuit breaker of the device."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_name = "Connection"
+
+    def __init__(
+        self,
+        coordinator: MyStromDataUpdateCoordinator,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+    ) -> None:
+        """
+        Initialize the circuit breaker sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            entry: Configuration entry
+
+        """
+        super().__init__(coordinator, entry, "circuit_breaker", "circuit_breaker")
+        self._attr_options = [STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN]
+
+    @property
+    def native_value(self) -> str:
+        """
+        Return the state of the sensor.
+
+        Returns:
+            Circuit breaker state
+
+        """
+        return self.coordinator.api.circuit_breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """
+        Return the state attributes.
+
+        Returns:
+            Dictionary of state attributes
+
+        """
+        breaker = self.coordinator.api.circuit_breaker.as_dict()
+        return {
+            ATTR_CONSECUTIVE_FAILURES: breaker["consecutive_failures"],
+            ATTR_RETRY_IN: breaker["retry_in"],
+        }
+
+
+class MyStromPollLatencySensor(MyStromDiagnosticSensorBase):
+    """Diagnostic sensor exposing the 95th percentile of poll latency."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    _attr_entity_registry_enabled_default = False
+    _attr_name = "Poll latency"
+    _tier = TIER_SLOW
+
+    def __init__(
+        self,
+        coordinator: MyStromDataUpdateCoordinator,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+    ) -> None:
+        """
+        Initialize the poll latency sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            entry: Configuration entry
+
+        """
+        super().__init__(coordinator, entry, "poll_latency", "poll_latency")
+
+    @property
+    def native_value(self) -> float | None:
+        """
+        Return the state of the sensor.
+
+        Returns:
+            95th percentile of the report request latency in milliseconds
+
+        """
+        latency = self.coordinator.api.metrics.percentile(API_ENDPOINT_REPORT, 95)
+        return None if latency is None else round(latency * 1000, 1)
+
+
+class MyStromErrorRateSensor(MyStromDiagnosticSensorBase):
+    """Diagnostic sensor exposing the share of failed requests."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+    _attr_entity_registry_enabled_default = False
+    _attr_name = "Error rate"
+    _tier = TIER_SLOW
+
+    def __init__(
+        self,
+        coordinator: MyStromDataUpdateCoordinator,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+    ) -> None:
+        """
+        Initialize the error rate sensor.
+
+        Args:
+            coordinator: Data update coordinator
+            entry: Configuration entry
+
+        """
+        super().__init__(coordinator, entry, "error_rate", "error_rate")
+
+    @property
+    def native_value(self) -> float | None:
+        """
+        Return the state of the sensor.
+
+        Returns:
+            Percentage of failed requests since the integration was loaded
+
+        """
+        error_rate = self.coordinator.api.metrics.error_rate
+        return None if error_rate is None else round(error_rate * 100, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """
+        Return the state attributes.
+
+        Returns:
+            Dictionary of state attributes
+
+        """
+        endpoints = self.coordinator.api.metrics.endpoints.values()
+        return {
+            ATTR_REQUESTS: sum(metrics.requests for metrics in endpoints),
+            ATTR_ERRORS: sum(metrics.errors for metrics in endpoints),
+        }
+
+
+# Sensors of fields not reported by every device or firmware, by field
+_OPTIONAL_SENSORS: dict[
+    str,
+    Callable[[MyStromDataUpdateCoordinator, ConfigEntry], SensorEntity],  # type: ignore[type-arg]
+] = {
+    KEY_TEMPERATURE: MyStromTemperatureSensor,
+}
@@ -2,43 +2,151 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
 
+from .api import MyStromDeviceError
 from .const import (
     DOMAIN,
+    SERVICE_MAX_CONCURRENCY,
     SERVICE_REBOOT,
     SERVICE_SET_RELAY_STATE,
     SERVICE_TOGGLE_RELAY,
 )
-from .helpers import get_coordinator_from_entity_id
+from .helpers import get_coordinators_from_entity_ids
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant, ServiceCall
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .coordinator import MyStromDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-SERVICE_SET_RELAY_STATE_SCHEMA = vol.Schema(
+SERVICE_SET_RELAY_STATE_SCHEMA = cv.make_entity_service_schema(
     {
-        vol.Required("entity_id"): cv.entity_id,
         vol.Required("state"): cv.boolean,
     }
 )
 
-SERVICE_TOGGLE_RELAY_SCHEMA = vol.Schema(
-    {
-        vol.Required("entity_id"): cv.entity_id,
-    }
-)
+SERVICE_TOGGLE_RELAY_SCHEMA = cv.make_entity_service_schema({})
+
+SERVICE_REBOOT_SCHEMA = cv.make_entity_service_schema({})
 
-SERVICE_REBOOT_SCHEMA = vol.Schema(
-    {
-        vol.Required("entity_id"): cv.entity_id,
-    }
-)
+
+def _resolve_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> tuple[dict[MyStromDataUpdateCoordinator, str], list[str]]:
+    """
+    Resolve the entities, devices and areas of a call to coordinators.
+
+    Args:
+        hass: Home Assistant instance
+        call: Service call
+
+    Returns:
+        One entity ID per targeted coordinator, preferring the switch, and
+        the explicitly referenced entity IDs that were not found
+
+    """
+    selected = async_extract_referenced_entity_ids(hass, call)
+    targets: dict[MyStromDataUpdateCoordinator, str] = {}
+    missing: list[str] = []
+    resolved = get_coordinators_from_entity_ids(
+        hass, sorted(selected.referenced | selected.indirectly_referenced)
+    )
+    for entity_id, coordinator in resolved.items():
+        if coordinator is None:
+            if entity_id in selected.referenced:
+                missing.append(entity_id)
+            continue
+        if coordinator not in targets or entity_id.startswith("switch."):
+            targets[coordinator] = entity_id
+    return targets, missing
+
+
+async def _async_fan_out(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    action: Callable[[MyStromDataUpdateCoordinator], Awaitable[None]],
+    *,
+    refresh: bool,
+) -> ServiceResponse:
+    """
+    Run an action on every targeted device with bounded concurrency.
+
+    Args:
+        hass: Home Assistant instance
+        call: Service call
+        action: Command sent to a single device
+        refresh: True to refresh the commanded devices once all completed
+
+    Returns:
+        Result and latency per targeted entity
+
+    Raises:
+        HomeAssistantError: If no device could be commanded and the caller
+            did not ask for the per-target results
+
+    """
+    targets, missing = _resolve_targets(hass, call)
+    results: dict[str, Any] = {}
+    for entity_id in missing:
+        _LOGGER.error("Entity %s not found", entity_id)
+        results[entity_id] = {"success": False, "error": "Entity not found"}
+
+    semaphore = asyncio.Semaphore(SERVICE_MAX_CONCURRENCY)
+
+    async def _async_run(coordinator: MyStromDataUpdateCoordinator) -> bool:
+        entity_id = targets[coordinator]
+        async with semaphore:
+            start = perf_counter()
+            try:
+                await action(coordinator)
+            except MyStromDeviceError as err:
+                _LOGGER.warning(
+                    "Error calling %s on %s: %s", call.service, entity_id, err
+                )
+                results[entity_id] = {
+                    "success": False,
+                    "error": str(err),
+                    "latency_ms": round((perf_counter() - start) * 1000, 1),
+                }
+                return False
+        results[entity_id] = {
+            "success": True,
+            "latency_ms": round((perf_counter() - start) * 1000, 1),
+        }
+        return True
+
+    succeeded = await asyncio.gather(*(_async_run(c) for c in targets))
+
+    if refresh:
+        # One debounced reconciling refresh per device for the whole call
+        await asyncio.gather(
+            *(
+                coordinator.async_request_refresh()
+                for coordinator, success in zip(targets, succeeded, strict=True)
+                if success
+            )
+        )
+
+    if not any(succeeded) and not call.return_response:
+        # Nothing to report back, so surface the failure to the caller
+        errors = ", ".join(f"{e}: {r['error']}" for e, r in sorted(results.items()))
+        msg = f"{call.service} failed for {errors or 'all targets'}"
+        raise HomeAssistantError(msg)
+
+    return {"results": results}
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
@@ -46,50 +154,53 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     if hass.services.has_service(DOMAIN, SERVICE_SET_RELAY_STATE):
         return
 
-    async def handle_set_relay_state(call: ServiceCall) -> None:
+    async def handle_set_relay_state(call: ServiceCall) -> ServiceResponse:
         """Handle set_relay_state service call."""
-        coordinator = get_coordinator_from_entity_id(hass, call.data["entity_id"])
-        if not coordinator:
-            _LOGGER.error("Entity %s not found", call.data["entity_id"])
-            return
+        state: bool = call.data["state"]
+
+        async def _async_set_relay(coordinator: MyStromDataUpdateCoordinator) -> None:
+            result = await coordinator.api.set_relay(state=state)
+            coordinator.async_reset_poll_interval()
+            coordinator.async_apply_command_result(result)
 
-        await coordinator.api.set_relay(state=call.data["state"])
-        await coordinator.async_request_refresh()
+        return await _async_fan_out(hass, call, _async_set_relay, refresh=True)
 
-    async def handle_toggle_relay(call: ServiceCall) -> None:
+    async def handle_toggle_relay(call: ServiceCall) -> ServiceResponse:
         """Handle toggle_relay service call."""
-        coordinator = get_coordinator_from_entity_id(hass, call.data["entity_id"])
-        if not coordinator:
-            _LOGGER.error("Entity %s not found", call.data["entity_id"])
-            return
 
-        await coordinator.api.toggle_relay()
-        await coordinator.async_request_refresh()
+        async def _async_toggle(coordinator: MyStromDataUpdateCoordinator) -> None:
+            result = await coordinator.api.toggle_relay()
+            coordinator.async_reset_poll_interval()
+            coordinator.async_apply_command_result(result)
 
-    async def handle_reboot(call: ServiceCall) -> None:
+        return await _async_fan_out(hass, call, _async_toggle, refresh=True)
+
+    async def handle_reboot(call: ServiceCall) -> ServiceResponse:
         """Handle reboot service call."""
-        coordinator = get_coordinator_from_entity_id(hass, call.data["entity_id"])
-        if not coordinator:
-            _LOGGER.error("Entity %s not found", call.data["entity_id"])
-            return
 
-        await coordinator.api.reboot()
+        async def _async_reboot(coordinator: MyStromDataUpdateCoordinator) -> None:
+            await coordinator.api.reboot()
+
+        return await _async_fan_out(hass, call, _async_reboot, refresh=False)
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_RELAY_STATE,
         handle_set_relay_state,
         schema=SERVICE_SET_RELAY_STATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_TOGGLE_RELAY,
         handle_toggle_relay,
         schema=SERVICE_TOGGLE_RELAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_REBOOT,
         handle_reboot,
         schema=SERVICE_REBOOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
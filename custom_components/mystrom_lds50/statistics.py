@@ -0,0 +1,270 @@
+"""Batched long-term statistics import for MyStrom devices."""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    ENERGY_MAX_SAMPLE_GAP,
+    STATISTICS_MAX_PENDING_HOURS,
+    STATISTICS_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.config_entries import ConfigEntry
+
+    from .energy import MyStromEnergyAccumulator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MyStromStatisticsImporter:
+    """
+    Aggregate power samples in memory and import them as hourly statistics.
+
+    Samples of the current hour only update a time-weighted sum, minimum
+    and maximum; every reading is held until the next one, up to the
+    maximum gap also used for the energy total. When the first sample of a
+    new hour arrives the finished hour is queued and all queued hours are
+    imported with a single call to the recorder per statistic. Hours queued
+    while the recorder is not running are imported with the next batch, up
+    to a limit so a disabled recorder does not grow the queue forever.
+    The open hour and the queue are stored when the entry is unloaded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,  # type: ignore[type-arg]
+        energy: MyStromEnergyAccumulator,
+    ) -> None:
+        """
+        Initialize the importer.
+
+        Args:
+            hass: Home Assistant instance
+            entry: Configuration entry
+            energy: Accumulator providing the energy total
+
+        """
+        self.hass = hass
+        self._energy = energy
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.statistics.{entry.entry_id}"
+        )
+        unique_id_base = entry.unique_id or entry.data.get("mac") or entry.data["host"]
+        object_id = slugify(unique_id_base)
+        self.power_statistic_id = f"{DOMAIN}:{object_id}_power"
+        self.energy_statistic_id = f"{DOMAIN}:{object_id}_energy"
+        self._name = entry.title
+        self._hour: datetime | None = None
+        self._last_power: float | None = None
+        self._last_time: datetime | None = None
+        self._weighted_sum = 0.0  # Watt seconds
+        self._duration = 0.0  # Seconds
+        self._min: float | None = None
+        self._max: float | None = None
+        self.pending_power: list[dict[str, Any]] = []
+        self.pending_energy: list[dict[str, Any]] = []
+
+    @callback
+    def async_add_sample(self, power: float, now: datetime | None = None) -> None:
+        """
+        Aggregate a power sample into the current hour.
+
+        Args:
+            power: Power in watts
+            now: Time the sample was received, now if None
+
+        """
+        now = now or dt_util.utcnow()
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        if hour != self._hour:
+            if self._hour is not None:
+                # The previous reading lasted until the end of its hour
+                self._hold(self._hour + timedelta(hours=1))
+                if self._min is not None:
+                    self._queue_hour()
+                    self.async_import()
+            self._hour = hour
+            self._weighted_sum = self._duration = 0.0
+            self._min = self._max = None
+
+        self._hold(now)
+        self._last_power = power
+        self._update_range(power)
+
+    def _hold(self, until: datetime) -> None:
+        """Weight the last reading by the time until the given moment."""
+        if self._last_power is None or self._last_time is None:
+            self._last_time = until
+            return
+        elapsed = (until - self._last_time).total_seconds()
+        if elapsed <= 0:
+            return
+        if elapsed <= ENERGY_MAX_SAMPLE_GAP:
+            self._weighted_sum += self._last_power * elapsed
+            self._duration += elapsed
+            self._update_range(self._last_power)
+        self._last_time = until
+
+    def _update_range(self, power: float) -> None:
+        """Include a reading in the minimum and maximum of the hour."""
+        self._min = power if self._min is None else min(self._min, power)
+        self._max = power if self._max is None else max(self._max, power)
+
+    def _queue_hour(self) -> None:
+        """Queue the statistics of the finished hour."""
+        self.pending_power.append(
+            {
+                "start": self._hour,
+                "mean": self._weighted_sum / self._duration
+                if self._duration
+                else self._last_power,
+                "min": self._min,
+                "max": self._max,
+            }
+        )
+        self.pending_energy.append(
+            {
+                "start": self._hour,
+                "state": self._energy.total,
+                "sum": self._energy.total,
+            }
+        )
+        self._trim_pending()
+
+    def _trim_pending(self) -> None:
+        """Drop the oldest queued hours, e.g. while the recorder is disabled."""
+        if (excess := len(self.pending_power) - STATISTICS_MAX_PENDING_HOURS) > 0:
+            _LOGGER.debug("Dropping %s hours of statistics of %s", excess, self._name)
+            del self.pending_power[:excess]
+            del self.pending_energy[:excess]
+
+    async def async_load(self) -> None:
+        """Restore the open hour and the queued hours of the last run."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self._hour = _parse_time(data["hour"])
+        self._last_time = _parse_time(data["last_time"])
+        self._last_power = data["last_power"]
+        self._weighted_sum = data["weighted_sum"]
+        self._duration = data["duration"]
+        self._min = data["min"]
+        self._max = data["max"]
+        self.pending_power = [
+            {**row, "start": _parse_time(row["start"])} for row in data["power"]
+        ]
+        self.pending_energy = [
+            {**row, "start": _parse_time(row["start"])} for row in data["energy"]
+        ]
+        self._trim_pending()
+
+    async def async_flush(self) -> None:
+        """Import the finished hours and store the rest, e.g. on unload."""
+        self.async_import()
+        await self._store.async_save(
+            {
+                "hour": _format_time(self._hour),
+                "last_time": _format_time(self._last_time),
+                "last_power": self._last_power,
+                "weighted_sum": self._weighted_sum,
+                "duration": self._duration,
+                "min": self._min,
+                "max": self._max,
+                "power": [
+                    {**row, "start": _format_time(row["start"])}
+                    for row in self.pending_power
+                ],
+                "energy": [
+                    {**row, "start": _format_time(row["start"])}
+                    for row in self.pending_energy
+                ],
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored state, e.g. when the entry is removed."""
+        await self._store.async_remove()
+
+    @callback
+    def async_import(self) -> None:
+        """Import all queued hours in one batch per statistic."""
+        if not self.pending_power or "recorder" not in self.hass.config.components:
+            return
+
+        # The recorder is only loaded when this mode is used
+        from homeassistant.components.recorder.statistics import (  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+            async_add_external_statistics,
+        )
+
+        async_add_external_statistics(
+            self.hass,
+            self._metadata(
+                self.power_statistic_id, "power", UnitOfPower.WATT, has_sum=False
+            ),
+            self.pending_power,  # type: ignore[arg-type]
+        )
+        async_add_external_statistics(
+            self.hass,
+            self._metadata(
+                self.energy_statistic_id,
+                "energy",
+                UnitOfEnergy.KILO_WATT_HOUR,
+                has_sum=True,
+            ),
+            self.pending_energy,  # type: ignore[arg-type]
+        )
+        _LOGGER.debug(
+            "Imported %s hours of statistics for %s",
+            len(self.pending_power),
+            self._name,
+        )
+        self.pending_power = []
+        self.pending_energy = []
+
+    def _metadata(
+        self, statistic_id: str, name: str, unit: str, *, has_sum: bool
+    ) -> Any:
+        """Return the metadata of an imported statistic."""
+        metadata: dict[str, Any] = {
+            "has_mean": not has_sum,
+            "has_sum": has_sum,
+            "name": f"{self._name} {name}",
+            "source": DOMAIN,
+            "statistic_id": statistic_id,
+            "unit_of_measurement": unit,
+        }
+        try:
+            from homeassistant.components.recorder.models import (  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+                StatisticMeanType,
+            )
+        except ImportError:  # pragma: no cover
+            pass
+        else:  # pragma: no cover
+            # Newer recorders describe the mean by its type
+            metadata["mean_type"] = (
+                StatisticMeanType.NONE if has_sum else StatisticMeanType.ARITHMETIC
+            )
+        return metadata
+
+
+def _format_time(value: datetime | None) -> str | None:
+    """Return a time as ISO string for storage."""
+    return None if value is None else value.isoformat()
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """Return a time read from storage."""
+    return None if value is None else dt_util.parse_datetime(value)
@@ -5,19 +5,24 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTR_DEVICE_TYPE,
+    ATTR_FIRMWARE,
     ATTR_HOST,
     ATTR_MAC,
     ATTR_POWER,
+    ATTR_STALE,
     DOMAIN,
-    KEY_POWER,
-    KEY_RELAY,
+    KEY_MAC,
+    KEY_VERSION,
 )
 from .coordinator import MyStromDataUpdateCoordinator
 from .device import get_device_info
+from .helpers import async_get_entity_index
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -37,9 +42,14 @@ async def async_setup_entry(
 
 # Pylint incorrectly flags abstract methods - async_turn_on/off are implemented
 class MyStromSwitch(  # pylint: disable=abstract-method
-    CoordinatorEntity[MyStromDataUpdateCoordinator], SwitchEntity
+    CoordinatorEntity[MyStromDataUpdateCoordinator], SwitchEntity, RestoreEntity
 ):
-    """Representation of a MyStrom switch."""
+    """
+    Representation of a MyStrom switch.
+
+    Until the first update of a fast start arrived, the switch shows its
+    state from before the start, flagged as stale.
+    """
 
     _attr_has_entity_name = True
     _attr_name = None
@@ -55,45 +65,78 @@ class MyStromSwitch(  # pylint: disable=abstract-method
         unique_id_base = entry.unique_id or entry.data.get("mac") or entry.data["host"]
         self._attr_unique_id = unique_id_base
         self._attr_device_info = get_device_info(entry)
+        self._attrs: dict[str, Any] | None = None
+        self._attrs_static_info: dict[str, Any] | None = None
+        self._attrs_power: float | None = None
+        self._restored_is_on: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity and restore its state if no data arrived yet."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_get_entity_index(self.hass).async_register(
+                self.entity_id, self.coordinator
+            )
+        )
+        if (
+            self.coordinator.data is None
+            and (last_state := await self.async_get_last_state()) is not None
+            and last_state.state in (STATE_ON, STATE_OFF)
+        ):
+            self._restored_is_on = last_state.state == STATE_ON
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        if not self.coordinator.data:
-            return False
-        if (relay := self.coordinator.data.get(KEY_RELAY)) is not None:
-            return bool(relay)
-        return bool(self.coordinator.data.get(KEY_POWER, 0) > 0)
+        if self.coordinator.data is None:
+            return self._restored_is_on
+        return self.coordinator.data.is_on
 
     async def async_turn_on(self, **_kwargs: Any) -> None:
         """Turn the switch on."""
-        await self.coordinator.api.turn_on()
+        result = await self.coordinator.api.turn_on()
+        self.coordinator.async_reset_poll_interval()
+        self.coordinator.async_apply_command_result(result)
         await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **_kwargs: Any) -> None:
         """Turn the switch off."""
-        await self.coordinator.api.turn_off()
+        result = await self.coordinator.api.turn_off()
+        self.coordinator.async_reset_poll_interval()
+        self.coordinator.async_apply_command_result(result)
         await self.coordinator.async_request_refresh()
 
     async def async_toggle(self, **_kwargs: Any) -> None:
         """Toggle the switch."""
-        await self.coordinator.api.toggle_relay()
+        result = await self.coordinator.api.toggle_relay()
+        self.coordinator.async_reset_poll_interval()
+        self.coordinator.async_apply_command_result(result)
         await self.coordinator.async_request_refresh()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        attrs: dict[str, Any] = {
-            ATTR_HOST: self._entry.data["host"],
-            ATTR_DEVICE_TYPE: self._entry.data.get("device_type", "switch"),
-        }
-
-        if mac := self.coordinator.data.get("mac"):
-            attrs[ATTR_MAC] = mac
-        if power := self.coordinator.data.get(KEY_POWER):
-            attrs[ATTR_POWER] = power
-
-        return attrs
+        if self.coordinator.data is None:
+            return {ATTR_STALE: True} if self._restored_is_on is not None else {}
+
+        # Rebuilt only when the static information or the power changed
+        static_info = self.coordinator.static_info
+        power = self.coordinator.data.power
+        if self._attrs is None or (
+            self._attrs_static_info is not static_info or self._attrs_power != power
+        ):
+            attrs: dict[str, Any] = {
+                ATTR_HOST: self._entry.data["host"],
+                ATTR_DEVICE_TYPE: self._entry.data.get("device_type", "switch"),
+            }
+            if mac := static_info.get(KEY_MAC) or self._entry.data.get("mac"):
+                attrs[ATTR_MAC] = mac
+            if firmware := static_info.get(KEY_VERSION):
+                attrs[ATTR_FIRMWARE] = firmware
+            if power:
+                attrs[ATTR_POWER] = power
+            self._attrs = attrs
+            self._attrs_static_info = static_info
+            self._attrs_power = power
+
+        return self._attrs
@@ -0,0 +1 @@
+"""Benchmarks for MyStrom LDS50 integration."""
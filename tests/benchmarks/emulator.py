@@ -0,0 +1,118 @@
+"""In-process emulator serving a fleet of virtual MyStrom devices."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from aiohttp import web
+
+
+class MyStromFleetEmulator:
+    """
+    Serve the MyStrom REST API for many virtual devices from one server.
+
+    Every virtual device is reachable below its own path prefix, so the
+    host of device ``n`` is ``127.0.0.1:<port>/device/<n>``.
+    """
+
+    def __init__(
+        self,
+        device_count: int,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        """Initialize the emulator."""
+        self.device_count = device_count
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._relay = [False] * device_count
+        self._power = [0.0] * device_count
+        self._runner: web.AppRunner | None = None
+        self._port = 0
+
+    @property
+    def hosts(self) -> list[str]:
+        """Return the hosts of all virtual devices."""
+        return [
+            f"127.0.0.1:{self._port}/device/{device}"
+            for device in range(self.device_count)
+        ]
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_get("/device/{device}/report", self._handle_report)
+        app.router.add_get("/device/{device}/relay", self._handle_relay)
+        app.router.add_get("/device/{device}/toggle", self._handle_toggle)
+        app.router.add_get("/device/{device}/on", self._handle_on)
+        app.router.add_get("/device/{device}/off", self._handle_off)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _device(self, request: web.Request) -> int:
+        """Simulate device latency and return the addressed device."""
+        self.requests += 1
+        if delay := self.latency + random.uniform(0, self.jitter):  # noqa: S311
+            await asyncio.sleep(delay)
+        device = int(request.match_info["device"])
+        if not 0 <= device < self.device_count:
+            raise web.HTTPNotFound
+        return device
+
+    def _set_relay(self, device: int, *, state: bool) -> None:
+        """Switch the relay of a virtual device."""
+        self._relay[device] = state
+        self._power[device] = random.uniform(5, 2000) if state else 0.0  # noqa: S311
+
+    async def _handle_report(self, request: web.Request) -> web.Response:
+        """Return the status report of a device."""
+        device = await self._device(request)
+        if self._relay[device]:
+            self._power[device] += random.uniform(-1, 1)  # noqa: S311
+        return web.json_response(
+            {
+                "power": round(self._power[device], 2),
+                "Ws": round(self._power[device], 2),
+                "relay": self._relay[device],
+                "temperature": 22.5 + device % 10 / 10,
+                "boot_id": f"{device:08X}",
+                "energy_since_boot": 0.0,
+                "time_since_boot": 3600,
+            }
+        )
+
+    async def _handle_relay(self, request: web.Request) -> web.Response:
+        """Set the relay state of a device."""
+        device = await self._device(request)
+        self._set_relay(device, state=request.query.get("state") == "1")
+        return web.Response()
+
+    async def _handle_toggle(self, request: web.Request) -> web.Response:
+        """Toggle the relay of a device."""
+        device = await self._device(request)
+        self._set_relay(device, state=not self._relay[device])
+        return web.json_response({"relay": self._relay[device]})
+
+    async def _handle_on(self, request: web.Request) -> web.Response:
+        """Turn a device on."""
+        device = await self._device(request)
+        self._set_relay(device, state=True)
+        return web.Response()
+
+    async def _handle_off(self, request: web.Request) -> web.Response:
+        """Turn a device off."""
+        device = await self._device(request)
+        self._set_relay(device, state=False)
+        return web.Response()
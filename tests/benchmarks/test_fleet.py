@@ -0,0 +1,134 @@
+"""
+Benchmarks polling a large emulated fleet of MyStrom devices.
+
+Run with ``pytest tests/benchmarks --run-benchmarks -s``. The fleet size and
+the simulated device latency are read from the ``MYSTROM_BENCHMARK_DEVICES``,
+``MYSTROM_BENCHMARK_LATENCY_MS`` and ``MYSTROM_BENCHMARK_ROUNDS`` environment
+variables.
+"""
+
+import asyncio
+import os
+import statistics
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import timedelta
+from time import perf_counter
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50.const import (
+    CONF_DEDICATED_CONNECTION,
+    CONF_FLEET_POLLING,
+    DOMAIN,
+)
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.poller import MyStromFleetPoller
+
+from .emulator import MyStromFleetEmulator
+
+DEVICES = int(os.environ.get("MYSTROM_BENCHMARK_DEVICES", "250"))
+LATENCY = float(os.environ.get("MYSTROM_BENCHMARK_LATENCY_MS", "20")) / 1000
+ROUNDS = int(os.environ.get("MYSTROM_BENCHMARK_ROUNDS", "5"))
+LOOP_LAG_INTERVAL = 0.01
+
+
+@pytest.fixture
+async def emulator(socket_enabled: None) -> AsyncIterator[MyStromFleetEmulator]:
+    """Start an emulated fleet of devices."""
+    fleet = MyStromFleetEmulator(DEVICES, latency=LATENCY, jitter=LATENCY / 2)
+    await fleet.start()
+    yield fleet
+    await fleet.stop()
+
+
+def _timed(
+    func: Callable[[], Awaitable[Any]], latencies: list[float]
+) -> Callable[[], Awaitable[Any]]:
+    """Wrap a coroutine function to record its latency."""
+
+    async def _wrapper() -> Any:
+        start = perf_counter()
+        try:
+            return await func()
+        finally:
+            latencies.append(perf_counter() - start)
+
+    return _wrapper
+
+
+async def _monitor_loop_lag(lags: list[float]) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lags.append(loop.time() - start - LOOP_LAG_INTERVAL)
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    """Return a percentile of the values in milliseconds."""
+    return statistics.quantiles(values, n=100)[percentile - 1] * 1000
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "options",
+    [{}, {CONF_DEDICATED_CONNECTION: True}],
+    ids=["shared_session", "dedicated_connection"],
+)
+async def test_fleet_polling(
+    hass: HomeAssistant,
+    emulator: MyStromFleetEmulator,
+    options: dict[str, Any],
+) -> None:
+    """Poll the emulated fleet through the fleet poller and report metrics."""
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    coordinators = []
+    latencies: list[float] = []
+    for host in emulator.hosts:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"host": host},
+            options={**options, CONF_FLEET_POLLING: True},
+        )
+        coordinator = MyStromDataUpdateCoordinator(hass, entry)
+        coordinator.poll_interval = timedelta(0)
+        coordinator.api.get_report = _timed(coordinator.api.get_report, latencies)
+        coordinators.append(coordinator)
+    memory_per_device = (tracemalloc.get_traced_memory()[0] - memory_before) / DEVICES
+    tracemalloc.stop()
+
+    poller = MyStromFleetPoller(hass)
+    unsubs = [poller.async_register(coordinator) for coordinator in coordinators]
+    lags: list[float] = []
+    monitor = asyncio.create_task(_monitor_loop_lag(lags))
+
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        await poller.async_poll_due()
+    elapsed = perf_counter() - start
+
+    monitor.cancel()
+    for unsub in unsubs:
+        unsub()
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+        await coordinator.api.close()
+
+    failed = sum(not coordinator.last_update_success for coordinator in coordinators)
+    print(  # noqa: T201
+        f"\n{DEVICES} devices x {ROUNDS} rounds, {LATENCY * 1000:.0f} ms latency"
+        f"\n  polls/s:          {DEVICES * ROUNDS / elapsed:10.1f}"
+        f"\n  p50 latency:      {_percentile(latencies, 50):10.1f} ms"
+        f"\n  p99 latency:      {_percentile(latencies, 99):10.1f} ms"
+        f"\n  max loop lag:     {max(lags, default=0) * 1000:10.1f} ms"
+        f"\n  memory/device:    {memory_per_device / 1024:10.1f} KiB"
+        f"\n  failed devices:   {failed:10d}"
+    )
+    assert failed == 0
+    assert emulator.requests >= DEVICES * ROUNDS
@@ -8,6 +8,28 @@ from aiohttp import ClientSession
 from custom_components.mystrom_lds50.api import MyStromAPI
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add command line options."""
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the fleet benchmarks",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless requested."""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --run-benchmarks to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture
 def mock_api():
     """Create a mock MyStrom API."""
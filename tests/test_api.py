@@ -1,13 +1,22 @@
 """Tests for MyStrom API client."""
 
-from unittest.mock import AsyncMock
+import asyncio
+from collections import deque
+from io import BytesIO
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, call
 
+import aiohttp
 import pytest
+from yarl import URL
 
 from custom_components.mystrom_lds50.api import (
     MyStromAPI,
     MyStromAPIError,
+    MyStromConnectionError,
 )
+from custom_components.mystrom_lds50.const import HEDGE_MIN_SAMPLES, MAX_RESPONSE_SIZE
+from custom_components.mystrom_lds50.metrics import OUTCOME_SUCCESS, OUTCOME_TIMEOUT
 
 
 @pytest.mark.asyncio
@@ -19,25 +28,33 @@ async def test_api_init() -> None:
     assert api._base_url == "http://192.168.1.100"
 
 
+def _mock_session(status: int = 200, body: bytes = b"") -> MagicMock:
+    """Create a mock session answering every request with the given body."""
+
+    def _request(*_args: Any, **_kwargs: Any) -> MagicMock:
+        buffer = BytesIO(body)
+        response = MagicMock()
+        response.status = status
+        response.content_length = len(body)
+        response.content.read = AsyncMock(side_effect=buffer.read)
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+
+    mock_session = MagicMock()
+    mock_session.request = MagicMock(side_effect=_request)
+    return mock_session
+
+
 @pytest.mark.asyncio
 async def test_get_report_success() -> None:
     """Test successful device report retrieval."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(
-        return_value={
-            "power": 12.5,
-            "relay": 1,
-            "temperature": 23.5,
-            "mac": "AA:BB:CC:DD:EE:FF",
-        }
+    mock_session = _mock_session(
+        body=b'{"power": 12.5, "relay": 1, "temperature": 23.5,'
+        b' "mac": "AA:BB:CC:DD:EE:FF"}'
     )
 
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
-
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
     data = await api.get_report()
@@ -45,37 +62,27 @@ async def test_get_report_success() -> None:
     assert data["power"] == 12.5
     assert data["relay"] == 1
     assert data["temperature"] == 23.5
+    assert api.decode_stats["count"] == 1
+    assert api.metrics.endpoints["/report"].requests == 1
+    assert api.metrics.endpoints["/report"].bytes_received > 0
 
 
 @pytest.mark.asyncio
 async def test_set_relay() -> None:
     """Test setting relay state."""
-    mock_response = AsyncMock()
-    mock_response.status = 204
-    mock_response.content_length = 0
-
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
+    mock_session = _mock_session(status=204)
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
-    await api.set_relay(True)
-    await api.set_relay(False)
+    await api.set_relay(state=True)
+    await api.set_relay(state=False)
+    assert mock_session.request.call_count == 2
 
 
 @pytest.mark.asyncio
 async def test_toggle_relay() -> None:
     """Test toggling relay."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value={"relay": 1})
-
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
+    mock_session = _mock_session(body=b'{"relay": 1}')
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
@@ -85,55 +92,241 @@ async def test_toggle_relay() -> None:
 
 @pytest.mark.asyncio
 async def test_turn_on_off() -> None:
-    """Test turning device on and off."""
-    mock_response = AsyncMock()
-    mock_response.status = 204
-    mock_response.content_length = 0
-
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
+    """Test turning device on and off without decoding the response."""
+    mock_session = _mock_session(body=b'{"relay": true}')
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
-    await api.turn_on()
-    await api.turn_off()
+    assert await api.turn_on() == {"relay": True}
+    assert await api.turn_off() == {"relay": False}
+    assert api.decode_stats["count"] == 0
 
 
 @pytest.mark.asyncio
 async def test_reboot() -> None:
     """Test rebooting device."""
-    mock_response = AsyncMock()
-    mock_response.status = 204
-    mock_response.content_length = 0
+    mock_session = _mock_session(status=204)
 
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    await api.reboot()
+    mock_session.request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_static_info_cached() -> None:
+    """Test device information is cached until a reboot."""
+    mock_session = _mock_session(status=200, body=b'{"mac": "64002D0A0B0C"}')
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
+    info = await api.get_static_info()
+    assert info == {"mac": "64002D0A0B0C"}
+    assert await api.get_static_info() is info
+    assert mock_session.request.call_count == 1
+
     await api.reboot()
+    await api.get_static_info()
+    assert mock_session.request.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_static_info_unsupported() -> None:
+    """Test devices without the info endpoint are not asked on every poll."""
+    mock_session = _mock_session(status=404, body=b"Not Found")
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    assert await api.get_static_info() == {}
+    assert await api.get_static_info() == {}
+    assert mock_session.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_static_info_kept_on_error() -> None:
+    """Test a failed information request keeps the previous information."""
+    mock_session = _mock_session(status=503, body=b"Busy")
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+    api.set_static_info({"mac": "64002D0A0B0C"})
+    api.invalidate_static_info()
+
+    assert await api.get_static_info() == {"mac": "64002D0A0B0C"}
+    assert await api.get_static_info() == {"mac": "64002D0A0B0C"}
+    assert mock_session.request.call_count == 1
+
+    api._static_info_expires = 0.0
+    mock_session.request.side_effect = _mock_session(
+        body=b'{"mac": "64002D0A0B0C", "version": "3.82.60"}'
+    ).request.side_effect
+    assert (await api.get_static_info())["version"] == "3.82.60"
 
 
 @pytest.mark.asyncio
 async def test_api_error_handling() -> None:
     """Test API error handling."""
-    mock_response = AsyncMock()
-    mock_response.status = 404
-    mock_response.text = AsyncMock(return_value="Not Found")
+    mock_session = _mock_session(status=404, body=b"Not Found")
 
-    mock_session = AsyncMock()
-    mock_session.request = AsyncMock(return_value=mock_response)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_session.__aexit__ = AsyncMock(return_value=None)
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    with pytest.raises(MyStromAPIError, match="Not Found"):
+        await api.get_report()
+
+    assert api.metrics.as_dict()["/report"]["http_error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_plain_text_response() -> None:
+    """Test plain text bodies are returned without a second read."""
+    mock_session = _mock_session(body=b"ok")
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    assert await api.toggle_relay() == {"response": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_response_size_limit() -> None:
+    """Test oversized bodies are rejected."""
+    mock_session = _mock_session(body=b" " * (MAX_RESPONSE_SIZE + 1))
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    with pytest.raises(MyStromAPIError, match="exceeds"):
+        await api.get_report()
+
+
+@pytest.mark.asyncio
+async def test_oversized_error_response() -> None:
+    """Test an oversized error page still reports the HTTP status."""
+    mock_session = _mock_session(status=500, body=b" " * (MAX_RESPONSE_SIZE + 1))
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    with pytest.raises(MyStromAPIError, match="HTTP 500"):
+        await api.get_report()
+
+
+@pytest.mark.asyncio
+async def test_retry_read_on_disconnect() -> None:
+    """Test a read on a closed keep-alive connection is retried once."""
+    mock_session = _mock_session(body=b'{"power": 1.0}')
+    answer = mock_session.request.side_effect
+    mock_session.request.side_effect = [aiohttp.ServerDisconnectedError(), answer()]
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
 
-    with pytest.raises(MyStromAPIError):
+    assert await api.get_report() == {"power": 1.0}
+    assert mock_session.request.call_count == 2
+    assert api.metrics.as_dict()["/report"][OUTCOME_SUCCESS] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_retry_write_on_disconnect() -> None:
+    """Test relay writes are not repeated when the connection was closed."""
+    mock_session = _mock_session()
+    mock_session.request.side_effect = aiohttp.ServerDisconnectedError()
+
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    with pytest.raises(MyStromConnectionError):
+        await api.set_relay(state=True)
+    with pytest.raises(MyStromConnectionError):
+        await api.turn_off()
+
+    assert mock_session.request.call_count == 2
+    assert api.metrics.as_dict()["/relay"]["connection_error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_split_timeouts() -> None:
+    """Test connect and read timeouts are bounded by the total timeout."""
+    mock_session = _mock_session(body=b'{"power": 1.0}')
+
+    api = MyStromAPI(
+        "192.168.1.100",
+        session=mock_session,
+        timeout=8,
+        connect_timeout=2,
+        read_timeout=20,
+    )
+    await api.get_report()
+
+    timeout = mock_session.request.call_args.kwargs["timeout"]
+    assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (8, 2, 8)
+
+
+@pytest.mark.asyncio
+async def test_hedged_request() -> None:
+    """Test a slow status request is answered by a second attempt."""
+    mock_session = _mock_session(body=b'{"power": 1.0}')
+    answer = mock_session.request.side_effect
+    stalled = asyncio.Event()
+    slow = MagicMock()
+    slow.__aenter__ = AsyncMock(side_effect=stalled.wait)
+    slow.__aexit__ = AsyncMock(return_value=None)
+    mock_session.request.side_effect = [slow, answer()]
+
+    api = MyStromAPI("192.168.1.100", session=mock_session, hedge=True)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        api.first_attempts.record("/report", 0.01, OUTCOME_SUCCESS)
+
+    assert await api.get_report() == {"power": 1.0}
+    assert mock_session.request.call_count == 2
+    assert api.hedge_stats == {"enabled": True, "requests": 1, "won": 1}
+    # The overtaken first attempt counts with the time it took at least
+    first_attempts = api.first_attempts.endpoints["/report"]
+    assert first_attempts.requests == HEDGE_MIN_SAMPLES + 1
+    assert first_attempts.histogram[0] == HEDGE_MIN_SAMPLES
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_history() -> None:
+    """Test no second attempt is sent before the latency is known."""
+    mock_session = _mock_session(body=b'{"power": 1.0}')
+
+    api = MyStromAPI("192.168.1.100", session=mock_session, hedge=True)
+
+    assert await api.get_report() == {"power": 1.0}
+    mock_session.request.assert_called_once()
+    assert api.hedged_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_from_successful_first_attempts() -> None:
+    """Test failed and timed out requests do not raise the hedge delay."""
+    mock_session = _mock_session(body=b'{"power": 1.0}')
+
+    api = MyStromAPI("192.168.1.100", session=mock_session, hedge=True)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        api.metrics.record("/report", 10.0, OUTCOME_TIMEOUT)
+    assert api._hedge_delay("/report") is None
+
+    for _ in range(HEDGE_MIN_SAMPLES):
         await api.get_report()
+    await asyncio.sleep(0)
+    assert api.first_attempts.endpoints["/report"].requests == HEDGE_MIN_SAMPLES
+    assert api._hedge_delay("/report") < 1.0
+
+
+@pytest.mark.asyncio
+async def test_request_traces() -> None:
+    """Test requests are traced into the bounded trace buffer."""
+    traces: deque[tuple[Any, ...]] = deque(maxlen=10)
+    mock_session = _mock_session(body=b'{"power": 1.0, "relay": true}')
+    mock_session.request.side_effect = [
+        mock_session.request.side_effect(),
+        TimeoutError(),
+    ]
+
+    api = MyStromAPI("192.168.1.100", session=mock_session, traces=traces)
+    await api.get_report()
+    with pytest.raises(MyStromConnectionError):
+        await api.get_report()
+
+    (_, endpoint, _, status, size, keys), timeout = traces
+    assert (endpoint, status, size, keys) == ("/report", 200, 29, ("power", "relay"))
+    assert timeout[3] == "timeout"
 
 
 @pytest.mark.asyncio
@@ -143,3 +336,130 @@ async def test_reuse_session() -> None:
 
     api = MyStromAPI("192.168.1.100", session=mock_session)
     assert api._session is mock_session
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_endpoint_urls() -> None:
+    """Test endpoint URLs are built once per client."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+    assert api._urls["/report"] == URL("http://192.168.1.100/report")
+    assert api._urls["/relay"] == URL("http://192.168.1.100/relay")
+
+
+@pytest.mark.asyncio
+async def test_dedicated_session() -> None:
+    """Test a dedicated keep-alive session is created and closed."""
+    api = MyStromAPI("192.168.1.100")
+    assert api._session.connector.limit_per_host == 1
+    assert api.connection_stats == {"created": 0, "reused": 0}
+
+    await api._on_connection_create(api._session, None, None)
+    await api._on_connection_reuse(api._session, None, None)
+    await api._on_connection_reuse(api._session, None, None)
+    assert api.connection_stats == {"created": 1, "reused": 2}
+
+    await api.close()
+    assert api._session.closed
+
+
+@pytest.mark.asyncio
+async def test_shared_session_not_closed() -> None:
+    """Test a shared session is left open on close."""
+    mock_session = AsyncMock()
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+
+    await api.close()
+
+    mock_session.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_relay_commands_coalesced() -> None:
+    """Test superseded relay commands are merged into one request."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+    api._request = AsyncMock(return_value=None)
+
+    await asyncio.gather(api.turn_on(), api.turn_off(), api.turn_on())
+
+    api._request.assert_awaited_once_with("GET", "/on", parse=False)
+
+
+@pytest.mark.asyncio
+async def test_toggles_cancel_out() -> None:
+    """Test consecutive toggles cancel out without a request."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+    api._request = AsyncMock(return_value={"relay": True})
+
+    results = await asyncio.gather(api.toggle_relay(), api.toggle_relay())
+    assert results == [None, None]
+    api._request.assert_not_awaited()
+
+    assert await api.toggle_relay() == {"relay": True}
+    api._request.assert_awaited_once_with("GET", "/toggle")
+
+
+@pytest.mark.asyncio
+async def test_relay_commands_serialized() -> None:
+    """Test commands queued behind an in-flight command are merged."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+    release = asyncio.Event()
+
+    async def _request(*_args: Any, **_kwargs: Any) -> None:
+        await release.wait()
+
+    api._request = AsyncMock(side_effect=_request)
+
+    first = asyncio.create_task(api.set_relay(state=True))
+    await asyncio.sleep(0)
+    queued = asyncio.gather(
+        api.set_relay(state=False), api.toggle_relay(), api.toggle_relay()
+    )
+    await asyncio.sleep(0)
+    release.set()
+    assert await first == {"relay": True}
+    # Every queued caller gets the state of the merged command
+    assert await queued == [{"relay": False}] * 3
+
+    assert api._request.await_args_list == [
+        call("GET", "/relay", params={"state": 1}, parse=False),
+        call("GET", "/relay", params={"state": 0}, parse=False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merged_command_result() -> None:
+    """Test a caller superseded by a queued toggle gets the merged state."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+    api._request = AsyncMock(return_value=None)
+
+    results = await asyncio.gather(api.turn_off(), api.toggle_relay())
+
+    api._request.assert_awaited_once_with(
+        "GET", "/relay", params={"state": 1}, parse=False
+    )
+    assert results == [{"relay": True}, {"relay": True}]
+
+
+@pytest.mark.asyncio
+async def test_close_aborts_relay_commands() -> None:
+    """Test unloading while a command is in flight releases every caller."""
+    api = MyStromAPI("192.168.1.100", session=AsyncMock())
+
+    async def _request(*_args: Any, **_kwargs: Any) -> None:
+        await asyncio.Event().wait()
+
+    api._request = AsyncMock(side_effect=_request)
+
+    first = asyncio.create_task(api.set_relay(state=True))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(api.turn_off())
+    await asyncio.sleep(0)
+    assert api._pending_command is not None
+
+    await api.close()
+
+    for task in (first, queued):
+        with pytest.raises(MyStromConnectionError, match="closed"):
+            await task
+    assert api._pending_command is None
+    assert not api._command_tasks
@@ -0,0 +1,74 @@
+"""Tests for MyStrom circuit breaker."""
+
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from custom_components.mystrom_lds50.api import (
+    MyStromAPI,
+    MyStromCircuitOpenError,
+    MyStromConnectionError,
+)
+from custom_components.mystrom_lds50.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    MyStromCircuitBreaker,
+)
+
+MONOTONIC = "custom_components.mystrom_lds50.circuit_breaker.monotonic"
+
+
+def test_breaker_opens_after_threshold() -> None:
+    """Test the breaker opens after consecutive failures."""
+    breaker = MyStromCircuitBreaker(failure_threshold=2, base_backoff=10)
+    with patch(MONOTONIC, return_value=100.0):
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow_request()
+
+
+def test_breaker_half_open_backoff() -> None:
+    """Test half-open probes back off exponentially."""
+    breaker = MyStromCircuitBreaker(failure_threshold=1, base_backoff=10)
+    with patch(MONOTONIC, return_value=0.0):
+        breaker.record_failure()
+
+    with patch(MONOTONIC, return_value=10.0):
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
+        # Only a single probe at a time
+        assert not breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.retry_in == 20.0
+
+    with patch(MONOTONIC, return_value=30.0):
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        assert breaker.as_dict() == {
+            "state": STATE_CLOSED,
+            "consecutive_failures": 0,
+            "retry_in": 0.0,
+        }
+
+
+@pytest.mark.asyncio
+async def test_api_fails_fast_when_open() -> None:
+    """Test the API rejects requests without network access while open."""
+    mock_session = MagicMock()
+    mock_session.request = MagicMock(side_effect=aiohttp.ClientError("down"))
+    api = MyStromAPI("192.168.1.100", session=mock_session)
+    api.circuit_breaker = MyStromCircuitBreaker(failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(MyStromConnectionError):
+            await api.get_report()
+    assert mock_session.request.call_count == 2
+
+    with pytest.raises(MyStromCircuitOpenError):
+        await api.get_report()
+    assert mock_session.request.call_count == 2
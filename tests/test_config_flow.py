@@ -5,8 +5,10 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from homeassistant import data_entry_flow
 from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mystrom_lds50.config_flow import ConfigFlow
+from custom_components.mystrom_lds50.const import DOMAIN
 
 
 @pytest.fixture
@@ -20,6 +22,7 @@ def mock_api_success():
             "mac": "AA:BB:CC:DD:EE:FF",
             "type": "Switch",
         }
+        mock_instance.get_info.return_value = {}
         mock_instance.close = AsyncMock()
         mock_api.return_value = mock_instance
         yield mock_instance
@@ -41,6 +44,7 @@ async def test_flow_user_success(hass: HomeAssistant, mock_api_success) -> None:
     """Test successful user flow."""
     flow = ConfigFlow()
     flow.hass = hass
+    flow.context = {"source": "user"}
     flow._async_abort_entries_match = AsyncMock()
 
     result = await flow.async_step_user(
@@ -56,6 +60,25 @@ async def test_flow_user_success(hass: HomeAssistant, mock_api_success) -> None:
     assert result["data"]["host"] == "192.168.1.100"
 
 
+@pytest.mark.asyncio
+async def test_flow_user_mac_normalized(hass: HomeAssistant, mock_api_success) -> None:
+    """Test MACs from the report or user input match the discovered format."""
+    mock_api_success.get_report.return_value["mac"] = "AABBCCDDEEFF"
+    MockConfigEntry(domain=DOMAIN, unique_id="AA:BB:CC:DD:EE:FF").add_to_hass(hass)
+
+    for user_input in (
+        {"host": "192.168.1.100"},
+        {"host": "192.168.1.100", "mac": "aa-bb-cc-dd-ee-ff"},
+    ):
+        flow = ConfigFlow()
+        flow.hass = hass
+        flow.handler = DOMAIN
+        flow.context = {"source": "user"}
+
+        with pytest.raises(data_entry_flow.AbortFlow, match="already_configured"):
+            await flow.async_step_user(user_input=user_input)
+
+
 @pytest.mark.asyncio
 async def test_flow_user_connection_error(
     hass: HomeAssistant, mock_api_connection_error
@@ -87,3 +110,117 @@ async def test_flow_user_no_input(hass: HomeAssistant) -> None:
 
     assert result["type"] == data_entry_flow.FlowResultType.FORM
     assert "data_schema" in result
+
+
+@pytest.mark.asyncio
+async def test_flow_user_network_sweep(hass: HomeAssistant) -> None:
+    """Test entering a network offers the found devices as discovered flows."""
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.context = {"source": "user"}
+
+    with (
+        patch(
+            "custom_components.mystrom_lds50.config_flow.async_sweep_network",
+            return_value={"AA:BB:CC:DD:EE:FF": "192.168.1.100"},
+        ),
+        patch(
+            "custom_components.mystrom_lds50.config_flow.async_start_discovery_flow"
+        ) as mock_start_flow,
+    ):
+        result = await flow.async_step_user(user_input={"host": "192.168.1.0/24"})
+
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "devices_discovered"
+    mock_start_flow.assert_called_once_with(
+        hass, "192.168.1.100", "AA:BB:CC:DD:EE:FF", "switch"
+    )
+
+
+@pytest.mark.asyncio
+async def test_flow_integration_discovery(
+    hass: HomeAssistant, mock_api_success
+) -> None:
+    """Test a discovered device is added after confirmation."""
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.context = {"source": "integration_discovery"}
+
+    result = await flow.async_step_integration_discovery(
+        {"host": "192.168.1.100", "mac": "AA:BB:CC:DD:EE:FF", "device_type": "zero"}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "discovery_confirm"
+
+    result = await flow.async_step_discovery_confirm(user_input={})
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"]["mac"] == "AA:BB:CC:DD:EE:FF"
+    assert result["data"]["device_type"] == "switch"
+
+
+@pytest.mark.asyncio
+async def test_user_entry_rediscovered(hass: HomeAssistant, mock_api_success) -> None:
+    """Test a device added by hand is recognized when it is discovered."""
+    mock_api_success.get_report.return_value["mac"] = "AABBCCDDEEFF"
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.context = {"source": "user"}
+
+    result = await flow.async_step_user(user_input={"host": "192.168.1.100"})
+    entry = MockConfigEntry(
+        domain=DOMAIN, unique_id=flow.unique_id, data=result["data"]
+    )
+    entry.add_to_hass(hass)
+
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.context = {"source": "integration_discovery"}
+
+    with pytest.raises(data_entry_flow.AbortFlow, match="already_configured"):
+        await flow.async_step_integration_discovery(
+            {"host": "192.168.1.101", "mac": "AA:BB:CC:DD:EE:FF", "device_type": "zero"}
+        )
+    assert entry.data["host"] == "192.168.1.101"
+
+
+@pytest.mark.asyncio
+async def test_host_entry_rediscovered(hass: HomeAssistant) -> None:
+    """Test a device configured by host is not offered again when discovered."""
+    MockConfigEntry(
+        domain=DOMAIN, unique_id="192.168.1.100", data={"host": "192.168.1.100"}
+    ).add_to_hass(hass)
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.context = {"source": "integration_discovery"}
+
+    with pytest.raises(data_entry_flow.AbortFlow, match="already_configured"):
+        await flow.async_step_integration_discovery(
+            {"host": "192.168.1.100", "mac": "AA:BB:CC:DD:EE:FF", "device_type": "zero"}
+        )
+
+
+@pytest.mark.asyncio
+async def test_swept_device_without_mac(hass: HomeAssistant, mock_api_success) -> None:
+    """Test a device swept without MAC is identified by the probed MAC."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="AA:BB:CC:DD:EE:FF",
+        data={"host": "192.168.1.100", "mac": "AA:BB:CC:DD:EE:FF"},
+    )
+    entry.add_to_hass(hass)
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.context = {"source": "integration_discovery"}
+
+    result = await flow.async_step_integration_discovery(
+        {"host": "192.168.1.50", "mac": "192.168.1.50", "device_type": "switch"}
+    )
+    assert result["step_id"] == "discovery_confirm"
+
+    with pytest.raises(data_entry_flow.AbortFlow, match="already_configured"):
+        await flow.async_step_discovery_confirm(user_input={})
+    assert entry.data["host"] == "192.168.1.50"
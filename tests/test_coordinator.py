@@ -0,0 +1,250 @@
+"""Tests for MyStrom data update coordinator."""
+
+import asyncio
+from datetime import timedelta
+from time import monotonic
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50.const import (
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_FAST_START,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    FAST_START_STAGGER,
+    SLOW_TIER_INTERVAL,
+)
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.probe import async_probe_device
+
+
+def _config_entry(options: dict | None = None) -> MockConfigEntry:
+    """Create a mock config entry with the given options."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "192.168.1.100", "mac": "AA:BB:CC:DD:EE:FF"},
+        options=options or {},
+        unique_id="AA:BB:CC:DD:EE:FF",
+    )
+
+
+@pytest.mark.asyncio
+async def test_fixed_poll_interval(hass: HomeAssistant) -> None:
+    """Test the default poll interval is fixed."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    coordinator.api.get_report = AsyncMock(return_value={"power": 1.0, "relay": 1})
+
+    coordinator.api.get_info = AsyncMock(return_value={})
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_poll_interval(hass: HomeAssistant) -> None:
+    """Test adaptive polling backs off while flat and snaps back on change."""
+    entry = _config_entry({CONF_ADAPTIVE_POLLING: True})
+    coordinator = MyStromDataUpdateCoordinator(hass, entry)
+    fast = timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+    assert coordinator.update_interval == fast
+
+    coordinator.api.get_report = AsyncMock(return_value={"power": 0.0, "relay": 0})
+
+    coordinator.api.get_info = AsyncMock(return_value={})
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == fast
+
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == fast * 2
+
+    for _ in range(10):
+        await coordinator.async_refresh()
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_MAX_INTERVAL)
+
+    coordinator.api.get_report.return_value = {"power": 40.0, "relay": 1}
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == fast
+    assert coordinator.update_interval == fast
+
+
+@pytest.mark.asyncio
+async def test_reset_poll_interval(hass: HomeAssistant) -> None:
+    """Test commands snap adaptive polling back to the fast interval."""
+    entry = _config_entry({CONF_ADAPTIVE_POLLING: True})
+    coordinator = MyStromDataUpdateCoordinator(hass, entry)
+    coordinator.poll_interval = timedelta(seconds=ADAPTIVE_MAX_INTERVAL)
+
+    coordinator.async_reset_poll_interval()
+
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+
+
+@pytest.mark.asyncio
+async def test_apply_command_results(hass: HomeAssistant) -> None:
+    """Test command results update the data without polling the device."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_report = AsyncMock(return_value={"power": 5.0, "relay": True})
+    coordinator.api.get_info = AsyncMock(return_value={})
+    await coordinator.async_refresh()
+    coordinator.api.get_report.reset_mock()
+
+    coordinator.async_apply_relay_state(state=False)
+    assert coordinator.data.power == 5.0
+    assert coordinator.data.relay is False
+
+    coordinator.async_apply_command_result({"relay": True})
+    assert coordinator.data.relay is True
+
+    coordinator.async_apply_command_result(None)
+    assert coordinator.data.relay is True
+
+    await coordinator.async_request_refresh()
+    coordinator.api.get_report.assert_not_awaited()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_first_refresh_reuses_probe(
+    hass: HomeAssistant, mock_report_data
+) -> None:
+    """Test the first refresh uses the report fetched by the config flow."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_report = AsyncMock(return_value={"power": 1.0})
+    coordinator.api.get_info = AsyncMock(return_value={})
+    probe_api = AsyncMock()
+    probe_api.host = "192.168.1.100"
+    probe_api.get_report.return_value = mock_report_data
+    probe_api.get_info.return_value = {}
+    await async_probe_device(hass, probe_api)
+
+    await coordinator.async_refresh()
+    assert coordinator.data.power == mock_report_data["power"]
+    assert coordinator.data.relay is True
+    assert coordinator.static_info["mac"] == mock_report_data["mac"]
+    coordinator.api.get_report.assert_not_awaited()
+
+    await coordinator.async_refresh()
+    assert coordinator.data.power == 1.0
+    assert coordinator.data.relay is None
+
+
+@pytest.mark.asyncio
+async def test_first_refresh_after_probe_info_timeout(
+    hass: HomeAssistant, mock_report_data
+) -> None:
+    """Test missing device info of a probe is fetched by the first refresh."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_info = AsyncMock(return_value={"version": "3.82.60"})
+    probe_api = AsyncMock()
+    probe_api.host = "192.168.1.100"
+    probe_api.get_report.return_value = mock_report_data
+    probe_api.get_info.side_effect = asyncio.Event().wait
+    with patch("custom_components.mystrom_lds50.probe.PROBE_DEADLINE", 0.01):
+        await async_probe_device(hass, probe_api)
+
+    await coordinator.async_refresh()
+    coordinator.api.get_info.assert_awaited_once()
+    assert coordinator.static_info["version"] == "3.82.60"
+
+
+@pytest.mark.asyncio
+async def test_static_info_cached(hass: HomeAssistant) -> None:
+    """Test static device information is fetched once and kept out of the data."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_report = AsyncMock(
+        return_value={"power": 1.0, "relay": 1, "version": "3.82.60"}
+    )
+    coordinator.api.get_info = AsyncMock(return_value={"mac": "64002D0A0B0C"})
+
+    await coordinator.async_refresh()
+    static_info = coordinator.static_info
+    assert static_info == {"mac": "64002D0A0B0C", "version": "3.82.60"}
+    assert (coordinator.data.power, coordinator.data.relay) == (1.0, True)
+
+    await coordinator.async_refresh()
+    assert coordinator.static_info is static_info
+    coordinator.api.get_info.assert_awaited_once()
+
+    coordinator.api.invalidate_static_info()
+    await coordinator.async_refresh()
+    assert coordinator.api.get_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_tier_sampling(hass: HomeAssistant) -> None:
+    """Test slow readings are only sampled every slow tier interval."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_report = AsyncMock(
+        return_value={"power": 1.0, "relay": 1, "temperature": 21.0, "ws": -60}
+    )
+    coordinator.api.get_info = AsyncMock(return_value={})
+
+    await coordinator.async_refresh()
+    assert (coordinator.data.power, coordinator.data.relay) == (1.0, True)
+    slow_data = coordinator.slow_data
+    assert slow_data == {"temperature": 21.0, "ws": -60}
+
+    coordinator.api.get_report.return_value = {
+        "power": 2.0,
+        "relay": 1,
+        "temperature": 22.0,
+    }
+    await coordinator.async_refresh()
+    assert coordinator.data.power == 2.0
+    assert coordinator.slow_data is slow_data
+
+    with patch(
+        "custom_components.mystrom_lds50.coordinator.monotonic",
+        return_value=monotonic() + SLOW_TIER_INTERVAL,
+    ):
+        await coordinator.async_refresh()
+    assert coordinator.slow_data == {"temperature": 22.0}
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_build_partial_snapshot(hass: HomeAssistant) -> None:
+    """Test pushed values keep the current values of missing fields."""
+    coordinator = MyStromDataUpdateCoordinator(hass, _config_entry())
+    coordinator.api.get_report = AsyncMock(return_value={"power": "7.5", "relay": 1})
+    coordinator.api.get_info = AsyncMock(return_value={})
+    await coordinator.async_refresh()
+    assert coordinator.data.power == 7.5
+
+    snapshot = coordinator.async_build_snapshot({"relay": False}, partial=True)
+    assert (snapshot.power, snapshot.relay, snapshot.is_on) == (7.5, False, False)
+    assert snapshot.received >= coordinator.data.received
+
+    snapshot = coordinator.async_build_snapshot({"relay": False})
+    assert snapshot.power is None
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_fast_start_refreshes_in_background(hass: HomeAssistant) -> None:
+    """Test fast start runs the first refresh after a staggered delay."""
+    entry = _config_entry({CONF_FAST_START: True})
+    entry.add_to_hass(hass)
+    coordinator = MyStromDataUpdateCoordinator(hass, entry)
+    assert coordinator.fast_start
+    coordinator.api.get_report = AsyncMock(return_value={"power": 1.0, "relay": 1})
+    coordinator.api.get_info = AsyncMock(return_value={})
+
+    with patch(
+        "custom_components.mystrom_lds50.coordinator.random.uniform", return_value=0
+    ) as uniform:
+        task = coordinator.async_schedule_first_refresh()
+    uniform.assert_called_once_with(0, FAST_START_STAGGER)
+    assert coordinator.data is None
+
+    await task
+    assert coordinator.data.power == 1.0
+    coordinator.api.get_report.assert_awaited_once()
+    await coordinator.async_shutdown()
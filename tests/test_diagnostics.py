@@ -0,0 +1,71 @@
+"""Tests for MyStrom diagnostics."""
+
+from collections import deque
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50.api import MyStromAPI
+from custom_components.mystrom_lds50.const import DOMAIN
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.mystrom_lds50.models import MyStromSnapshot
+
+
+@pytest.mark.asyncio
+async def test_entry_diagnostics(hass: HomeAssistant, mock_report_data) -> None:
+    """Test diagnostics contain redacted data and formatted traces."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "192.168.1.100", "mac": "AA:BB:CC:DD:EE:FF"},
+        unique_id="AA:BB:CC:DD:EE:FF",
+    )
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    coordinator.data = MyStromSnapshot(
+        power=12.5, relay=True, energy=0.25, received=100.0
+    )
+    coordinator.slow_data = {}
+    coordinator.static_info = {
+        "mac": "AA:BB:CC:DD:EE:FF",
+        "version": "3.82.60",
+        "ip": "192.168.1.100",
+        "mask": "255.255.255.0",
+        "gw": "192.168.1.1",
+        "dns": "192.168.1.1",
+        "ssid": "Home",
+    }
+    coordinator.last_update_success = True
+    coordinator.poll_interval = timedelta(seconds=30)
+    coordinator.traces = deque(maxlen=2)
+    coordinator.api = MyStromAPI(
+        "192.168.1.100", session=MagicMock(), traces=coordinator.traces
+    )
+    for _ in range(3):
+        coordinator.api._trace("/report", 0.0, 200, 120, mock_report_data)
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"] == {"host": REDACTED, "mac": REDACTED}
+    assert diagnostics["data"]["power"] == 12.5
+    assert diagnostics["static_info"] == {
+        "mac": REDACTED,
+        "version": "3.82.60",
+        "ip": REDACTED,
+        "mask": REDACTED,
+        "gw": REDACTED,
+        "dns": REDACTED,
+        "ssid": REDACTED,
+    }
+    assert len(diagnostics["traces"]) == 2
+    trace = diagnostics["traces"][-1]
+    assert trace["endpoint"] == "/report"
+    assert trace["status"] == 200
+    assert trace["size"] == 120
+    assert "power" in trace["keys"]
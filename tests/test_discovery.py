@@ -0,0 +1,85 @@
+"""Tests for MyStrom network discovery."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+from yarl import URL
+
+from custom_components.mystrom_lds50.discovery import (
+    MyStromDiscoveryProtocol,
+    async_sweep_network,
+    format_mac,
+    parse_announcement,
+)
+
+
+def test_parse_announcement() -> None:
+    """Test announcements are parsed into MAC address and device type."""
+    payload = bytes.fromhex("64002d0a0b0c") + bytes([107, 0])
+    assert parse_announcement(payload) == ("64:00:2D:0A:0B:0C", "switch")
+    assert parse_announcement(payload[:6] + bytes([120, 0])) == (
+        "64:00:2D:0A:0B:0C",
+        "zero",
+    )
+    assert parse_announcement(b"hello") is None
+    assert format_mac("64002d0a0b0c") == "64:00:2D:0A:0B:0C"
+    assert format_mac("64-00-2d-0a-0b-0c") == "64:00:2D:0A:0B:0C"
+    assert format_mac("192.168.1.5") == "192.168.1.5"
+
+
+def test_announcements_deduplicated() -> None:
+    """Test repeated announcements only report a device once per address."""
+    on_device = MagicMock()
+    protocol = MyStromDiscoveryProtocol(on_device)
+    payload = bytes.fromhex("64002d0a0b0c") + bytes([106, 0])
+
+    protocol.datagram_received(payload, ("192.168.1.20", 7979))
+    protocol.datagram_received(payload, ("192.168.1.20", 7979))
+    protocol.datagram_received(payload, ("192.168.1.21", 7979))
+
+    assert on_device.call_count == 2
+    on_device.assert_called_with("192.168.1.21", "64:00:2D:0A:0B:0C", "switch")
+
+
+@pytest.mark.asyncio
+async def test_sweep_network(hass: HomeAssistant) -> None:
+    """Test a sweep returns the responding devices by MAC address."""
+    responses = {
+        "192.168.1.2/report": b'{"relay": true, "power": 1.0, "mac": "64002D0A0B0C"}',
+        "192.168.1.5/report": b'{"power": 0.0}',
+        "192.168.1.5/api/v1/info": b'{"mac": "64002D0A0B0D", "type": 107}',
+        "192.168.1.7/report": b'{"power": 0.0}',
+        "192.168.1.9/report": b'{"temperature": 20.0}',
+        "192.168.1.11/report": b"<html></html>",
+    }
+
+    def _get(url: str, **_kwargs: object) -> MagicMock:
+        key = f"{URL(url).host}{URL(url).path}"
+        if key not in responses:
+            raise aiohttp.ClientConnectionError
+        response = MagicMock(status=200)
+        response.content.read = AsyncMock(return_value=responses[key])
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+
+    session = MagicMock()
+    session.get = MagicMock(side_effect=_get)
+    with patch(
+        "custom_components.mystrom_lds50.discovery.async_get_clientsession",
+        return_value=session,
+    ):
+        found = await async_sweep_network(hass, "192.168.1.0/28")
+
+    # The MAC is read from the device info if the report has none
+    assert found == {
+        "64:00:2D:0A:0B:0C": "192.168.1.2",
+        "64:00:2D:0A:0B:0D": "192.168.1.5",
+        "192.168.1.7": "192.168.1.7",
+    }
+
+    with pytest.raises(ValueError, match="more than"):
+        await async_sweep_network(hass, "10.0.0.0/16")
@@ -0,0 +1,53 @@
+"""Tests for MyStrom local energy integration."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mystrom_lds50.const import ENERGY_MAX_SAMPLE_GAP
+from custom_components.mystrom_lds50.energy import MyStromEnergyAccumulator
+
+
+@pytest.mark.asyncio
+async def test_trapezoidal_integration(hass: HomeAssistant) -> None:
+    """Test power samples are integrated with the trapezoidal rule."""
+    energy = MyStromEnergyAccumulator(hass, "entry")
+
+    energy.add_sample(1000.0, 0.0)
+    energy.add_sample(2000.0, 1800.0 / 4)
+    energy.add_sample(2000.0, 1800.0 / 4)  # Duplicate timestamp
+    energy.add_sample(-5.0, 1000.0)  # Invalid sample
+    assert energy.total == pytest.approx(1500 * 450 / 3_600_000)
+
+
+@pytest.mark.asyncio
+async def test_gap_is_skipped(hass: HomeAssistant) -> None:
+    """Test intervals without samples longer than the maximum are skipped."""
+    energy = MyStromEnergyAccumulator(hass, "entry")
+
+    energy.add_sample(100.0, 0.0)
+    energy.add_sample(100.0, ENERGY_MAX_SAMPLE_GAP + 1)
+    assert energy.total == 0.0
+
+    energy.add_sample(100.0, ENERGY_MAX_SAMPLE_GAP + 37)
+    assert energy.total == pytest.approx(100 * 36 / 3_600_000)
+
+
+@pytest.mark.asyncio
+async def test_total_persisted(hass: HomeAssistant, hass_storage) -> None:
+    """Test the total is restored after a restart."""
+    hass_storage["mystrom_lds50.energy.entry"] = {
+        "version": 1,
+        "key": "mystrom_lds50.energy.entry",
+        "data": {"total": 12.5},
+    }
+    energy = MyStromEnergyAccumulator(hass, "entry")
+    await energy.async_load()
+    assert energy.total == 12.5
+
+    energy.add_sample(3600.0, 0.0)
+    energy.add_sample(3600.0, 500.0)
+    await energy.async_save()
+    assert hass_storage["mystrom_lds50.energy.entry"]["data"]["total"] == 13.0
+
+    await energy.async_remove()
+    assert "mystrom_lds50.energy.entry" not in hass_storage
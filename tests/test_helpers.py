@@ -0,0 +1,63 @@
+"""Tests for MyStrom helpers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50.const import DOMAIN
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.helpers import (
+    async_get_entity_index,
+    get_coordinator_from_entity_id,
+    get_coordinators_from_entity_ids,
+)
+
+
+@pytest.mark.asyncio
+async def test_entity_index(hass: HomeAssistant) -> None:
+    """Test registered entities are resolved without registry lookups."""
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    index = async_get_entity_index(hass)
+
+    unregister = index.async_register("switch.plug", coordinator)
+    assert get_coordinators_from_entity_ids(hass, ["switch.plug", "light.x"]) == {
+        "switch.plug": coordinator,
+        "light.x": None,
+    }
+
+    unregister()
+    assert get_coordinator_from_entity_id(hass, "switch.plug") is None
+
+
+@pytest.mark.asyncio
+async def test_entity_index_registry_lookup(hass: HomeAssistant) -> None:
+    """Test registry lookups are cached until the registries change."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.168.1.100"})
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "AABBCCDDEEFF")}
+    )
+    entity_registry = er.async_get(hass)
+    sensor = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "AABBCCDDEEFF_power", device_id=device.id
+    )
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    index = async_get_entity_index(hass)
+    index.async_register("switch.plug", coordinator)
+
+    assert get_coordinator_from_entity_id(hass, sensor.entity_id) is coordinator
+    assert sensor.entity_id in index._cache
+
+    entity_registry.async_update_entity(sensor.entity_id, new_entity_id="sensor.new")
+    await hass.async_block_till_done()
+    assert sensor.entity_id not in index._cache
+    assert get_coordinator_from_entity_id(hass, "sensor.new") is coordinator
+
+    index.async_remove_coordinator(coordinator)
+    assert not index._cache
+    assert not index._unsub_listeners
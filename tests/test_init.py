@@ -0,0 +1,48 @@
+"""Tests for MyStrom integration setup."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50 import _async_normalize_unique_id
+from custom_components.mystrom_lds50.const import DOMAIN
+
+
+@pytest.mark.asyncio
+async def test_unique_id_normalized(hass: HomeAssistant) -> None:
+    """Test unformatted MAC unique IDs are migrated to formatted MACs."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="aabbccddeeff",
+        data={"host": "192.168.1.100", "mac": "aabbccddeeff"},
+    )
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "aabbccddeeff")}
+    )
+    entity_registry = er.async_get(hass)
+    entity = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "aabbccddeeff_power", config_entry=entry
+    )
+
+    await _async_normalize_unique_id(hass, entry)
+
+    assert entry.unique_id == "AA:BB:CC:DD:EE:FF"
+    assert entry.data["mac"] == "AA:BB:CC:DD:EE:FF"
+    assert (
+        entity_registry.async_get(entity.entity_id).unique_id
+        == "AA:BB:CC:DD:EE:FF_power"
+    )
+    assert dr.async_get(hass).async_get(device.id).identifiers == {
+        (DOMAIN, "AA:BB:CC:DD:EE:FF")
+    }
+
+    # Host unique IDs are kept
+    entry = MockConfigEntry(
+        domain=DOMAIN, unique_id="192.168.1.101", data={"host": "192.168.1.101"}
+    )
+    entry.add_to_hass(hass)
+    await _async_normalize_unique_id(hass, entry)
+    assert entry.unique_id == "192.168.1.101"
@@ -0,0 +1,45 @@
+"""Tests for MyStrom request metrics."""
+
+import pytest
+
+from custom_components.mystrom_lds50.metrics import (
+    OUTCOME_HTTP_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    MyStromRequestMetrics,
+)
+
+
+def test_latency_percentiles() -> None:
+    """Test percentiles are interpolated within the histogram buckets."""
+    metrics = MyStromRequestMetrics()
+    assert metrics.percentile("/report", 95) is None
+
+    for _ in range(90):
+        metrics.record("/report", 0.02, OUTCOME_SUCCESS)
+    for _ in range(10):
+        metrics.record("/report", 0.4, OUTCOME_SUCCESS)
+
+    assert 0.01 < metrics.percentile("/report", 50) <= 0.025
+    assert 0.25 < metrics.percentile("/report", 95) <= 0.5
+
+    metrics.record("/report", 60, OUTCOME_TIMEOUT)
+    assert metrics.percentile("/report", 100) == 10.0
+
+
+def test_error_rate_and_counters() -> None:
+    """Test outcomes and received bytes are counted per endpoint."""
+    metrics = MyStromRequestMetrics()
+    assert metrics.error_rate is None
+
+    metrics.record("/report", 0.05, OUTCOME_SUCCESS)
+    metrics.record_bytes("/report", 120)
+    metrics.record("/report", 5, OUTCOME_TIMEOUT)
+    metrics.record("/toggle", 0.05, OUTCOME_SUCCESS)
+    metrics.record("/toggle", 0.05, OUTCOME_HTTP_ERROR)
+
+    assert metrics.error_rate == pytest.approx(0.5)
+    report = metrics.as_dict()["/report"]
+    assert report["success"] == 1
+    assert report["timeout"] == 1
+    assert report["bytes_received"] == 120
@@ -0,0 +1,44 @@
+"""Tests for MyStrom data models."""
+
+from dataclasses import asdict, replace
+
+import pytest
+
+from custom_components.mystrom_lds50.models import MyStromSnapshot, parse_float
+
+
+def test_parse_float() -> None:
+    """Test reported values are validated once."""
+    assert parse_float("12.5") == 12.5
+    assert parse_float(3) == 3.0
+    assert parse_float(None) is None
+    assert parse_float(value=True) is None
+    assert parse_float("n/a") is None
+    assert parse_float("nan") is None
+
+
+def test_snapshot_is_on() -> None:
+    """Test the relay state is derived from the power without a relay."""
+    assert MyStromSnapshot(power=0.0, relay=True, energy=0.0, received=0.0).is_on
+    assert not MyStromSnapshot(power=5.0, relay=False, energy=0.0, received=0.0).is_on
+    assert MyStromSnapshot(power=5.0, relay=None, energy=0.0, received=0.0).is_on
+    assert not MyStromSnapshot(power=None, relay=None, energy=0.0, received=0.0).is_on
+
+
+def test_snapshot_immutable() -> None:
+    """Test snapshots are only changed by creating a new one."""
+    snapshot = MyStromSnapshot(power=5.0, relay=True, energy=1.5, received=10.0)
+
+    with pytest.raises(AttributeError):
+        snapshot.power = 6.0  # type: ignore[misc]
+
+    changed = replace(snapshot, relay=False)
+    assert changed is not snapshot
+    assert asdict(changed) == {
+        "energy": 1.5,
+        "is_on": False,
+        "power": 5.0,
+        "received": 10.0,
+        "relay": False,
+    }
+    assert snapshot.relay is True
@@ -0,0 +1,107 @@
+"""Tests for MyStrom fleet poller."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.poller import (
+    MyStromFleetPoller,
+    async_get_fleet_poller,
+)
+
+
+def _mock_coordinator(poll_interval: int = 0) -> MagicMock:
+    """Create a mock coordinator due after the given interval."""
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    coordinator.name = "192.168.1.100"
+    coordinator.poll_interval = timedelta(seconds=poll_interval)
+    coordinator.entry = MagicMock(pref_disable_polling=False)
+    coordinator.async_refresh = AsyncMock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_poll_due_coordinators(hass: HomeAssistant) -> None:
+    """Test only coordinators whose interval elapsed are refreshed."""
+    poller = MyStromFleetPoller(hass)
+    due = _mock_coordinator()
+    not_due = _mock_coordinator(poll_interval=3600)
+    disabled = _mock_coordinator()
+    disabled.entry.pref_disable_polling = True
+
+    unsubs = [poller.async_register(c) for c in (due, not_due, disabled)]
+    await poller.async_poll_due()
+
+    due.async_refresh.assert_awaited_once()
+    not_due.async_refresh.assert_not_awaited()
+    disabled.async_refresh.assert_not_awaited()
+
+    for unsub in unsubs:
+        unsub()
+    assert poller.coordinators == []
+    assert poller._unsub_tick is None
+
+
+@pytest.mark.asyncio
+async def test_poll_concurrency_limit(hass: HomeAssistant) -> None:
+    """Test the poller caps concurrent refreshes."""
+    poller = MyStromFleetPoller(hass, max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def _refresh() -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+
+    coordinators = [_mock_coordinator() for _ in range(6)]
+    unsubs = []
+    for coordinator in coordinators:
+        coordinator.async_refresh = AsyncMock(side_effect=_refresh)
+        unsubs.append(poller.async_register(coordinator))
+
+    await poller.async_poll_due()
+
+    assert peak == 2
+    for coordinator in coordinators:
+        coordinator.async_refresh.assert_awaited_once()
+    for unsub in unsubs:
+        unsub()
+
+
+@pytest.mark.asyncio
+async def test_hanging_refresh_skips_only_its_device(hass: HomeAssistant) -> None:
+    """Test a hanging refresh does not hold back the rest of the fleet."""
+    poller = MyStromFleetPoller(hass)
+    hanging = _mock_coordinator()
+    hanging.async_refresh = AsyncMock(side_effect=asyncio.Event().wait)
+    healthy = _mock_coordinator()
+
+    unsubs = [poller.async_register(c) for c in (hanging, healthy)]
+    for _ in range(3):
+        poller._async_tick(dt_util.utcnow())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    assert hanging.async_refresh.await_count == 1
+    assert healthy.async_refresh.await_count == 3
+
+    task = poller._in_flight[hanging]
+    for unsub in unsubs:
+        unsub()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert poller._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_get_fleet_poller_shared(hass: HomeAssistant) -> None:
+    """Test the fleet poller is shared across entries."""
+    assert async_get_fleet_poller(hass) is async_get_fleet_poller(hass)
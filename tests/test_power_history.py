@@ -0,0 +1,61 @@
+"""Tests for MyStrom rolling power history."""
+
+import statistics
+
+import pytest
+
+from custom_components.mystrom_lds50.power_history import (
+    STAT_MAX,
+    STAT_MEAN,
+    STAT_MIN,
+    STAT_STDDEV,
+    MyStromPowerHistory,
+)
+
+
+def test_window_statistics() -> None:
+    """Test statistics only cover the samples within the window."""
+    history = MyStromPowerHistory((60.0,))
+    assert history.statistic(60.0, STAT_MEAN, now=0.0) is None
+
+    samples = [(0.0, 100.0), (20.0, 10.0), (40.0, 50.0), (70.0, 30.0)]
+    for timestamp, power in samples:
+        history.add_sample(power, timestamp)
+
+    window = [10.0, 50.0, 30.0]
+    assert history.statistic(60.0, STAT_MIN, now=70.0) == 10.0
+    assert history.statistic(60.0, STAT_MAX, now=70.0) == 50.0
+    assert history.statistic(60.0, STAT_MEAN, now=70.0) == pytest.approx(30.0)
+    assert history.statistic(60.0, STAT_STDDEV, now=70.0) == pytest.approx(
+        statistics.pstdev(window)
+    )
+
+    # Samples expire while no new ones arrive
+    assert history.statistic(60.0, STAT_MAX, now=100.5) == 30.0
+    assert history.statistic(60.0, STAT_MAX, now=131.0) is None
+
+
+def test_capacity_limits_window() -> None:
+    """Test overwritten samples leave every window."""
+    history = MyStromPowerHistory((3600.0, 10.0), min_spacing=1.0, capacity=3)
+    for second, power in enumerate([5.0, 1.0, 2.0, 3.0]):
+        history.add_sample(power, float(second))
+
+    assert len(history) == 3
+    assert history.statistic(3600.0, STAT_MAX, now=3.0) == 3.0
+    assert history.statistic(3600.0, STAT_MIN, now=3.0) == 1.0
+    assert history.statistic(3600.0, STAT_MEAN, now=3.0) == pytest.approx(2.0)
+
+
+def test_pushed_samples_cover_window() -> None:
+    """Test samples faster than the minimum spacing do not shorten the window."""
+    history = MyStromPowerHistory((900.0,))
+    history.add_sample(500.0, 0.0)
+    # Pushed readings every half second for the whole window
+    for tick in range(1, 1800):
+        history.add_sample(10.0, tick / 2)
+
+    assert len(history) <= history.capacity
+    assert history.statistic(900.0, STAT_MAX, now=899.5) == 500.0
+    assert history.statistic(900.0, STAT_MIN, now=899.5) == 10.0
+    assert history.statistic(900.0, STAT_MAX, now=900.0) == 10.0
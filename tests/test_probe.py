@@ -0,0 +1,64 @@
+"""Tests for MyStrom device probing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mystrom_lds50.api import (
+    MyStromAPIError,
+    MyStromConnectionError,
+)
+from custom_components.mystrom_lds50.probe import (
+    async_pop_probe,
+    async_probe_device,
+)
+
+
+def _api(report: object, info: object) -> MagicMock:
+    """Create a mock API answering the probe requests."""
+    api = MagicMock()
+    api.host = "192.168.1.100"
+    api.get_report = AsyncMock(side_effect=report)
+    api.get_info = AsyncMock(side_effect=info)
+    return api
+
+
+@pytest.mark.asyncio
+async def test_probe_cached(hass: HomeAssistant, mock_report_data) -> None:
+    """Test a probe is cached for retries and the first refresh."""
+    info = {"mac": "64002D0A0B0C", "type": 107}
+    api = _api([mock_report_data], [info])
+
+    assert await async_probe_device(hass, api) == (mock_report_data, info)
+    assert await async_probe_device(hass, api) == (mock_report_data, info)
+    api.get_report.assert_awaited_once()
+
+    assert async_pop_probe(hass, "192.168.1.100") == (mock_report_data, info)
+    assert async_pop_probe(hass, "192.168.1.100") is None
+
+
+@pytest.mark.asyncio
+async def test_probe_without_info(hass: HomeAssistant, mock_report_data) -> None:
+    """Test the device information is optional."""
+    api = _api([mock_report_data], MyStromAPIError("HTTP 404: Not Found"))
+
+    assert await async_probe_device(hass, api) == (mock_report_data, {})
+
+
+@pytest.mark.asyncio
+async def test_probe_deadline(hass: HomeAssistant) -> None:
+    """Test the probe gives up once the deadline passed."""
+
+    async def _hang() -> None:
+        await asyncio.sleep(10)
+
+    api = _api(_hang, _hang)
+
+    with (
+        patch("custom_components.mystrom_lds50.probe.PROBE_DEADLINE", 0.01),
+        pytest.raises(MyStromConnectionError, match="did not respond"),
+    ):
+        await async_probe_device(hass, api)
+    assert async_pop_probe(hass, "192.168.1.100") is None
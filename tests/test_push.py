@@ -0,0 +1,52 @@
+"""Tests for MyStrom push updates."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mystrom_lds50.const import KEY_POWER, KEY_RELAY
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.push import async_handle_push, parse_push_data
+
+
+def test_parse_push_data() -> None:
+    """Test pushed query parameters are converted to report values."""
+    assert parse_push_data({"relay": "1", "power": "12.5"}) == {
+        KEY_RELAY: True,
+        KEY_POWER: 12.5,
+    }
+    assert parse_push_data({"relay": False}) == {KEY_RELAY: False}
+    assert parse_push_data({"power": "n/a", "mac": "AABBCCDDEEFF"}) == {}
+
+
+@pytest.mark.asyncio
+async def test_push_updates_coordinator(hass: HomeAssistant, mock_report_data) -> None:
+    """Test pushed values are merged into the coordinator data."""
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    coordinator.hass = hass
+    coordinator.data = mock_report_data
+
+    async_handle_push(coordinator, {"relay": "0", "power": "0"})
+
+    coordinator.async_build_snapshot.assert_called_once_with(
+        {KEY_RELAY: False, KEY_POWER: 0.0}, partial=True
+    )
+    coordinator.async_set_updated_data.assert_called_once_with(
+        coordinator.async_build_snapshot.return_value
+    )
+
+
+@pytest.mark.asyncio
+async def test_push_without_values_refreshes(hass: HomeAssistant) -> None:
+    """Test a call without values triggers a refresh."""
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    coordinator.hass = hass
+    coordinator.data = {KEY_RELAY: True}
+    coordinator.async_request_refresh = AsyncMock()
+
+    async_handle_push(coordinator, {"action": "state"})
+    await hass.async_block_till_done()
+
+    coordinator.async_request_refresh.assert_awaited_once()
+    coordinator.async_set_updated_data.assert_not_called()
@@ -1,21 +1,50 @@
 """Tests for MyStrom sensor platform."""
 
-from unittest.mock import MagicMock
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.components.sensor import (
+    SensorExtraStoredData,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfPower
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import restore_state
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    MockEntityPlatform,
+)
 
 from custom_components.mystrom_lds50.const import (
+    ATTR_STALE,
+    ATTR_WIFI_SIGNAL,
+    CONF_POWER_DEADBAND,
+    CONF_POWER_DEADBAND_PERCENT,
     DOMAIN,
-    KEY_ENERGY,
-    KEY_POWER,
     KEY_TEMPERATURE,
+    KEY_WS,
 )
 from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.energy import MyStromEnergyAccumulator
+from custom_components.mystrom_lds50.metrics import (
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    MyStromRequestMetrics,
+)
+from custom_components.mystrom_lds50.models import MyStromSnapshot
+from custom_components.mystrom_lds50.power_history import (
+    STAT_MAX,
+    MyStromPowerHistory,
+)
 from custom_components.mystrom_lds50.sensor import (
     MyStromEnergySensor,
+    MyStromErrorRateSensor,
+    MyStromPollLatencySensor,
     MyStromPowerSensor,
+    MyStromPowerStatisticSensor,
     MyStromTemperatureSensor,
+    async_setup_entry,
 )
 
 
@@ -34,15 +63,18 @@ def mock_config_entry():
     )
 
 
+def _snapshot(power: float | None, energy: float = 0.0) -> MyStromSnapshot:
+    """Create a snapshot with the given readings."""
+    return MyStromSnapshot(power=power, relay=True, energy=energy, received=0.0)
+
+
 @pytest.fixture
 def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
-    coordinator.data = {
-        KEY_POWER: 12.5,
-        KEY_TEMPERATURE: 23.5,
-        KEY_ENERGY: 500,  # Wh
-    }
+    coordinator.data = _snapshot(12.5)
+    coordinator.slow_data = {KEY_TEMPERATURE: 23.5}
+    coordinator.statistics_importer = None
     return coordinator
 
 
@@ -56,7 +88,7 @@ async def test_power_sensor_value(mock_coordinator, mock_config_entry) -> None:
 @pytest.mark.asyncio
 async def test_power_sensor_none(mock_coordinator, mock_config_entry) -> None:
     """Test power sensor returns None when no data."""
-    mock_coordinator.data = {}
+    mock_coordinator.data = _snapshot(None)
     sensor = MyStromPowerSensor(mock_coordinator, mock_config_entry)
     assert sensor.native_value is None
 
@@ -71,22 +103,249 @@ async def test_temperature_sensor_value(mock_coordinator, mock_config_entry) ->
 @pytest.mark.asyncio
 async def test_temperature_sensor_none(mock_coordinator, mock_config_entry) -> None:
     """Test temperature sensor returns None when no data."""
-    mock_coordinator.data = {}
+    mock_coordinator.slow_data = {}
     sensor = MyStromTemperatureSensor(mock_coordinator, mock_config_entry)
     assert sensor.native_value is None
 
 
 @pytest.mark.asyncio
 async def test_energy_sensor_value(mock_coordinator, mock_config_entry) -> None:
-    """Test energy sensor returns correct value."""
+    """Test energy sensor returns the locally integrated total."""
+    mock_coordinator.data = _snapshot(12.5, energy=0.5)
     sensor = MyStromEnergySensor(mock_coordinator, mock_config_entry)
-    # Should convert from Wh to kWh
     assert sensor.native_value == 0.5
 
 
 @pytest.mark.asyncio
-async def test_energy_sensor_none(mock_coordinator, mock_config_entry) -> None:
-    """Test energy sensor returns None when no data."""
-    mock_coordinator.data = {}
+async def test_energy_sensor_before_update(mock_coordinator, mock_config_entry) -> None:
+    """Test energy sensor shows the stored total before the first update."""
+    mock_coordinator.data = None
+    mock_coordinator.energy = MagicMock()
+    mock_coordinator.energy.total = 1.25
     sensor = MyStromEnergySensor(mock_coordinator, mock_config_entry)
+    assert sensor.native_value == 1.25
+    # The stored total is exact, it is not flagged as stale
+    assert sensor.extra_state_attributes is None
+
+
+@pytest.mark.asyncio
+async def test_energy_total_seeded_from_sensor(
+    hass: HomeAssistant, hass_storage, mock_coordinator, mock_config_entry
+) -> None:
+    """Test a new total continues from the state the energy sensor kept."""
+    mock_coordinator.data = _snapshot(12.5, energy=42.75)
+    mock_coordinator.last_update_success = True
+    sensor = MyStromEnergySensor(mock_coordinator, mock_config_entry)
+    await MockEntityPlatform(hass).async_add_entities([sensor])
+    assert hass.states.get(sensor.entity_id).state == "42.75"
+
+    # Restart without a stored total
+    restore_data = restore_state.async_get(hass)
+    await restore_data.async_dump_states()
+    await restore_data.async_load()
+    energy = MyStromEnergyAccumulator(hass, "entry")
+    await energy.async_load(seed_entity_id=sensor.entity_id)
+    assert energy.total == 42.75
+    assert hass_storage["mystrom_lds50.energy.entry"]["data"]["total"] == 42.75
+
+    # A persisted total takes precedence over the sensor state
+    mock_coordinator.data = _snapshot(12.5, energy=50.0)
+    sensor.async_write_ha_state()
+    await restore_data.async_dump_states()
+    await restore_data.async_load()
+    energy = MyStromEnergyAccumulator(hass, "entry")
+    await energy.async_load(seed_entity_id=sensor.entity_id)
+    assert energy.total == 42.75
+
+
+@pytest.mark.asyncio
+async def test_power_sensor_restored(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test power sensor shows its restored value until data arrives."""
+    mock_coordinator.data = None
+    sensor = MyStromPowerSensor(mock_coordinator, mock_config_entry)
+    sensor.hass = hass
+    sensor.entity_id = "sensor.mystrom_power"
+    sensor.async_get_last_sensor_data = AsyncMock(
+        return_value=SensorExtraStoredData(8.5, UnitOfPower.WATT)
+    )
+    await sensor.async_added_to_hass()
+
+    assert sensor.native_value == 8.5
+    assert sensor.extra_state_attributes == {ATTR_STALE: True}
+
+    mock_coordinator.data = _snapshot(12.5)
+    mock_coordinator.slow_data = {}
+    assert sensor.native_value == 12.5
+    assert sensor.extra_state_attributes == {}
+
+
+@pytest.mark.asyncio
+async def test_power_sensor_deadband(mock_coordinator, mock_config_entry) -> None:
+    """Test small power changes do not write state until the heartbeat."""
+    mock_coordinator.last_update_success = True
+    sensor = MyStromPowerSensor(mock_coordinator, mock_config_entry)
+    sensor.async_write_ha_state = MagicMock()
+
+    with patch("custom_components.mystrom_lds50.sensor.monotonic", return_value=1000.0):
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 1
+
+        mock_coordinator.data = _snapshot(12.6)
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 1
+
+        mock_coordinator.data = _snapshot(20.0)
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 2
+
+        mock_coordinator.last_update_success = False
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 3
+
+        mock_coordinator.last_update_success = True
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 4
+
+    with patch("custom_components.mystrom_lds50.sensor.monotonic", return_value=5000.0):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_power_sensor_deadband_options(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test the deadband follows the options and attribute changes are written."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_POWER_DEADBAND: 0.0, CONF_POWER_DEADBAND_PERCENT: 0.0},
+    )
+    mock_coordinator.last_update_success = True
+    sensor = MyStromPowerSensor(mock_coordinator, mock_config_entry)
+    sensor.async_write_ha_state = MagicMock()
+
+    with patch("custom_components.mystrom_lds50.sensor.monotonic", return_value=1000.0):
+        sensor._handle_coordinator_update()
+        mock_coordinator.data = _snapshot(12.6)
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 2
+
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 2
+
+        mock_coordinator.slow_data = {KEY_WS: -60}
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 3
+        assert sensor.extra_state_attributes == {ATTR_WIFI_SIGNAL: -60}
+
+
+@pytest.mark.asyncio
+async def test_slow_tier_sensor_updates(mock_coordinator, mock_config_entry) -> None:
+    """Test slow tier sensors only write new samples and availability changes."""
+    mock_coordinator.last_update_success = True
+    sensor = MyStromTemperatureSensor(mock_coordinator, mock_config_entry)
+    sensor.async_write_ha_state = MagicMock()
+
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    mock_coordinator.slow_data = {KEY_TEMPERATURE: 25.0}
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+    mock_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_request_metric_sensors(mock_coordinator, mock_config_entry) -> None:
+    """Test the latency and error rate sensors read the request metrics."""
+    mock_coordinator.api = MagicMock()
+    mock_coordinator.api.metrics = MyStromRequestMetrics()
+    latency = MyStromPollLatencySensor(mock_coordinator, mock_config_entry)
+    error_rate = MyStromErrorRateSensor(mock_coordinator, mock_config_entry)
+    assert latency.native_value is None
+    assert error_rate.native_value is None
+    assert not latency.entity_registry_enabled_default
+
+    for _ in range(3):
+        mock_coordinator.api.metrics.record("/report", 0.03, OUTCOME_SUCCESS)
+    mock_coordinator.api.metrics.record("/report", 10, OUTCOME_TIMEOUT)
+
+    assert 25 < latency.native_value <= 10000
+    assert error_rate.native_value == 25.0
+    assert error_rate.extra_state_attributes == {"requests": 4, "errors": 1}
+
+    mock_coordinator.last_update_success = False
+    assert latency.available
+    assert error_rate.available
+
+
+@pytest.mark.asyncio
+async def test_power_statistic_sensor(mock_coordinator, mock_config_entry) -> None:
+    """Test the power statistic sensors read the rolling history."""
+    mock_coordinator.statistics_window = timedelta(minutes=15)
+    mock_coordinator.power_history = MyStromPowerHistory((900.0,))
+    sensor = MyStromPowerStatisticSensor(mock_coordinator, mock_config_entry, STAT_MAX)
     assert sensor.native_value is None
+
+    mock_coordinator.power_history.add_sample(12.5)
+    mock_coordinator.power_history.add_sample(8.0)
+    assert sensor.native_value == 12.5
+    assert sensor.unique_id == "AA:BB:CC:DD:EE:FF_power_max"
+    assert sensor.extra_state_attributes == {"window": 900}
+
+
+@pytest.mark.asyncio
+async def test_power_sensor_with_statistics_import(
+    mock_coordinator, mock_config_entry
+) -> None:
+    """Test the power sensor only writes its heartbeat when statistics are imported."""
+    mock_coordinator.last_update_success = True
+    mock_coordinator.statistics_importer = MagicMock()
+    sensor = MyStromPowerSensor(mock_coordinator, mock_config_entry)
+    sensor.async_write_ha_state = MagicMock()
+    # Keeps the state class so existing statistics of the entity continue
+    assert sensor.state_class == SensorStateClass.MEASUREMENT
+
+    with patch("custom_components.mystrom_lds50.sensor.monotonic", return_value=1000.0):
+        sensor._handle_coordinator_update()
+        mock_coordinator.data = _snapshot(2000.0)
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    with patch("custom_components.mystrom_lds50.sensor.monotonic", return_value=1300.0):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_optional_sensors_added_when_observed(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test sensors of fields missing at setup are added when they appear."""
+    mock_config_entry.add_to_hass(hass)
+    mock_coordinator.slow_data = {}
+    mock_coordinator.statistics_window = timedelta(minutes=15)
+    hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, mock_config_entry, async_add_entities)
+    sensors = async_add_entities.call_args.args[0]
+    assert not any(isinstance(s, MyStromTemperatureSensor) for s in sensors)
+    (listener,) = mock_coordinator.async_add_listener.call_args.args
+
+    listener()
+    assert async_add_entities.call_count == 1
+
+    mock_coordinator.slow_data = {KEY_TEMPERATURE: 21.0}
+    listener()
+    listener()
+    assert async_add_entities.call_count == 2
+    (added,) = async_add_entities.call_args.args
+    assert [type(sensor) for sensor in added] == [MyStromTemperatureSensor]
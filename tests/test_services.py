@@ -0,0 +1,92 @@
+"""Tests for MyStrom services."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.mystrom_lds50.api import MyStromConnectionError
+from custom_components.mystrom_lds50.const import (
+    DOMAIN,
+    SERVICE_SET_RELAY_STATE,
+    SERVICE_TOGGLE_RELAY,
+)
+from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.services import async_setup_services
+
+
+def _coordinator() -> MagicMock:
+    """Create a mock coordinator."""
+    coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
+    coordinator.api = MagicMock()
+    coordinator.api.set_relay = AsyncMock(return_value={"relay": False})
+    coordinator.api.toggle_relay = AsyncMock(return_value=None)
+    coordinator.async_request_refresh = AsyncMock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_set_relay_state_many_targets(hass: HomeAssistant) -> None:
+    """Test a call fans out to every target and reports per-target results."""
+    coordinators = {
+        "switch.plug_1": _coordinator(),
+        "sensor.plug_1_power": None,
+        "switch.plug_2": _coordinator(),
+    }
+    coordinators["switch.plug_2"].api.set_relay.side_effect = MyStromConnectionError(
+        "timeout"
+    )
+    # The power sensor belongs to the first plug
+    coordinators["sensor.plug_1_power"] = coordinators["switch.plug_1"]
+
+    await async_setup_services(hass)
+    with patch(
+        "custom_components.mystrom_lds50.services.get_coordinators_from_entity_ids",
+        side_effect=lambda _hass, ids: {e: coordinators.get(e) for e in ids},
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_RELAY_STATE,
+            {"entity_id": [*coordinators, "switch.unknown"], "state": False},
+            blocking=True,
+            return_response=True,
+        )
+
+    results = response["results"]
+    assert set(results) == {"switch.plug_1", "switch.plug_2", "switch.unknown"}
+    assert results["switch.plug_1"]["success"]
+    assert results["switch.plug_2"] == {
+        "success": False,
+        "error": "timeout",
+        "latency_ms": results["switch.plug_2"]["latency_ms"],
+    }
+    assert not results["switch.unknown"]["success"]
+
+    plug_1 = coordinators["switch.plug_1"]
+    plug_1.api.set_relay.assert_awaited_once_with(state=False)
+    plug_1.async_apply_command_result.assert_called_once_with({"relay": False})
+    plug_1.async_request_refresh.assert_awaited_once()
+    coordinators["switch.plug_2"].async_request_refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_toggle_relay_all_failed(hass: HomeAssistant) -> None:
+    """Test a call without response raises if no device could be commanded."""
+    coordinator = _coordinator()
+    coordinator.api.toggle_relay.side_effect = MyStromConnectionError("timeout")
+
+    await async_setup_services(hass)
+    with (
+        patch(
+            "custom_components.mystrom_lds50.services.get_coordinators_from_entity_ids",
+            return_value={"switch.plug_1": coordinator},
+        ),
+        pytest.raises(HomeAssistantError, match="switch.plug_1: timeout"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_TOGGLE_RELAY,
+            {"entity_id": "switch.plug_1"},
+            blocking=True,
+        )
@@ -0,0 +1,102 @@
+"""Tests for MyStrom long-term statistics import."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mystrom_lds50.const import DOMAIN, STATISTICS_MAX_PENDING_HOURS
+from custom_components.mystrom_lds50.statistics import MyStromStatisticsImporter
+
+
+def _importer(hass: HomeAssistant) -> MyStromStatisticsImporter:
+    """Return an importer for a test entry with an energy total of 1.5 kWh."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "192.168.1.100"},
+        unique_id="AA:BB:CC:DD:EE:FF",
+        entry_id="test",
+    )
+    energy = MagicMock()
+    energy.total = 1.5
+    return MyStromStatisticsImporter(hass, entry, energy)
+
+
+@pytest.mark.asyncio
+async def test_hourly_aggregation(hass: HomeAssistant) -> None:
+    """Test samples are aggregated per hour and queued when the hour ends."""
+    importer = _importer(hass)
+    assert importer.power_statistic_id == "mystrom_lds50:aa_bb_cc_dd_ee_ff_power"
+
+    hour = datetime(2024, 1, 1, 10, tzinfo=UTC)
+    for minute, power in (
+        (0, 10.0),
+        (1, 40.0),
+        *((m, 10.0) for m in range(10, 60, 10)),
+    ):
+        importer.async_add_sample(power, hour + timedelta(minutes=minute))
+    assert not importer.pending_power
+
+    # The recorder is not loaded, so the finished hour stays queued
+    importer.async_add_sample(5.0, hour + timedelta(hours=1, seconds=3))
+    # 40 W held for 9 of 60 minutes, not one in seven samples
+    assert importer.pending_power == [
+        {"start": hour, "mean": 14.5, "min": 10.0, "max": 40.0}
+    ]
+    assert importer.pending_energy == [{"start": hour, "state": 1.5, "sum": 1.5}]
+
+
+@pytest.mark.asyncio
+async def test_sample_gap_not_weighted(hass: HomeAssistant) -> None:
+    """Test readings are not held over gaps without samples."""
+    importer = _importer(hass)
+    hour = datetime(2024, 1, 1, 10, tzinfo=UTC)
+    importer.async_add_sample(100.0, hour)
+    importer.async_add_sample(10.0, hour + timedelta(minutes=50))
+    importer.async_add_sample(0.0, hour + timedelta(hours=1))
+    assert importer.pending_power[0]["mean"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_pending_hours_limited(hass: HomeAssistant) -> None:
+    """Test only the latest hours are kept while the recorder is not loaded."""
+    importer = _importer(hass)
+    hour = datetime(2024, 1, 1, 10, tzinfo=UTC)
+    for index in range(STATISTICS_MAX_PENDING_HOURS + 5):
+        importer.async_add_sample(1.0, hour + timedelta(hours=index))
+    assert len(importer.pending_power) == STATISTICS_MAX_PENDING_HOURS
+    assert len(importer.pending_energy) == STATISTICS_MAX_PENDING_HOURS
+    assert importer.pending_power[-1]["start"] == hour + timedelta(
+        hours=STATISTICS_MAX_PENDING_HOURS + 3
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_hour_restored(hass: HomeAssistant, hass_storage) -> None:
+    """Test the open hour and queued hours survive an unload."""
+    hour = datetime(2024, 1, 1, 10, tzinfo=UTC)
+    importer = _importer(hass)
+    importer.async_add_sample(10.0, hour - timedelta(minutes=5))
+    importer.async_add_sample(10.0, hour)
+    importer.async_add_sample(40.0, hour + timedelta(minutes=30))
+    assert len(importer.pending_power) == 1
+    await importer.async_flush()
+    assert "mystrom_lds50.statistics.test" in hass_storage
+
+    restored = _importer(hass)
+    await restored.async_load()
+    assert restored.pending_power == importer.pending_power
+    restored.async_add_sample(10.0, hour + timedelta(minutes=40))
+    restored.async_add_sample(10.0, hour + timedelta(minutes=50))
+    restored.async_add_sample(0.0, hour + timedelta(hours=1))
+    assert restored.pending_power[1] == {
+        "start": hour,
+        "mean": 20.0,
+        "min": 10.0,
+        "max": 40.0,
+    }
+
+    await restored.async_remove()
+    assert "mystrom_lds50.statistics.test" not in hass_storage
@@ -3,10 +3,12 @@
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from homeassistant.core import HomeAssistant, State
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.mystrom_lds50.const import DOMAIN, KEY_POWER, KEY_RELAY
+from custom_components.mystrom_lds50.const import DOMAIN
 from custom_components.mystrom_lds50.coordinator import MyStromDataUpdateCoordinator
+from custom_components.mystrom_lds50.models import MyStromSnapshot
 from custom_components.mystrom_lds50.switch import MyStromSwitch
 
 
@@ -25,12 +27,18 @@ def mock_config_entry():
     )
 
 
+def _snapshot(power: float | None, *, relay: bool | None) -> MyStromSnapshot:
+    """Create a snapshot with the given readings."""
+    return MyStromSnapshot(power=power, relay=relay, energy=0.0, received=0.0)
+
+
 @pytest.fixture
-def mock_coordinator(mock_api, mock_report_data):
+def mock_coordinator(mock_api):
     """Create a mock coordinator."""
     coordinator = MagicMock(spec=MyStromDataUpdateCoordinator)
     coordinator.api = mock_api
-    coordinator.data = mock_report_data
+    coordinator.data = _snapshot(12.5, relay=True)
+    coordinator.static_info = {}
     coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
@@ -40,7 +48,7 @@ async def test_switch_is_on_when_relay_is_on(
     mock_coordinator, mock_config_entry
 ) -> None:
     """Test switch reports on when relay is on."""
-    mock_coordinator.data = {KEY_RELAY: 1, KEY_POWER: 12.5}
+    mock_coordinator.data = _snapshot(12.5, relay=True)
 
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
     assert switch.is_on is True
@@ -51,7 +59,7 @@ async def test_switch_is_off_when_relay_is_off(
     mock_coordinator, mock_config_entry
 ) -> None:
     """Test switch reports off when relay is off."""
-    mock_coordinator.data = {KEY_RELAY: 0, KEY_POWER: 0}
+    mock_coordinator.data = _snapshot(0.0, relay=False)
 
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
     assert switch.is_on is False
@@ -60,7 +68,7 @@ async def test_switch_is_off_when_relay_is_off(
 @pytest.mark.asyncio
 async def test_switch_is_on_by_power(mock_coordinator, mock_config_entry) -> None:
     """Test switch reports on based on power consumption."""
-    mock_coordinator.data = {KEY_POWER: 12.5}  # No relay key
+    mock_coordinator.data = _snapshot(12.5, relay=None)
 
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
     assert switch.is_on is True
@@ -70,10 +78,12 @@ async def test_switch_is_on_by_power(mock_coordinator, mock_config_entry) -> Non
 async def test_turn_on(mock_coordinator, mock_config_entry) -> None:
     """Test turning switch on."""
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
+    mock_coordinator.api.turn_on.return_value = {"relay": True}
 
     await switch.async_turn_on()
 
     mock_coordinator.api.turn_on.assert_called_once()
+    mock_coordinator.async_apply_command_result.assert_called_once_with({"relay": True})
     mock_coordinator.async_request_refresh.assert_called_once()
 
 
@@ -81,10 +91,13 @@ async def test_turn_on(mock_coordinator, mock_config_entry) -> None:
 async def test_turn_off(mock_coordinator, mock_config_entry) -> None:
     """Test turning switch off."""
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
+    # A toggle queued behind the command turned the relay back on
+    mock_coordinator.api.turn_off.return_value = {"relay": True}
 
     await switch.async_turn_off()
 
     mock_coordinator.api.turn_off.assert_called_once()
+    mock_coordinator.async_apply_command_result.assert_called_once_with({"relay": True})
     mock_coordinator.async_request_refresh.assert_called_once()
 
 
@@ -93,7 +106,56 @@ async def test_toggle(mock_coordinator, mock_config_entry) -> None:
     """Test toggling switch."""
     switch = MyStromSwitch(mock_coordinator, mock_config_entry)
 
+    mock_coordinator.api.toggle_relay.return_value = {"relay": False}
+
     await switch.async_toggle()
 
     mock_coordinator.api.toggle_relay.assert_called_once()
+    mock_coordinator.async_apply_command_result.assert_called_once_with(
+        {"relay": False}
+    )
     mock_coordinator.async_request_refresh.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_extra_state_attributes_cached(
+    mock_coordinator, mock_config_entry
+) -> None:
+    """Test attributes are only rebuilt when their inputs change."""
+    mock_coordinator.data = _snapshot(12.5, relay=True)
+    mock_coordinator.static_info = {"version": "3.82.60"}
+
+    switch = MyStromSwitch(mock_coordinator, mock_config_entry)
+    attrs = switch.extra_state_attributes
+    assert attrs["firmware"] == "3.82.60"
+    assert attrs["mac"] == "AA:BB:CC:DD:EE:FF"
+    assert attrs["power"] == 12.5
+
+    mock_coordinator.data = _snapshot(12.5, relay=False)
+    assert switch.extra_state_attributes is attrs
+
+    mock_coordinator.data = _snapshot(20.0, relay=True)
+    assert switch.extra_state_attributes["power"] == 20.0
+
+    mock_coordinator.static_info = {"version": "3.83.0"}
+    assert switch.extra_state_attributes["firmware"] == "3.83.0"
+
+
+@pytest.mark.asyncio
+async def test_switch_restored(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test the switch shows its restored state until data arrives."""
+    mock_coordinator.data = None
+    switch = MyStromSwitch(mock_coordinator, mock_config_entry)
+    switch.hass = hass
+    switch.entity_id = "switch.mystrom"
+    switch.async_get_last_state = AsyncMock(return_value=State("switch.mystrom", "on"))
+    await switch.async_added_to_hass()
+
+    assert switch.is_on is True
+    assert switch.extra_state_attributes == {"stale": True}
+
+    mock_coordinator.data = _snapshot(0.0, relay=False)
+    assert switch.is_on is False
+    assert "stale" not in switch.extra_state_attributes